@@ -1,21 +1,37 @@
 import json
-import boto3
-import pandas as pd
-import numpy as np
 from datetime import datetime
-import joblib
 import os
 from aws_lambda_powertools import Metrics
 from aws_lambda_powertools.metrics import MetricUnit
+from models.deadline import Deadline
+from models.instrumentation import SpanRecorder, span
 
 metrics = Metrics(namespace="OnaPlatform", service="interpolationService")
-s3 = boto3.client('s3')
+_s3_client = None
+
+# Output objects are kept in memory up to this size, then spooled to /tmp
+SPOOL_MAX_BYTES = int(os.environ.get('OUTPUT_SPOOL_MAX_BYTES', 64 * 1024 * 1024))
+
+# Seconds of the invocation kept back for uploading output and flushing metrics
+DEADLINE_RESERVE_SECONDS = float(os.environ.get('DEADLINE_RESERVE_SECONDS', 30))
+
+
+def get_s3_client():
+    """S3 client, created on first use so direct invocations skip the boto3 import"""
+    global _s3_client
+    if _s3_client is None:
+        import boto3
+        _s3_client = boto3.client('s3')
+    return _s3_client
 
 @metrics.log_metrics
 def lambda_handler(event, context):
     """
     Docker Lambda handler for ML-based interpolation with weather enrichment
     """
+    # Per-stage durations and memory are emitted as EMF metrics (cProfile dumps with PROFILE_DIR set, e.g. /tmp)
+    recorder = SpanRecorder(profile_dir=os.environ.get('PROFILE_DIR'))
+    deadline = Deadline.from_lambda_context(context, DEADLINE_RESERVE_SECONDS)
     try:
         # Parse S3 event
         records = event.get('Records', [])
@@ -26,39 +42,51 @@ def lambda_handler(event, context):
         bucket = records[0]['s3']['bucket']['name']
         key = records[0]['s3']['object']['key']
         
-        # Download data from S3
-        response = s3.get_object(Bucket=bucket, Key=key)
-        df = pd.read_csv(response['Body'])
-        
-        # Extract metadata from key
-        metadata = extract_metadata_from_key(key)
-        location = metadata['location']
-        inverter_brand = detect_inverter_brand(df)
-        
-        # Normalize data format
-        normalized_df = normalize_data_format(df, inverter_brand)
-        
-        # Enrich with weather data
-        weather_enriched_df = enrich_with_weather(
-            normalized_df, 
-            location, 
-            'historical' in key
-        )
-        
-        # Perform ML interpolation
-        interpolated_df = perform_ml_interpolation(weather_enriched_df)
-        
-        # Calculate performance metrics for nowcast data
-        if 'nowcast' in key:
-            interpolated_df = calculate_performance_metrics(
-                interpolated_df, 
-                metadata.get('site_capacity', 100)
-            )
-        
-        # Save processed data
-        output_key = construct_output_key(key, metadata)
-        save_to_s3(interpolated_df, bucket, output_key)
+        with recorder:
+            import pandas as pd
+            
+            # Download data from S3
+            with span('download'):
+                response = get_s3_client().get_object(Bucket=bucket, Key=key)
+                df = pd.read_csv(response['Body'])
+            
+            # Extract metadata from key
+            metadata = extract_metadata_from_key(key)
+            location = metadata['location']
+            inverter_brand = detect_inverter_brand(df)
+            
+            # Normalize data format
+            with span('normalize'):
+                normalized_df = normalize_data_format(df, inverter_brand)
+            
+            # Enrich with weather data
+            with span('weather'):
+                weather_enriched_df = enrich_with_weather(
+                    normalized_df, 
+                    location, 
+                    'historical' in key
+                )
+            
+            # Perform ML interpolation (degrades to cheaper methods when the invocation is short on time)
+            with span('interpolation'):
+                interpolated_df = perform_ml_interpolation(weather_enriched_df, deadline)
+            
+            # Calculate performance metrics for nowcast data, unless only the upload reserve is left
+            if 'nowcast' in key and not (deadline is not None and deadline.expired()):
+                with span('performance'):
+                    interpolated_df = calculate_performance_metrics(
+                        interpolated_df, 
+                        metadata.get('site_capacity', 100)
+                    )
+            
+            # Save processed data
+            output_key = construct_output_key(key, metadata)
+            with span('upload'):
+                save_to_s3(interpolated_df, bucket, output_key)
         
+        recorder.emit_metrics(metrics, prefix='Stage')
+        if deadline is not None:
+            metrics.add_metric(name="DeadlineRemaining", unit=MetricUnit.Seconds, value=round(deadline.remaining(), 1))
         metrics.add_metric(name="RecordsProcessed", unit=MetricUnit.Count, value=len(interpolated_df))
         metrics.add_metric(name="GapsFilled", unit=MetricUnit.Count, value=interpolated_df['interpolated'].sum())
         
@@ -74,6 +102,7 @@ def lambda_handler(event, context):
         
     except Exception as e:
         print(f"Error in interpolation service: {str(e)}")
+        recorder.emit_metrics(metrics, prefix='Stage')
         metrics.add_metric(name="Errors", unit=MetricUnit.Count, value=1)
         return {
             'statusCode': 500,
@@ -117,8 +146,8 @@ def enrich_with_weather(df, location, is_historical):
     df['wind_speed'] = 5.0
     return df
 
-def perform_ml_interpolation(df):
-    """Perform ML-based interpolation"""
+def perform_ml_interpolation(df, deadline=None):
+    """Perform ML-based interpolation, finishing before the deadline (InterpolationEngine.run_interpolation(deadline=...))"""
     # TODO: Implement ML interpolation
     return df
 
@@ -134,11 +163,17 @@ def construct_output_key(original_key, metadata):
     return f"processed/{original_key}"
 
 def save_to_s3(df, bucket, key):
-    """Save processed data to S3"""
-    csv_buffer = df.to_csv(index=False)
-    s3.put_object(
-        Bucket=bucket,
-        Key=key,
-        Body=csv_buffer,
-        ContentType='text/csv'
-    )
\ No newline at end of file
+    """Save processed data to S3 (Parquet with zstd for .parquet keys, CSV otherwise)"""
+    import tempfile
+    
+    # Spooled to /tmp past SPOOL_MAX_BYTES instead of building the whole object as one string,
+    # then sent as a multipart upload
+    with tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_BYTES) as spool:
+        if key.endswith('.parquet'):
+            df.to_parquet(spool, index=False, compression='zstd')
+            content_type = 'application/vnd.apache.parquet'
+        else:
+            df.to_csv(spool, index=False, mode='wb')
+            content_type = 'text/csv'
+        spool.seek(0)
+        get_s3_client().upload_fileobj(spool, bucket, key, ExtraArgs={'ContentType': content_type})
\ No newline at end of file
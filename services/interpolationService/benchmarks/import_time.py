@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Import-Time Benchmark
+Measures cold-start import cost of each interpolationService entry point in fresh interpreters
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+
+# Entry point name -> Python statement executed in a fresh interpreter
+ENTRY_POINTS = {
+    'app': 'import app',
+    'models.interpolation': 'import models.interpolation',
+    'models.gap_analysis': 'import models.gap_analysis',
+    'models.model_registry': 'import models.model_registry',
+    'models.data_io': 'import models.data_io',
+    'models.instrumentation': 'import models.instrumentation',
+    'models.deadline': 'import models.deadline',
+    'models.global_model': 'import models.global_model',
+    'models.solar_geometry': 'import models.solar_geometry',
+    'interpolation (legacy)': 'import interpolation',
+    'cli --list-methods': 'import sys; sys.argv = ["interpolation.py", "--list-methods"]; '
+                          'import models.interpolation as m; m.main()'
+}
+
+# Modules that should never be imported just by loading an entry point
+HEAVY_MODULES = ['lightgbm', 'sklearn', 'scipy', 'boto3', 'joblib']
+
+PROBE = '''
+import sys, time, json, io, contextlib
+start = time.perf_counter()
+with contextlib.redirect_stdout(io.StringIO()):
+    exec({statement!r})
+elapsed = time.perf_counter() - start
+print(json.dumps({{'seconds': elapsed, 'heavy': [m for m in {heavy!r} if m in sys.modules]}}))
+'''
+
+
+def measure(statement: str, repeats: int) -> Dict:
+    """Run `statement` in `repeats` fresh interpreters and summarise the wall time"""
+    timings = []
+    heavy = []
+    for _ in range(repeats):
+        probe = PROBE.format(statement=statement, heavy=HEAVY_MODULES)
+        completed = subprocess.run([sys.executable, '-c', probe], cwd=SERVICE_DIR,
+                                   capture_output=True, text=True)
+        if completed.returncode != 0:
+            error = completed.stderr.strip().splitlines()
+            return {'error': error[-1] if error else f'exit code {completed.returncode}'}
+
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        timings.append(result['seconds'])
+        heavy = result['heavy']
+
+    return {
+        'median_seconds': round(statistics.median(timings), 4),
+        'min_seconds': round(min(timings), 4),
+        'max_seconds': round(max(timings), 4),
+        'heavy_modules_loaded': heavy
+    }
+
+
+def slowest_imports(statement: str, top: int) -> List[Dict]:
+    """Largest cumulative import times reported by `python -X importtime`"""
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-c', statement],
+                               cwd=SERVICE_DIR, capture_output=True, text=True)
+    rows = []
+    for line in completed.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative_us, name = line[len('import time:'):].split('|')
+        # Nesting is indented two spaces per level; keep what the entry module imports directly
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth != 1:
+            continue
+        rows.append({'module': name.strip(), 'cumulative_ms': round(int(cumulative_us) / 1000, 1)})
+
+    return sorted(rows, key=lambda row: row['cumulative_ms'], reverse=True)[:top]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark cold-start import time of interpolationService entry points')
+    parser.add_argument('-n', '--repeats', type=int, default=5, help='Fresh interpreters per entry point (default: 5)')
+    parser.add_argument('--entry-point', action='append', choices=list(ENTRY_POINTS),
+                        help='Entry point to measure (repeatable, default: all)')
+    parser.add_argument('--detail', action='store_true', help='Show the slowest top-level imports per entry point')
+    parser.add_argument('-o', '--output', help='Write results as JSON for tracking across commits')
+
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.entry_point or list(ENTRY_POINTS):
+        result = measure(ENTRY_POINTS[name], args.repeats)
+        if args.detail and 'error' not in result:
+            result['slowest_imports'] = slowest_imports(ENTRY_POINTS[name], top=8)
+        results[name] = result
+
+    print(f"{'Entry point':<28} {'median (s)':>10} {'min (s)':>9}  heavy modules loaded")
+    for name, result in results.items():
+        if 'error' in result:
+            print(f"{name:<28} {'error':>10} {'':>9}  {result['error']}")
+            continue
+        heavy = ', '.join(result['heavy_modules_loaded']) or '-'
+        print(f"{name:<28} {result['median_seconds']:>10.3f} {result['min_seconds']:>9.3f}  {heavy}")
+        for row in result.get('slowest_imports', []):
+            print(f"{'':<4}{row['module']:<24} {row['cumulative_ms']:>9.1f} ms")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'python': sys.version.split()[0], 'repeats': args.repeats, 'results': results}, f, indent=2)
+        print(f"\nSaved results to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
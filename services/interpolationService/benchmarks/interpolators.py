@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Interpolator Benchmark
+Measures fit/predict time, peak memory and held-out accuracy of each registered interpolation method
+on synthetic sites (size tiers x inverter counts) and on real files, and reports the cost/accuracy trade-off
+"""
+import argparse
+import contextlib
+import io
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+SERVICE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(SERVICE_DIR))
+
+from models.data_io import load_data  # noqa: E402
+from models.gap_analysis import SolarGapAnalyzer  # noqa: E402
+from models.interpolation import INTERPOLATORS, InterpolationConfig, InterpolationEngine, InterpolationMetrics  # noqa: E402
+
+# Synthetic site length per size tier, in days of 15-minute data
+SIZE_TIERS = {
+    'small': 7,
+    'medium': 90,
+    'large': 365
+}
+
+# Metrics averaged across power columns, as in the interpolation summary's overall_metrics
+REPORTED_METRICS = ['r2_score', 'mae', 'rmse', 'nrmse_percent', 'peak_hour_mae', 'daily_energy_error_percent']
+
+
+def default_methods() -> List[str]:
+    """Registered method names, skipping aliases and fallbacks that reuse an earlier interpolator class"""
+    methods = []
+    seen = set()
+    for name, interpolator_class in InterpolationEngine().interpolators.items():
+        if interpolator_class not in seen:
+            seen.add(interpolator_class)
+            methods.append(name)
+    return methods
+
+
+def synthesize_site(n_days: int, n_inverters: int, seed: int = 0) -> pd.DataFrame:
+    """15-minute inverter power for one site: shared cloud cover, per-inverter capacity and noise,
+    and outages (short per-inverter dropouts plus site-wide communication losses)"""
+    rng = np.random.default_rng(seed)
+    times = pd.date_range('2024-01-01', periods=n_days * 96, freq='15min')
+    hours = np.asarray(times.hour + times.minute / 60)
+    day_length = 12 + 1.5 * np.cos(2 * np.pi * (np.asarray(times.dayofyear) - 15) / 365)
+    daylight = np.clip(np.cos((hours - 12) * np.pi / day_length), 0, None)
+
+    # Slowly varying cloud factor shared by the whole site (AR(1) in time)
+    clouds = np.empty(len(times))
+    clouds[0] = 0.0
+    shocks = rng.normal(0, 0.08, len(times))
+    for i in range(1, len(times)):
+        clouds[i] = 0.97 * clouds[i - 1] + shocks[i]
+    cloud_factor = np.clip(0.85 + clouds, 0.2, 1.0)
+
+    df = pd.DataFrame({'Time': times.strftime('%Y-%m-%d %H:%M:%S')})
+    site_outage = np.zeros(len(times), dtype=bool)
+    for start in rng.integers(0, len(times), max(1, n_days // 30)):
+        site_outage[start:start + rng.integers(8, 96)] = True
+
+    for j in range(n_inverters):
+        capacity = rng.uniform(800, 1200)
+        values = capacity * daylight * cloud_factor * rng.normal(1.0, 0.03, len(times))
+        values = np.clip(values, 0, None)
+        missing = site_outage | (rng.random(len(times)) < 0.01)
+        for start in rng.integers(0, len(times), max(1, n_days // 7)):
+            missing[start:start + rng.integers(2, 24)] = True
+        values[missing] = np.nan
+        df[f'inverter_{j + 1}_power'] = values
+
+    return df
+
+
+def mask_holdout(df: pd.DataFrame, power_columns: List[str], ratio: float, seed: int) -> Dict[str, np.ndarray]:
+    """Row positions per column to hide for scoring: contiguous blocks of observed values
+    (1-32 rows, mostly short) until `ratio` of the column's observed values are covered"""
+    rng = np.random.default_rng(seed)
+    holdout = {}
+    for col in power_columns:
+        observed = df[col].notna().to_numpy()
+        target = int(observed.sum() * ratio)
+        mask = np.zeros(len(df), dtype=bool)
+        while mask.sum() < target:
+            start = rng.integers(0, len(df))
+            length = min(int(rng.geometric(0.25)), 32)
+            mask[start:start + length] = True
+            mask &= observed
+        holdout[col] = np.flatnonzero(mask)
+    return holdout
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process so far (ru_maxrss is KB on Linux, bytes on macOS)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def run_case(case: Dict) -> Dict:
+    """Fit and interpolate one method on one prepared dataset; executed in a fresh interpreter"""
+    with open(case['gap_analysis']) as f:
+        gap_analysis = json.load(f)
+    structure = gap_analysis['structure']
+    time_column = structure['time_column']
+    power_columns = structure['power_columns']
+
+    df = load_data(case['data_file'], time_column, power_columns)
+    holdout = mask_holdout(df, power_columns, case['holdout_ratio'], case['seed'])
+    df_train = df.copy()
+    for col, rows in holdout.items():
+        df_train.iloc[rows, df_train.columns.get_loc(col)] = np.nan
+
+    interpolator_class = INTERPOLATORS[case['method']]
+    interpolator = interpolator_class(case['options'], interpolation_config=InterpolationConfig(gap_analysis))
+    baseline_rss = peak_rss_mb()
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        interpolator.fit(df_train, power_columns, time_column)
+        fit_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        df_result = interpolator.interpolate(df_train, power_columns, time_column)
+        predict_seconds = time.perf_counter() - start
+
+    # All columns scored in one batch over the held-out cells
+    mask = np.zeros((len(df), len(power_columns)), dtype=bool)
+    for col_idx, col in enumerate(power_columns):
+        mask[holdout[col], col_idx] = True
+    batch = InterpolationMetrics.calculate_batch_metrics(df[power_columns].to_numpy(dtype=np.float64),
+                                                         df_result[power_columns].to_numpy(dtype=np.float64), mask,
+                                                         times=df[time_column].to_numpy())
+    metrics = {key[len('avg_'):]: round(float(value), 4)
+               for key, value in InterpolationMetrics.average_metrics(batch, REPORTED_METRICS).items()}
+
+    return {
+        'fit_seconds': round(fit_seconds, 3),
+        'predict_seconds': round(predict_seconds, 3),
+        'fit_rows_per_second': round(len(df) / fit_seconds) if fit_seconds > 0 else None,
+        'predict_rows_per_second': round(len(df) / predict_seconds) if predict_seconds > 0 else None,
+        'baseline_rss_mb': baseline_rss,
+        'peak_rss_mb': peak_rss_mb(),
+        'holdout_values': int(sum(len(rows) for rows in holdout.values())),
+        'remaining_missing': int(df_result[power_columns].isna().sum().sum()),
+        'metrics': metrics
+    }
+
+
+def measure(case: Dict, timeout: Optional[float]) -> Dict:
+    """Run one case in a fresh interpreter so peak RSS is attributable to that method alone"""
+    try:
+        completed = subprocess.run([sys.executable, __file__, '--case', json.dumps(case)], cwd=SERVICE_DIR,
+                                   capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {'error': f'timed out after {timeout:g}s'}
+
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()
+        return {'error': error[-1] if error else f'exit code {completed.returncode}'}
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def prepare_dataset(name: str, df: Optional[pd.DataFrame], data_file: Optional[str], work_dir: Path) -> Dict:
+    """Write the dataset (synthetic only) and its gap analysis to work_dir"""
+    if df is not None:
+        data_file = str(work_dir / f"{name}.csv")
+        df.to_csv(data_file, index=False)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        gap_analysis = SolarGapAnalyzer().analyze_dataset(data_file)
+    if 'error' in gap_analysis:
+        raise ValueError(f"{name}: {gap_analysis['error']}")
+
+    gap_file = work_dir / f"{name}_gap_analysis.json"
+    with open(gap_file, 'w') as f:
+        json.dump(gap_analysis, f, default=str)
+
+    structure = gap_analysis['structure']
+    return {
+        'data_file': data_file,
+        'gap_analysis': str(gap_file),
+        'rows': structure.get('total_rows'),
+        'power_columns': len(structure['power_columns'])
+    }
+
+
+def pareto_front(results: Dict[str, Dict]) -> List[str]:
+    """Methods not beaten on both total time and R² by another method on the same dataset"""
+    scored = {method: (r['fit_seconds'] + r['predict_seconds'], r['metrics'].get('r2_score', -np.inf))
+              for method, r in results.items() if 'error' not in r}
+    front = []
+    for method, (cost, r2) in scored.items():
+        dominated = any(other_cost <= cost and other_r2 >= r2 and (other_cost, other_r2) != (cost, r2)
+                        for other, (other_cost, other_r2) in scored.items() if other != method)
+        if not dominated:
+            front.append(method)
+    return sorted(front, key=lambda method: scored[method][0])
+
+
+def compare(results: Dict, baseline: Dict, tolerance: float, r2_tolerance: float) -> List[str]:
+    """Regressions against a previous results file: slower or larger beyond `tolerance` (relative),
+    or R² lower by more than `r2_tolerance`"""
+    regressions = []
+    for dataset, methods in results.items():
+        for method, result in methods.items():
+            previous = baseline.get(dataset, {}).get(method)
+            if previous is None or 'error' in previous or 'error' in result:
+                continue
+            for key in ['fit_seconds', 'predict_seconds', 'peak_rss_mb']:
+                if previous[key] > 0 and result[key] > previous[key] * (1 + tolerance):
+                    regressions.append(f"{dataset} {method}: {key} {previous[key]} -> {result[key]}")
+            r2_before = previous['metrics'].get('r2_score')
+            r2_after = result['metrics'].get('r2_score')
+            if r2_before is not None and r2_after is not None and r2_after < r2_before - r2_tolerance:
+                regressions.append(f"{dataset} {method}: r2_score {r2_before} -> {r2_after}")
+    return regressions
+
+
+def print_report(datasets: Dict[str, Dict], results: Dict[str, Dict]):
+    """One table per dataset, Pareto-optimal methods marked with *"""
+    for name, dataset in datasets.items():
+        print(f"\n{name} ({dataset['rows']} rows, {dataset['power_columns']} power columns)")
+        print(f"  {'Method':<26} {'fit (s)':>8} {'predict (s)':>11} {'peak MB':>8} {'R²':>7} {'NRMSE %':>8}")
+        front = set(pareto_front(results[name]))
+        for method, result in results[name].items():
+            if 'error' in result:
+                print(f"  {method:<26} {'error':>8}  {result['error']}")
+                continue
+            marker = '*' if method in front else ' '
+            metrics = result['metrics']
+            print(f"{marker} {method:<26} {result['fit_seconds']:>8.2f} {result['predict_seconds']:>11.2f} "
+                  f"{result['peak_rss_mb']:>8.0f} {metrics.get('r2_score', float('nan')):>7.4f} "
+                  f"{metrics.get('nrmse_percent', float('nan')):>8.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark cost and accuracy of interpolationService interpolators')
+    parser.add_argument('-m', '--method', action='append', choices=list(INTERPOLATORS),
+                        help='Method to benchmark (repeatable, default: every registered interpolator class)')
+    parser.add_argument('--tier', action='append', choices=list(SIZE_TIERS),
+                        help='Synthetic size tier (repeatable, default: small and medium)')
+    parser.add_argument('--inverters', type=int, action='append',
+                        help='Synthetic inverter count (repeatable, default: 3 and 12)')
+    parser.add_argument('--no-synthetic', action='store_true', help='Only benchmark the files given with --data')
+    parser.add_argument('--data', action='append', default=[],
+                        help='Real data file scored on held-out observed values (repeatable)')
+    parser.add_argument('--holdout-ratio', type=float, default=0.1,
+                        help='Share of observed values per column hidden for scoring (default: 0.1)')
+    parser.add_argument('--seed', type=int, default=42, help='Seed for synthetic data and holdout masks')
+    parser.add_argument('--workers', type=int, help='Parallel per-column training workers passed to each method')
+    parser.add_argument('--max-rows-per-stratum', type=int,
+                        help='Cap LightGBM training rows per hour x season x weather stratum (default: all rows)')
+    parser.add_argument('--timeout', type=float, default=1800, help='Seconds allowed per method and dataset')
+    parser.add_argument('--work-dir', help='Directory for generated datasets (default: temporary)')
+    parser.add_argument('-o', '--output', help='Write results as JSON for tracking across commits')
+    parser.add_argument('--compare', help='Previous results JSON to check for regressions')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Allowed relative increase in time and memory with --compare (default: 0.25)')
+    parser.add_argument('--r2-tolerance', type=float, default=0.01,
+                        help='Allowed R² decrease with --compare (default: 0.01)')
+    parser.add_argument('--case', help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.case:
+        print(json.dumps(run_case(json.loads(args.case))))
+        return
+
+    methods = args.method or default_methods()
+    options = {'n_workers': args.workers} if args.workers is not None else {}
+    if args.max_rows_per_stratum:
+        options['max_rows_per_stratum'] = args.max_rows_per_stratum
+
+    with contextlib.ExitStack() as stack:
+        work_dir = Path(args.work_dir or stack.enter_context(tempfile.TemporaryDirectory()))
+        work_dir.mkdir(parents=True, exist_ok=True)
+
+        datasets = {}
+        if not args.no_synthetic:
+            for tier in args.tier or ['small', 'medium']:
+                for n_inverters in args.inverters or [3, 12]:
+                    name = f"synthetic_{tier}_{n_inverters}inv"
+                    df = synthesize_site(SIZE_TIERS[tier], n_inverters, args.seed)
+                    datasets[name] = prepare_dataset(name, df, None, work_dir)
+        for data_file in args.data:
+            # Cases run from the service directory, so pass the file by absolute path
+            data_file = str(Path(data_file).resolve())
+            datasets[Path(data_file).stem] = prepare_dataset(Path(data_file).stem, None, data_file, work_dir)
+
+        results = {}
+        for name, dataset in datasets.items():
+            results[name] = {}
+            for method in methods:
+                print(f"{name}: {method}...", flush=True)
+                case = {
+                    'data_file': dataset['data_file'],
+                    'gap_analysis': dataset['gap_analysis'],
+                    'method': method,
+                    'options': options,
+                    'holdout_ratio': args.holdout_ratio,
+                    'seed': args.seed
+                }
+                results[name][method] = measure(case, args.timeout)
+
+    print_report(datasets, results)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'python': sys.version.split()[0],
+                'holdout_ratio': args.holdout_ratio,
+                'seed': args.seed,
+                'datasets': {name: {k: v for k, v in d.items() if k in ('rows', 'power_columns')}
+                             for name, d in datasets.items()},
+                'results': results,
+                'pareto_front': {name: pareto_front(r) for name, r in results.items()}
+            }, f, indent=2)
+        print(f"\nSaved results to: {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance, args.r2_tolerance)
+        print(f"\n{len(regressions)} regression(s) against {args.compare}")
+        for line in regressions:
+            print(f"  {line}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
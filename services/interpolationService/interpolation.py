@@ -11,12 +11,6 @@ from pathlib import Path
 from typing import Dict, List, Any, Optional, Tuple
 import warnings
 from abc import ABC, abstractmethod
-from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-from sklearn.preprocessing import MinMaxScaler
-from sklearn.gaussian_process import GaussianProcessRegressor
-from sklearn.gaussian_process.kernels import RBF, Matern, WhiteKernel
-from scipy import interpolate
-import lightgbm as lgb
 warnings.filterwarnings('ignore')
 
 
@@ -26,6 +20,7 @@ class InterpolationMetrics:
     @staticmethod
     def calculate_metrics(y_true: np.ndarray, y_pred: np.ndarray, method_name: str) -> Dict:
         """Calculate comprehensive interpolation metrics"""
+        from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
         
         # Remove any NaN values for metric calculation
         mask = ~(np.isnan(y_true) | np.isnan(y_pred))
@@ -175,6 +170,7 @@ class SplineInterpolator(BaseInterpolator):
     
     def interpolate(self, df: pd.DataFrame, power_columns: List[str], time_column: str) -> pd.DataFrame:
         """Perform spline interpolation"""
+        from scipy import interpolate
         df_result = df.copy()
         
         # Convert time to numeric for interpolation
@@ -219,6 +215,9 @@ class GaussianProcessInterpolator(BaseInterpolator):
     
     def fit(self, df: pd.DataFrame, power_columns: List[str], time_column: str) -> 'GaussianProcessInterpolator':
         """Fit GP models for each power column"""
+        from sklearn.preprocessing import MinMaxScaler
+        from sklearn.gaussian_process import GaussianProcessRegressor
+        from sklearn.gaussian_process.kernels import RBF, Matern, WhiteKernel
         
         # Create features
         df_features = self.create_features(df, time_column)
@@ -410,6 +409,8 @@ class MultiOutputRegressionInterpolator(BaseInterpolator):
     
     def fit(self, df: pd.DataFrame, power_columns: List[str], time_column: str) -> 'MultiOutputRegressionInterpolator':
         """Fit multi-output model"""
+        import lightgbm as lgb
+        from sklearn.preprocessing import MinMaxScaler
         
         # Create features
         df_features = self.create_features(df, time_column)
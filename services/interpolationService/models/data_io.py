@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Data I/O
+Schema-aware reader shared by the gap analysis and interpolation CLIs: only the time and power
+columns are parsed, with explicit dtypes and a fixed datetime format. CSV goes through pyarrow's
+multithreaded reader when it is installed (pandas otherwise); Parquet and Feather/Arrow IPC files are
+read directly, and a CSV can be cached as a memory-mapped Arrow sidecar keyed by its content hash.
+Output writers append interpolated blocks as CSV, zstd Parquet row groups, Arrow IPC record batches
+or day-partitioned Parquet
+"""
+import hashlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Iterator, List, Optional
+import numpy as np
+import pandas as pd
+
+# Rows read to detect the structure and datetime format before the full load
+SAMPLE_ROWS = 1000
+
+# File suffix -> columnar format (Feather V2 is the Arrow IPC file format)
+COLUMNAR_FORMATS = {
+    '.parquet': 'parquet',
+    '.pq': 'parquet',
+    '.feather': 'feather',
+    '.arrow': 'feather',
+    '.ipc': 'feather'
+}
+
+
+def columnar_format(path: str) -> Optional[str]:
+    """'parquet' or 'feather' for columnar inputs, None for CSV"""
+    return COLUMNAR_FORMATS.get(Path(path).suffix.lower())
+
+
+def file_hash(path: str, block_size: int = 1 << 20) -> str:
+    """Content hash of a file (first 16 hex digits of SHA-256)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def read_sample(path: str, nrows: int = SAMPLE_ROWS) -> pd.DataFrame:
+    """First rows of the file with default inference (structure detection only)"""
+    fmt = columnar_format(path)
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        batch = next(pq.ParquetFile(path).iter_batches(batch_size=nrows), None)
+        return batch.to_pandas() if batch is not None else pq.read_schema(path).empty_table().to_pandas()
+    if fmt == 'feather':
+        from pyarrow import feather
+        return feather.read_table(path, memory_map=True).slice(0, nrows).to_pandas()
+    return pd.read_csv(path, nrows=nrows)
+
+
+def count_rows(path: str) -> int:
+    """Number of data rows (from metadata for columnar files)"""
+    fmt = columnar_format(path)
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.ParquetFile(path).metadata.num_rows
+    if fmt == 'feather':
+        from pyarrow import feather
+        return feather.read_table(path, memory_map=True).num_rows
+    with open(path) as f:
+        return max(0, sum(1 for _ in f) - 1)
+
+
+def detect_datetime_format(values: pd.Series) -> Optional[str]:
+    """strftime format of the first non-empty timestamp, or None when it cannot be guessed"""
+    from pandas.tseries.api import guess_datetime_format
+    values = values.dropna()
+    if values.empty or pd.api.types.is_datetime64_any_dtype(values):
+        return None
+    return guess_datetime_format(str(values.iloc[0]))
+
+
+def select_columns(columns: List[str], time_column: Optional[str], power_columns: List[str],
+                   keep_extra_columns: bool = False) -> Optional[List[str]]:
+    """Columns to parse in file order, or None to read every column"""
+    if keep_extra_columns or time_column is None or not power_columns:
+        return None
+    wanted = {time_column, *power_columns}
+    return [col for col in columns if col in wanted]
+
+
+def parse_time_column(df: pd.DataFrame, time_column: Optional[str], datetime_format: Optional[str]) -> pd.DataFrame:
+    """Parse the time column with a known format; left as text when values don't all match it"""
+    if time_column is None or datetime_format is None or time_column not in df.columns:
+        return df
+    try:
+        df[time_column] = pd.to_datetime(df[time_column], format=datetime_format)
+    except (ValueError, TypeError):
+        print(f"Timestamps in '{time_column}' do not all match {datetime_format}, leaving them for later parsing")
+    return df
+
+
+def coerce_power_columns(df: pd.DataFrame, power_columns: List[str], float_dtype=np.float64) -> pd.DataFrame:
+    """Power columns as `float_dtype`, non-numeric readings as NaN"""
+    for col in power_columns:
+        if col in df.columns and df[col].dtype != float_dtype:
+            df[col] = pd.to_numeric(df[col], errors='coerce').astype(float_dtype)
+    return df
+
+
+def _read_arrow_csv(path: str, usecols: Optional[List[str]], dtypes: dict, time_column: Optional[str]) -> pd.DataFrame:
+    """Multithreaded pyarrow CSV read converted to pandas"""
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+
+    column_types = {col: pa.float32() if dtype == np.float32 else pa.float64() for col, dtype in dtypes.items()}
+    if time_column is not None:
+        # Timestamps are parsed by pandas with the detected format, as with the pandas reader
+        column_types[time_column] = pa.string()
+    convert_options = pa_csv.ConvertOptions(include_columns=usecols, column_types=column_types,
+                                            strings_can_be_null=True)
+    table = pa_csv.read_csv(path, read_options=pa_csv.ReadOptions(use_threads=True),
+                            convert_options=convert_options)
+    # Release Arrow buffers column by column while converting
+    return table.to_pandas(split_blocks=True, self_destruct=True)
+
+
+def _read_columnar_table(path: str, usecols: Optional[List[str]]):
+    """Arrow table of a Parquet or Feather file (Feather memory-mapped)"""
+    if columnar_format(path) == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.read_table(path, columns=usecols, memory_map=True)
+    from pyarrow import feather
+    return feather.read_table(path, columns=usecols, memory_map=True)
+
+
+def _parse_batch_time(batch, time_index: int, datetime_format: str):
+    """Record batch with its time column parsed to timestamp[us]"""
+    import pyarrow.compute as pc
+    parsed = pc.strptime(batch.column(time_index), format=datetime_format, unit='us')
+    return batch.set_column(time_index, batch.schema.field(time_index).name, parsed)
+
+
+def ensure_sidecar(path: str, cache_dir: str, time_column: Optional[str] = None,
+                   power_columns: Optional[List[str]] = None) -> Optional[Path]:
+    """Arrow IPC copy of a CSV in `cache_dir`, keyed by the CSV's content hash and written on first use.
+    Every column is kept so one sidecar serves any column selection; None when it cannot be written."""
+    target = Path(cache_dir) / f"{Path(path).stem}-{file_hash(path)}.arrow"
+    if target.exists():
+        print(f"Reading columnar sidecar: {target}")
+        return target
+
+    try:
+        import pyarrow as pa
+        from pyarrow import csv as pa_csv
+    except ImportError:
+        return None
+
+    column_types = {col: pa.float64() for col in power_columns or []}
+    datetime_format = None
+    sample = read_sample(path)
+    if time_column in sample.columns:
+        column_types[time_column] = pa.string()
+        datetime_format = detect_datetime_format(sample[time_column])
+        if datetime_format and ('%z' in datetime_format or '%Z' in datetime_format):
+            datetime_format = None  # Offsets are left to pandas, which keeps them
+
+    target.parent.mkdir(parents=True, exist_ok=True)
+    partial = target.with_name(target.name + '.partial')
+    try:
+        # Streamed batch by batch, never holding the whole CSV
+        convert_options = pa_csv.ConvertOptions(column_types=column_types, strings_can_be_null=True)
+        reader = pa_csv.open_csv(path, convert_options=convert_options)
+        first = reader.read_next_batch()
+        schema = reader.schema
+
+        # Timestamps are stored parsed when Arrow understands the format, otherwise as text
+        time_index = schema.get_field_index(time_column) if datetime_format else -1
+        if datetime_format and time_index >= 0:
+            try:
+                first = _parse_batch_time(first, time_index, datetime_format)
+                schema = first.schema
+            except pa.ArrowInvalid:
+                datetime_format = None
+
+        with pa.OSFile(str(partial), 'wb') as sink, pa.ipc.new_file(sink, schema) as writer:
+            writer.write_batch(first)
+            for batch in reader:
+                if datetime_format and time_index >= 0:
+                    batch = _parse_batch_time(batch, time_index, datetime_format)
+                writer.write_batch(batch)
+        partial.replace(target)
+    except StopIteration:
+        partial.unlink(missing_ok=True)
+        return None
+    except Exception as e:
+        # Typically a column whose inferred type changes after the first block
+        print(f"Could not write columnar sidecar ({e}), reading the CSV instead")
+        partial.unlink(missing_ok=True)
+        return None
+
+    print(f"Wrote columnar sidecar: {target}")
+    return target
+
+
+def resolve_input(path: str, columnar_cache: Optional[str] = None, time_column: Optional[str] = None,
+                  power_columns: Optional[List[str]] = None) -> str:
+    """File to actually read: the CSV's sidecar when a columnar cache is configured, else `path`"""
+    if columnar_cache and columnar_format(path) is None:
+        sidecar = ensure_sidecar(path, columnar_cache, time_column, power_columns)
+        if sidecar is not None:
+            return str(sidecar)
+    return path
+
+
+def load_data(path: str, time_column: Optional[str] = None, power_columns: Optional[List[str]] = None,
+              keep_extra_columns: bool = False, float_dtype=np.float64, engine: str = 'auto',
+              columnar_cache: Optional[str] = None) -> pd.DataFrame:
+    """Load a CSV, Parquet or Feather file reading only the time and power columns,
+    power as `float_dtype` and time as datetime (CSV through its sidecar when `columnar_cache` is set)"""
+    path = resolve_input(path, columnar_cache, time_column, power_columns)
+    if columnar_format(path) is None:
+        return load_csv(path, time_column, power_columns, keep_extra_columns, float_dtype, engine)
+
+    power_columns = power_columns or []
+    sample = read_sample(path)
+    usecols = select_columns(list(sample.columns), time_column, power_columns, keep_extra_columns)
+    datetime_format = detect_datetime_format(sample[time_column]) if time_column in sample.columns else None
+
+    df = _read_columnar_table(path, usecols).to_pandas(split_blocks=True, self_destruct=True)
+    df = coerce_power_columns(df, power_columns, float_dtype)
+    return parse_time_column(df, time_column, datetime_format)
+
+
+def load_csv(path: str, time_column: Optional[str] = None, power_columns: Optional[List[str]] = None,
+             keep_extra_columns: bool = False, float_dtype=np.float64, engine: str = 'auto') -> pd.DataFrame:
+    """Load a CSV reading only the time and power columns, power as `float_dtype`, time as datetime"""
+    power_columns = power_columns or []
+    sample = read_sample(path)
+    usecols = select_columns(list(sample.columns), time_column, power_columns, keep_extra_columns)
+    dtypes = {col: float_dtype for col in power_columns if col in sample.columns}
+    datetime_format = detect_datetime_format(sample[time_column]) if time_column in sample.columns else None
+
+    df = None
+    if engine in ('auto', 'pyarrow'):
+        try:
+            df = _read_arrow_csv(path, usecols, dtypes, time_column)
+        except ImportError:
+            if engine == 'pyarrow':
+                raise
+        except Exception as e:
+            # Typically a non-numeric value in a power column
+            print(f"pyarrow CSV reader failed ({e}), falling back to pandas")
+
+    if df is None:
+        try:
+            df = pd.read_csv(path, usecols=usecols, dtype=dtypes, float_precision='round_trip')
+        except ValueError:
+            # Non-numeric readings become NaN instead of failing the load
+            df = pd.read_csv(path, usecols=usecols, float_precision='round_trip')
+            df = coerce_power_columns(df, list(dtypes), float_dtype)
+
+    return parse_time_column(df, time_column, datetime_format)
+
+
+def iter_chunks(path: str, chunk_rows: int, time_column: Optional[str] = None,
+                power_columns: Optional[List[str]] = None, keep_extra_columns: bool = False,
+                float_dtype=np.float64, columnar_cache: Optional[str] = None) -> Iterator[pd.DataFrame]:
+    """Chunked counterpart of load_data: same column selection, dtypes and time parsing,
+    with a row index that continues across chunks"""
+    path = resolve_input(path, columnar_cache, time_column, power_columns)
+    power_columns = power_columns or []
+    sample = read_sample(path)
+    usecols = select_columns(list(sample.columns), time_column, power_columns, keep_extra_columns)
+    datetime_format = detect_datetime_format(sample[time_column]) if time_column in sample.columns else None
+
+    fmt = columnar_format(path)
+    if fmt is None:
+        # Correctly rounded float parsing, matching pyarrow so chunked and whole-file loads agree
+        chunks = pd.read_csv(path, usecols=usecols, chunksize=chunk_rows, float_precision='round_trip')
+    elif fmt == 'parquet':
+        import pyarrow.parquet as pq
+        batches = pq.ParquetFile(path).iter_batches(batch_size=chunk_rows, columns=usecols)
+        chunks = (batch.to_pandas() for batch in batches)
+    else:
+        # Memory-mapped: each slice only touches its own rows
+        table = _read_columnar_table(path, usecols)
+        chunks = (table.slice(start, chunk_rows).to_pandas() for start in range(0, table.num_rows, chunk_rows))
+
+    start = 0
+    for chunk in chunks:
+        chunk.index = pd.RangeIndex(start, start + len(chunk))
+        start += len(chunk)
+        chunk = coerce_power_columns(chunk, power_columns, float_dtype)
+        yield parse_time_column(chunk, time_column, datetime_format)
+
+
+def mark_interpolated(df_result: pd.DataFrame, df_original: pd.DataFrame, power_columns: List[str]) -> pd.DataFrame:
+    """Add the row-level `interpolated` flag: True where any power value was missing and is now filled"""
+    columns = [col for col in power_columns if col in df_original.columns and col in df_result.columns]
+    filled = df_original[columns].isna().to_numpy() & df_result[columns].notna().to_numpy()
+    df_result['interpolated'] = filled.any(axis=1)
+    return df_result
+
+
+class OutputWriter(ABC):
+    """Appends interpolated blocks to one output, in the order they are produced"""
+    suffix = ''
+    # Columnar formats carry the compact `interpolated` flag column
+    writes_mask = True
+
+    def __init__(self, path: str, time_column: Optional[str] = None):
+        self.path = Path(path)
+        self.time_column = time_column
+        self.rows_written = 0
+
+    def write(self, df: pd.DataFrame):
+        """Append one block"""
+        if len(df):
+            self._write(df)
+            self.rows_written += len(df)
+
+    @abstractmethod
+    def _write(self, df: pd.DataFrame):
+        """Write one non-empty block"""
+        pass
+
+    def close(self):
+        """Finish the output (footers, open files)"""
+
+    def __enter__(self) -> 'OutputWriter':
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class CsvWriter(OutputWriter):
+    """Plain CSV, header written with the first block"""
+    suffix = '.csv'
+    writes_mask = False
+
+    def _write(self, df: pd.DataFrame):
+        df.to_csv(self.path, mode='a' if self.rows_written else 'w', header=not self.rows_written, index=False)
+
+
+class ArrowOutputWriter(OutputWriter):
+    """Base for Arrow-backed writers: the first block fixes the schema, later blocks are cast to it"""
+
+    def __init__(self, path: str, time_column: Optional[str] = None):
+        super().__init__(path, time_column)
+        self.schema = None
+
+    def to_table(self, df: pd.DataFrame):
+        import pyarrow as pa
+        if self.schema is None:
+            self.schema = pa.Table.from_pandas(df, preserve_index=False).schema.remove_metadata()
+        return pa.Table.from_pandas(df, schema=self.schema, preserve_index=False)
+
+
+class ParquetWriter(ArrowOutputWriter):
+    """Parquet with zstd compression, one row group per block"""
+    suffix = '.parquet'
+
+    def __init__(self, path: str, time_column: Optional[str] = None, compression: str = 'zstd'):
+        super().__init__(path, time_column)
+        self.compression = compression
+        self._writer = None
+
+    def _write(self, df: pd.DataFrame):
+        import pyarrow.parquet as pq
+        table = self.to_table(df)
+        if self._writer is None:
+            self._writer = pq.ParquetWriter(str(self.path), self.schema, compression=self.compression)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class ArrowIpcWriter(ArrowOutputWriter):
+    """Arrow IPC file (Feather V2), one record batch per block, memory-mappable by readers"""
+    suffix = '.arrow'
+
+    def __init__(self, path: str, time_column: Optional[str] = None):
+        super().__init__(path, time_column)
+        self._sink = None
+        self._writer = None
+
+    def _write(self, df: pd.DataFrame):
+        import pyarrow as pa
+        table = self.to_table(df)
+        if self._writer is None:
+            self._sink = pa.OSFile(str(self.path), 'wb')
+            self._writer = pa.ipc.new_file(self._sink, self.schema)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._sink.close()
+            self._writer = None
+
+
+class PartitionedParquetWriter(ArrowOutputWriter):
+    """Directory of zstd Parquet files partitioned by day: <path>/date=YYYY-MM-DD/part-NNNNN.parquet.
+    The current day's file stays open across blocks; a day seen again later gets a new part."""
+
+    def __init__(self, path: str, time_column: Optional[str] = None, compression: str = 'zstd'):
+        if time_column is None:
+            raise ValueError("Day partitioning requires the time column")
+        super().__init__(path, time_column)
+        self.compression = compression
+        self._day = None
+        self._writer = None
+        self._parts = {}
+
+    def _write(self, df: pd.DataFrame):
+        import pyarrow.parquet as pq
+        days = pd.to_datetime(df[self.time_column]).dt.strftime('%Y-%m-%d').to_numpy()
+        # Runs of consecutive rows on the same day
+        boundaries = np.flatnonzero(days[1:] != days[:-1]) + 1
+        for start, end in zip(np.r_[0, boundaries], np.r_[boundaries, len(df)]):
+            table = self.to_table(df.iloc[start:end])
+            day = days[start]
+            if day != self._day:
+                self.close()
+                part = self._parts.get(day, 0)
+                self._parts[day] = part + 1
+                day_dir = self.path / f"date={day}"
+                day_dir.mkdir(parents=True, exist_ok=True)
+                self._writer = pq.ParquetWriter(str(day_dir / f"part-{part:05d}.parquet"), self.schema,
+                                                compression=self.compression)
+                self._day = day
+            self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+            self._day = None
+
+
+OUTPUT_WRITERS = {
+    'csv': CsvWriter,
+    'parquet': ParquetWriter,
+    'arrow': ArrowIpcWriter,
+    'parquet-daily': PartitionedParquetWriter
+}
+
+
+def create_writer(output_format: str, path: str, time_column: Optional[str] = None) -> OutputWriter:
+    """Writer for one of OUTPUT_WRITERS"""
+    if output_format not in OUTPUT_WRITERS:
+        raise ValueError(f"Unknown output format: {output_format} (choose from {', '.join(OUTPUT_WRITERS)})")
+    return OUTPUT_WRITERS[output_format](path, time_column)
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Run Deadlines
+Wall-clock budgets for a run (e.g. the rest of a Lambda invocation) and per-method cost estimates to plan within them
+"""
+import time
+from typing import Optional
+
+# Seconds per fit/predict as base + per power column + per cell (rows x power columns), measured with
+# benchmarks/interpolators.py on one vCPU and rounded up. Keyed by interpolator class like the model registry.
+METHOD_COSTS = {
+    'SplineInterpolator': {'base': 0.5, 'per_column': 0.0, 'fit_per_cell': 0.0, 'predict_per_cell': 1e-6},
+    'GapLocalSplineInterpolator': {'base': 0.5, 'per_column': 0.0, 'fit_per_cell': 0.0, 'predict_per_cell': 1e-6},
+    'PhysicsBasedInterpolator': {'base': 0.1, 'per_column': 0.0, 'fit_per_cell': 5e-7, 'predict_per_cell': 5e-7},
+    'MultiOutputRegressionInterpolator': {'base': 0.9, 'per_column': 0.15, 'fit_per_cell': 7e-5,
+                                          'predict_per_cell': 3e-6},
+    'HybridInterpolator': {'base': 3.5, 'per_column': 0.55, 'fit_per_cell': 1.4e-4, 'predict_per_cell': 1.5e-5},
+    'GaussianProcessInterpolator': {'base': 3.5, 'per_column': 30.0, 'fit_per_cell': 1.5e-4,
+                                    'predict_per_cell': 5e-6},
+    'GlobalWarmStartInterpolator': {'base': 0.9, 'per_column': 0.1, 'fit_per_cell': 7e-5, 'predict_per_cell': 5e-6},
+}
+
+# Estimates are scaled by this before they are compared with the time left
+SAFETY_FACTOR = 1.5
+
+
+def estimate_seconds(class_name: str, rows: int, columns: int, fit: bool = True, predict_rows: Optional[int] = None,
+                     speed: float = 1.0) -> float:
+    """Estimated seconds to fit on `rows` rows and predict `predict_rows` (default: the same rows)
+
+    `speed` is the machine's throughput relative to the benchmark (e.g. 2.0 with two vCPUs for parallel training).
+    Unknown classes are costed like the most expensive known one.
+    """
+    cost = METHOD_COSTS.get(class_name) or max(METHOD_COSTS.values(), key=lambda c: c['fit_per_cell'])
+    predict_rows = rows if predict_rows is None else predict_rows
+    seconds = predict_rows * columns * cost['predict_per_cell']
+    if fit:
+        seconds += cost['base'] + columns * cost['per_column'] + rows * columns * cost['fit_per_cell']
+    return seconds / speed
+
+
+class Deadline:
+    """Point in time a run must finish by, less a reserve kept back for writing output"""
+
+    def __init__(self, seconds: float, reserve_seconds: float = 0.0):
+        self.seconds = seconds
+        self.reserve_seconds = reserve_seconds
+        self.end = time.monotonic() + seconds - reserve_seconds
+
+    @classmethod
+    def from_lambda_context(cls, context, reserve_seconds: float = 30.0) -> Optional['Deadline']:
+        """Deadline for the rest of a Lambda invocation (None when the context has no timeout, e.g. local runs)"""
+        get_remaining = getattr(context, 'get_remaining_time_in_millis', None)
+        if get_remaining is None:
+            return None
+        return cls(get_remaining() / 1000, reserve_seconds)
+
+    def remaining(self) -> float:
+        """Seconds left before the reserve is reached (negative once past it)"""
+        return self.end - time.monotonic()
+
+    def allows(self, seconds: float) -> bool:
+        """Whether work estimated at `seconds` fits in the time left, with the safety factor applied"""
+        return seconds * SAFETY_FACTOR <= self.remaining()
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0
@@ -10,20 +10,35 @@ import json
 from pathlib import Path
 from typing import Dict, List, Tuple, Optional
 import warnings
-import boto3
 from difflib import get_close_matches
+try:
+    from models.data_io import load_data, read_sample
+    from models.solar_geometry import SolarGeometry
+except ImportError:  # Executed as a script from the models directory
+    from data_io import load_data, read_sample
+    from solar_geometry import SolarGeometry
 warnings.filterwarnings('ignore')
 
 
 class SolarGapAnalyzer:
     """Generic gap analyzer for solar time series data"""
     
-    def __init__(self, config: Optional[Dict] = None, city_name: Optional[str] = None):
-        """Initialize with optional configuration and city name"""
+    def __init__(self, config: Optional[Dict] = None, city_name: Optional[str] = None,
+                 latitude: Optional[float] = None, longitude: Optional[float] = None):
+        """Initialize with optional configuration, city name and site coordinates"""
         self.config = config or self._default_config()
         self.city_name = city_name
+        self.solar_geometry = SolarGeometry(latitude=latitude, longitude=longitude)
         self.weather_data = None
-        self.s3_client = boto3.client('s3')
+        self._s3_client = None
+    
+    @property
+    def s3_client(self):
+        """S3 client for the weather database, created on first use"""
+        if self._s3_client is None:
+            import boto3
+            self._s3_client = boto3.client('s3')
+        return self._s3_client
         
     def _default_config(self) -> Dict:
         """Default configuration for gap analysis"""
@@ -42,31 +57,7 @@ class SolarGapAnalyzer:
         """Auto-detect time and power columns in the dataset"""
         print("Detecting data structure...")
         
-        # Find time column
-        time_col = None
-        for pattern in self.config['time_column_patterns']:
-            candidates = [col for col in df.columns if pattern.lower() in col.lower()]
-            if candidates:
-                time_col = candidates[0]
-                break
-        
-        if time_col is None:
-            # Try first column if it looks like datetime
-            first_col = df.columns[0]
-            try:
-                pd.to_datetime(df[first_col].iloc[0])
-                time_col = first_col
-            except:
-                pass
-        
-        # Find power/energy columns
-        power_cols = []
-        for pattern in self.config['power_column_patterns']:
-            candidates = [col for col in df.columns if pattern.lower() in col.lower()]
-            power_cols.extend(candidates)
-        
-        # Remove duplicates and sort
-        power_cols = sorted(list(set(power_cols)))
+        time_col, power_cols = self.detect_columns(df)
         
         # Detect time frequency
         time_frequency = None
@@ -103,6 +94,34 @@ class SolarGapAnalyzer:
         
         return structure
     
+    def detect_columns(self, df: pd.DataFrame) -> Tuple[Optional[str], List[str]]:
+        """Time column and power/energy columns matched by the configured name patterns"""
+        # Find time column
+        time_col = None
+        for pattern in self.config['time_column_patterns']:
+            candidates = [col for col in df.columns if pattern.lower() in col.lower()]
+            if candidates:
+                time_col = candidates[0]
+                break
+        
+        if time_col is None:
+            # Try first column if it looks like datetime
+            first_col = df.columns[0]
+            try:
+                pd.to_datetime(df[first_col].iloc[0])
+                time_col = first_col
+            except:
+                pass
+        
+        # Find power/energy columns
+        power_cols = []
+        for pattern in self.config['power_column_patterns']:
+            candidates = [col for col in df.columns if pattern.lower() in col.lower()]
+            power_cols.extend(candidates)
+        
+        # Remove duplicates and sort
+        return time_col, sorted(list(set(power_cols)))
+    
     def find_gaps_generic(self, df: pd.DataFrame, column: str, time_col: str) -> List[Dict]:
         """Find all gaps in a time series column"""
         if column not in df.columns:
@@ -328,33 +347,27 @@ class SolarGapAnalyzer:
         
         if 'Time' not in df.columns:
             return violations
-            
-        df_temp = df.copy()
-        df_temp['Time'] = pd.to_datetime(df_temp['Time'])
-        df_temp['hour'] = df_temp['Time'].dt.hour
         
-        for _, row in df_temp.iterrows():
-            hour = row['hour']
-            power_vals = [row[col] for col in power_columns if pd.notna(row[col])]
-            
-            if not power_vals:
-                continue
-            
-            # Check for nighttime power (should be 0)
-            if (hour <= 5 or hour >= 19) and any(p > 10 for p in power_vals):
-                violations['nighttime_data_present'] += 1
-                
-            # Check for unexpected daytime zeros (potential sensor issues)
-            if (9 <= hour <= 15) and all(p == 0 for p in power_vals):
-                violations['daytime_zero_unexpected'] += 1
-            
-            # Check for negative power
-            if any(p < 0 for p in power_vals):
-                violations['negative_power'] += 1
-            
-            # Check for unrealistic power values (assuming max 10kW per inverter)
-            if any(p > 10000 for p in power_vals):
-                violations['power_exceeds_capacity'] += 1
+        times = pd.to_datetime(df['Time'])
+        hours = times.dt.hour.to_numpy()
+        night = ~self.solar_geometry.daylight_mask(times)
+        
+        # Rows x columns; NaN compares False so missing readings never count
+        power = df[power_columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=float)
+        has_values = ~np.isnan(power).all(axis=1)
+        
+        # Check for nighttime power (should be 0)
+        violations['nighttime_data_present'] = int((night & (power > 10).any(axis=1)).sum())
+        
+        # Check for unexpected daytime zeros (potential sensor issues)
+        all_zero = ((power == 0) | np.isnan(power)).all(axis=1) & has_values
+        violations['daytime_zero_unexpected'] = int((((hours >= 9) & (hours <= 15)) & all_zero).sum())
+        
+        # Check for negative power
+        violations['negative_power'] = int((power < 0).any(axis=1).sum())
+        
+        # Check for unrealistic power values (assuming max 10kW per inverter)
+        violations['power_exceeds_capacity'] = int((power > 10000).any(axis=1).sum())
         
         violations['total_violations'] = sum(violations.values())
         return violations
@@ -986,17 +999,21 @@ class SolarGapAnalyzer:
         
         return recommendations
     
-    def analyze_dataset(self, filepath: str) -> Dict:
+    def analyze_dataset(self, filepath: str, keep_extra_columns: bool = False,
+                        columnar_cache: Optional[str] = None) -> Dict:
         """Complete analysis of a solar dataset with enhanced features"""
         print(f"Analyzing dataset: {filepath}")
         
         try:
-            # Load data
-            df = pd.read_csv(filepath)
-            print(f"Loaded {len(df)} rows, {len(df.columns)} columns")
+            # Detect the time and power columns on a sample, then parse only those
+            sample = read_sample(filepath)
+            time_col, power_cols = self.detect_columns(sample)
+            df = load_data(filepath, time_col, power_cols, keep_extra_columns, columnar_cache=columnar_cache)
+            print(f"Loaded {len(df)} rows, {len(df.columns)} of {len(sample.columns)} columns")
             
             # Detect structure
             structure = self.detect_data_structure(df)
+            structure['total_columns'] = len(sample.columns)
             
             # Load weather data if city specified
             if self.city_name:
@@ -1016,6 +1033,10 @@ class SolarGapAnalyzer:
             results = {
                 'filepath': filepath,
                 'city_name': self.city_name,
+                'site': {
+                    'latitude': self.solar_geometry.latitude,
+                    'longitude': self.solar_geometry.longitude
+                } if self.solar_geometry.has_location else None,
                 'structure': structure,
                 'analysis': enhanced_analysis,
                 'recommendations': recommendations
@@ -1159,12 +1180,18 @@ class SolarGapAnalyzer:
 def main():
     """Command line interface for gap analysis"""
     parser = argparse.ArgumentParser(description='Analyze gaps in solar time series data')
-    parser.add_argument('input_file', help='Path to CSV file with solar data')
+    parser.add_argument('input_file', help='Path to CSV, Parquet or Feather/Arrow file with solar data')
     parser.add_argument('-o', '--output', help='Output file path (default: input_file_gap_analysis.json)')
     parser.add_argument('-f', '--format', choices=['json', 'csv', 'text'], default='json',
                        help='Output format (default: json)')
     parser.add_argument('-c', '--config', help='Path to configuration JSON file')
     parser.add_argument('--city', help='City name for weather data correlation (e.g., "Midrand")')
+    parser.add_argument('--keep-extra-columns', action='store_true',
+                        help='Load every input column, not only the time and power columns')
+    parser.add_argument('--columnar-cache',
+                        help='Directory for Arrow sidecars of CSV inputs (keyed by file hash, reused by later runs)')
+    parser.add_argument('--latitude', type=float, help='Site latitude for solar geometry (day/night detection)')
+    parser.add_argument('--longitude', type=float, help='Site longitude for solar geometry (day/night detection)')
     
     args = parser.parse_args()
     
@@ -1182,11 +1209,12 @@ def main():
         output_path = input_path.parent / f"{input_path.stem}_gap_analysis.{args.format}"
     
     # Create analyzer and run analysis
-    analyzer = SolarGapAnalyzer(config, city_name=args.city)
+    analyzer = SolarGapAnalyzer(config, city_name=args.city, latitude=args.latitude, longitude=args.longitude)
     if config and 'output_format' in config:
         analyzer.config['output_format'] = args.format
     
-    results = analyzer.analyze_dataset(args.input_file)
+    results = analyzer.analyze_dataset(args.input_file, keep_extra_columns=args.keep_extra_columns,
+                                       columnar_cache=args.columnar_cache)
     
     # Save results
     analyzer.save_results(results, output_path)
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Global Interpolation Model
+Trains one LightGBM model across many sites on capacity-normalized power and shared time, solar and weather
+features, and stores it in the model registry for per-site warm starts (`-m global_warm_start`)
+"""
+import argparse
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from models.data_io import load_data
+    from models.interpolation import (GlobalWarmStartInterpolator, InterpolationConfig, InterpolationEngine,
+                                      MultiOutputRegressionInterpolator)
+    from models.model_registry import ModelRegistry
+except ImportError:  # Executed as a script from the models directory
+    from data_io import load_data
+    from interpolation import (GlobalWarmStartInterpolator, InterpolationConfig, InterpolationEngine,
+                               MultiOutputRegressionInterpolator)
+    from model_registry import ModelRegistry
+
+
+def site_training_data(data_file: str, gap_analysis_file: str,
+                       max_rows_per_stratum: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+    """Stacked (features, normalized power) rows of every power column of one site"""
+    engine = InterpolationEngine()
+    gap_analysis = engine.load_gap_analysis(gap_analysis_file)
+    structure = engine.extract_data_structure(gap_analysis)
+    time_column = structure['time_column']
+    power_columns = structure['power_columns']
+
+    df = load_data(data_file, time_column, power_columns)
+    options = {'max_rows_per_stratum': max_rows_per_stratum} if max_rows_per_stratum else {}
+    interpolator = GlobalWarmStartInterpolator(options, interpolation_config=InterpolationConfig(gap_analysis))
+    columns = interpolator.training_data(df, power_columns, time_column)
+
+    if not columns:
+        return np.empty((0, len(GlobalWarmStartInterpolator.GLOBAL_FEATURES))), np.empty(0)
+    X_site = np.vstack([X for X, _, _ in columns.values()])
+    y_site = np.concatenate([y for _, y, _ in columns.values()])
+    return X_site, y_site
+
+
+def train_global_model(sites: List[Tuple[str, str]], registry_location: str, name: str = 'global',
+                       n_estimators: int = 1000, early_stopping_rounds: int = 50,
+                       max_rows_per_stratum: Optional[int] = 50, n_threads: Optional[int] = None) -> Dict:
+    """Train on every site's rows and register the model; returns the registry record"""
+    import lightgbm as lgb
+
+    X_parts, y_parts = [], []
+    for data_file, gap_analysis_file in sites:
+        X_site, y_site = site_training_data(data_file, gap_analysis_file, max_rows_per_stratum)
+        print(f"{data_file}: {len(y_site)} training rows")
+        X_parts.append(X_site)
+        y_parts.append(y_site)
+    X = np.vstack(X_parts)
+    y = np.concatenate(y_parts)
+    if len(y) == 0:
+        raise ValueError("No training rows in any site")
+
+    # Time-blocked holdout spread over the stacked sites, as for the per-site models
+    train_rows, holdout_rows = MultiOutputRegressionInterpolator._early_stopping_split(
+        len(y), {'fraction': 0.1, 'min_rows': 1000})
+    params = dict(GlobalWarmStartInterpolator.LGB_PARAMS)
+    if n_threads:
+        params['num_threads'] = n_threads
+
+    train_set = lgb.Dataset(X[train_rows], label=y[train_rows], params={'verbose': -1}, free_raw_data=False)
+    valid_sets, callbacks = [], []
+    if len(holdout_rows):
+        valid_sets = [lgb.Dataset(X[holdout_rows], label=y[holdout_rows], reference=train_set)]
+        callbacks = [lgb.early_stopping(early_stopping_rounds, verbose=False)]
+    print(f"Training global model on {len(y)} rows from {len(sites)} sites...")
+    booster = lgb.train(params, train_set, num_boost_round=n_estimators, valid_sets=valid_sets, callbacks=callbacks)
+
+    artifact = {
+        'booster': booster,
+        'params': {key: value for key, value in params.items() if key != 'num_threads'},
+        'feature_columns': GlobalWarmStartInterpolator.GLOBAL_FEATURES
+    }
+    metadata = {
+        'sites': [data_file for data_file, _ in sites],
+        'training_rows': int(len(y)),
+        'boosting_rounds': booster.current_iteration(),
+        'max_rows_per_stratum': max_rows_per_stratum
+    }
+    return ModelRegistry(registry_location).save_global_model(artifact, name, metadata)
+
+
+def main():
+    """Command line interface"""
+    parser = argparse.ArgumentParser(description='Train a cross-site interpolation model for per-site warm starts')
+    parser.add_argument('--site', nargs=2, action='append', required=True, metavar=('DATA_FILE', 'GAP_ANALYSIS_FILE'),
+                        help='Site data and its gap analysis JSON (repeatable)')
+    parser.add_argument('--model-registry', required=True, help='Model registry location (directory or s3://bucket/prefix)')
+    parser.add_argument('--name', default='global', help='Global model name in the registry (default: global)')
+    parser.add_argument('--n-estimators', type=int, default=1000, help='Maximum boosting rounds (default: 1000)')
+    parser.add_argument('--early-stopping-rounds', type=int, default=50,
+                        help='Stop when the holdout has not improved for this many rounds (default: 50)')
+    parser.add_argument('--max-rows-per-stratum', type=int, default=50,
+                        help='Training rows kept per site column, hour, season and weather regime (default: 50)')
+    parser.add_argument('--threads', type=int, help='LightGBM threads (default: all cores)')
+
+    args = parser.parse_args()
+
+    record = train_global_model([tuple(site) for site in args.site], args.model_registry, args.name,
+                                args.n_estimators, args.early_stopping_rounds, args.max_rows_per_stratum,
+                                args.threads)
+    print(f"Global model {args.name} version {record['version']}: {record['metadata']['boosting_rounds']} rounds "
+          f"on {record['metadata']['training_rows']} rows")
+
+
+if __name__ == "__main__":
+    main()
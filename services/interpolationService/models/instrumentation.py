@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Stage Instrumentation
+Records wall time, CPU time and peak memory per pipeline stage, with optional cProfile dumps
+"""
+import cProfile
+import functools
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+_active_recorder = None
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of the process so far (ru_maxrss is KB on Linux, bytes on macOS)"""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+
+
+class SpanRecorder:
+    """Nested timing spans aggregated by path (e.g. `validation/fit/features`)
+
+    While the recorder is active (`with recorder:`) the module-level `span()` and `traced()` helpers record
+    into it, so interpolators can mark their own stages without holding a reference to it. Spans repeated
+    in a loop (streamed chunks) are summed. Memory is the process high-water mark (`rss_peak_mb`) and how
+    much the span raised it (`rss_growth_mb`). With `trace_memory`, the peak traced allocation above the
+    level at span entry is recorded too (`peak_traced_mb`, numpy arrays included), at some cost in speed.
+    With `profile_dir`, each top-level stage is profiled and written to `<profile_dir>/<stage>.prof`.
+    """
+
+    def __init__(self, trace_memory: bool = False, profile_dir: Optional[str] = None):
+        self.trace_memory = trace_memory
+        self.profile_dir = Path(profile_dir) if profile_dir else None
+        self.stages: Dict[str, Dict] = {}
+        self.profiles: Dict[str, cProfile.Profile] = {}
+        self._stack: List[Dict] = []
+        self._started_tracing = False
+        self._start = None
+
+    def __enter__(self) -> 'SpanRecorder':
+        global _active_recorder
+        self._previous = _active_recorder
+        _active_recorder = self
+        if self.trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global _active_recorder
+        _active_recorder = self._previous
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        if self.profile_dir is not None and self.profiles:
+            self.dump_profiles()
+        return False
+
+    @contextmanager
+    def span(self, name: str):
+        """Record the enclosed block as `name`, nested under any open span"""
+        path = f"{self._stack[-1]['path']}/{name}" if self._stack else name
+        frame = {'path': path, 'traced_peak': 0}
+
+        if self.trace_memory and tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            # Resetting the peak hides it from enclosing spans, so hand it to them first
+            for parent in self._stack:
+                parent['traced_peak'] = max(parent['traced_peak'], peak)
+            tracemalloc.reset_peak()
+            frame['traced_start'] = current
+
+        # Registered on entry so the summary lists parents before their children
+        stage = self.stages.setdefault(path, {'calls': 0, 'wall_seconds': 0.0, 'cpu_seconds': 0.0,
+                                              'rss_peak_mb': 0.0, 'rss_growth_mb': 0.0})
+        profiler = None
+        if self.profile_dir is not None and not self._stack:
+            profiler = self.profiles.setdefault(name, cProfile.Profile())
+
+        self._stack.append(frame)
+        rss_before = peak_rss_mb()
+        cpu_start = time.process_time()
+        wall_start = time.perf_counter()
+        if profiler is not None:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler is not None:
+                profiler.disable()
+            wall = time.perf_counter() - wall_start
+            cpu = time.process_time() - cpu_start
+            rss_after = peak_rss_mb()
+            self._stack.pop()
+
+            stage['calls'] += 1
+            stage['wall_seconds'] += wall
+            stage['cpu_seconds'] += cpu
+            stage['rss_peak_mb'] = max(stage['rss_peak_mb'], rss_after)
+            stage['rss_growth_mb'] += rss_after - rss_before
+
+            if 'traced_start' in frame and tracemalloc.is_tracing():
+                peak = max(frame['traced_peak'], tracemalloc.get_traced_memory()[1])
+                for parent in self._stack:
+                    parent['traced_peak'] = max(parent['traced_peak'], peak)
+                traced = (peak - frame['traced_start']) / (1024 * 1024)
+                stage['peak_traced_mb'] = max(stage.get('peak_traced_mb', 0.0), traced)
+
+    def summary(self) -> Dict:
+        """Per-stage totals in the order stages were first entered, for the summary JSON"""
+        stages = {}
+        for path, stage in self.stages.items():
+            stages[path] = {key: round(value, 1 if key.endswith('_mb') else 4) if isinstance(value, float)
+                            else value for key, value in stage.items()}
+        return {
+            'total_seconds': round(time.perf_counter() - self._start, 4) if self._start is not None else None,
+            'peak_rss_mb': round(peak_rss_mb(), 1),
+            'memory_traced': self.trace_memory,
+            'stages': stages
+        }
+
+    def dump_profiles(self) -> List[str]:
+        """Write one cProfile stats file per profiled top-level stage"""
+        self.profile_dir.mkdir(parents=True, exist_ok=True)
+        paths = []
+        for name, profiler in self.profiles.items():
+            path = self.profile_dir / f"{name}.prof"
+            profiler.dump_stats(str(path))
+            paths.append(str(path))
+        return paths
+
+    def emit_metrics(self, metrics, prefix: str = ''):
+        """Add every stage to a Powertools `Metrics` object (flushed as EMF by `log_metrics`)"""
+        from aws_lambda_powertools.metrics import MetricUnit
+
+        for path, stage in self.stages.items():
+            name = prefix + ''.join(part.title() for part in path.replace('/', '_').split('_'))
+            metrics.add_metric(name=f"{name}Duration", unit=MetricUnit.Milliseconds,
+                               value=round(stage['wall_seconds'] * 1000, 1))
+            metrics.add_metric(name=f"{name}CpuTime", unit=MetricUnit.Milliseconds,
+                               value=round(stage['cpu_seconds'] * 1000, 1))
+            metrics.add_metric(name=f"{name}PeakMemory", unit=MetricUnit.Megabytes,
+                               value=round(stage['rss_peak_mb'], 1))
+
+
+def span(name: str):
+    """Span on the active recorder, or a no-op when nothing is being recorded"""
+    if _active_recorder is None:
+        return nullcontext()
+    return _active_recorder.span(name)
+
+
+def traced(name: str):
+    """Decorator recording every call of the function as a span named `name`"""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
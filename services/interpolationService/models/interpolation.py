@@ -3,28 +3,48 @@
 Solar Interpolation Engine
 Takes gap analysis results and performs the recommended interpolation methods
 """
+from __future__ import annotations
 import pandas as pd
 import numpy as np
 import argparse
+import contextlib
+import functools
+import io
+import itertools
 import json
+import os
+import time
 from pathlib import Path
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Dict, List, Any, Optional, Tuple, TYPE_CHECKING
 import warnings
 from abc import ABC, abstractmethod
-from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
-from sklearn.preprocessing import MinMaxScaler
-from sklearn.gaussian_process import GaussianProcessRegressor
-from sklearn.gaussian_process.kernels import RBF, Matern, WhiteKernel
-from scipy import interpolate
-import lightgbm as lgb
-import boto3
 from difflib import get_close_matches
+if TYPE_CHECKING:  # lightgbm, scikit-learn, scipy, joblib and boto3 are imported on first use
+    import lightgbm as lgb
+    from sklearn.gaussian_process import GaussianProcessRegressor
+try:
+    from models.data_io import (OUTPUT_WRITERS, OutputWriter, count_rows, create_writer, iter_chunks,
+                                load_data, mark_interpolated, resolve_input)
+    from models.deadline import Deadline, estimate_seconds
+    from models.instrumentation import SpanRecorder, span, traced
+    from models.model_registry import ModelRegistry
+    from models.solar_geometry import SolarGeometry
+except ImportError:  # Executed as a script from the models directory
+    from data_io import (OUTPUT_WRITERS, OutputWriter, count_rows, create_writer, iter_chunks,
+                         load_data, mark_interpolated, resolve_input)
+    from deadline import Deadline, estimate_seconds
+    from instrumentation import SpanRecorder, span, traced
+    from model_registry import ModelRegistry
+    from solar_geometry import SolarGeometry
 warnings.filterwarnings('ignore')
 
 
 class InterpolationConfig:
     """Parse and validate gap analysis recommendations"""
     
+    # Methods the gap analyzer writes no configuration for; they run on their defaults and settings
+    DEFAULT_CONFIG_METHODS = ('gap_local_spline', 'hybrid_interpolation', 'global_warm_start')
+    
     def __init__(self, gap_analysis: Dict):
         self.gap_analysis = gap_analysis
         self.recommendations = gap_analysis.get('recommendations', {})
@@ -73,8 +93,9 @@ class InterpolationConfig:
         }
         
         if not method_config:
-            validation['valid'] = False
-            validation['errors'].append(f"No configuration found for method: {method_name}")
+            if method_name not in self.DEFAULT_CONFIG_METHODS:
+                validation['valid'] = False
+                validation['errors'].append(f"No configuration found for method: {method_name}")
             return validation
         
         # Check for required parameters
@@ -95,9 +116,17 @@ class InterpolationConfig:
 class InterpolationMetrics:
     """Calculate interpolation performance metrics"""
     
+    # Hours [start, end) counted as peak production for peak_hour_mae
+    PEAK_HOURS = (10, 14)
+    
+    # Metrics averaged across columns (and folds) into a run's overall_metrics
+    SUMMARY_KEYS = ['mae', 'rmse', 'r2_score', 'smape_percent', 'mape_percent', 'nrmse_percent', 'correlation',
+                    'peak_hour_mae', 'daily_energy_error_percent']
+    
     @staticmethod
     def calculate_metrics(y_true: np.ndarray, y_pred: np.ndarray, method_name: str) -> Dict:
         """Calculate comprehensive interpolation metrics"""
+        from sklearn.metrics import mean_squared_error, mean_absolute_error, r2_score
         
         # Remove any NaN values for metric calculation
         mask = ~(np.isnan(y_true) | np.isnan(y_pred))
@@ -159,16 +188,536 @@ class InterpolationMetrics:
         }
         
         return metrics
+    
+    @staticmethod
+    def _group_sums(values: np.ndarray, group_ids: np.ndarray, n_groups: int) -> np.ndarray:
+        """Sum (..., n_rows, n_columns) values per row group in one bincount: (..., n_columns, n_groups)"""
+        moved = np.moveaxis(values, -2, -1)
+        flat = moved.reshape(-1, moved.shape[-1])
+        ids = (np.arange(flat.shape[0])[:, None] * n_groups + group_ids[None, :]).ravel()
+        sums = np.bincount(ids, weights=flat.ravel(), minlength=flat.shape[0] * n_groups)
+        return sums.reshape(moved.shape[:-1] + (n_groups,))
+    
+    @staticmethod
+    def calculate_batch_metrics(y_true: np.ndarray, y_pred: np.ndarray, mask: np.ndarray,
+                                times: Optional[np.ndarray] = None, step_hours: Optional[float] = None,
+                                peak_hours: Tuple[int, int] = PEAK_HOURS, n_bootstrap: int = 0,
+                                confidence: float = 0.95, seed: int = 42) -> Dict[str, np.ndarray]:
+        """calculate_metrics for many (method, fold, column) combinations at once
+        
+        y_true, y_pred and mask broadcast to a common shape (..., n_rows, n_columns), e.g. truth as
+        (rows, columns) and predictions as (methods, folds, rows, columns). Only cells where mask is True and
+        neither value is NaN are scored. Every metric is reduced over the rows axis with shape (..., n_columns),
+        NaN where a combination has no scored values.
+        
+        With `times` (one timestamp per row) the solar metrics are added: `peak_hour_mae` over scored cells
+        in `peak_hours`, `daily_energy_error` (mean absolute error of each day's summed energy, in power
+        units x hours) and `daily_energy_error_percent` (relative to the true energy of the scored cells).
+        The sampling interval is the median spacing of `times` unless `step_hours` is given (needed when the
+        rows are a sample rather than consecutive).
+        With `n_bootstrap` > 0, `<metric>_ci_low`/`_ci_high` bounds are added for MAE, RMSE, R² and MBE from
+        a Poisson bootstrap over whole days (rows without `times`), computed as one matrix product.
+        """
+        y_true, y_pred, mask = np.broadcast_arrays(np.asarray(y_true, dtype=np.float64),
+                                                   np.asarray(y_pred, dtype=np.float64), mask)
+        valid = mask & ~(np.isnan(y_true) | np.isnan(y_pred))
+        n = valid.sum(axis=-2)
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            t = np.where(valid, y_true, 0.0)
+            p = np.where(valid, y_pred, 0.0)
+            error = p - t
+            
+            mae = np.abs(error).sum(axis=-2) / n
+            mse = (error ** 2).sum(axis=-2) / n
+            rmse = np.sqrt(mse)
+            mbe = error.sum(axis=-2) / n
+            
+            # R² as scikit-learn computes it, including its finite values for constant targets
+            t_mean = t.sum(axis=-2) / n
+            t_dev = np.where(valid, t - np.expand_dims(t_mean, -2), 0.0)
+            ss_res = (error ** 2).sum(axis=-2)
+            ss_tot = (t_dev ** 2).sum(axis=-2)
+            r2 = np.where(ss_tot > 0, 1 - ss_res / ss_tot, np.where(ss_res == 0, 1.0, 0.0))
+            
+            denominator = np.abs(p) + np.abs(t)
+            smape_valid = valid & (denominator > 1e-8)
+            smape_terms = np.where(smape_valid, 2 * np.abs(error) / np.where(smape_valid, denominator, 1.0), 0.0)
+            smape_count = smape_valid.sum(axis=-2)
+            smape = np.where(smape_count > 0, smape_terms.sum(axis=-2) / smape_count * 100, 0.0)
+            
+            mape_valid = valid & (np.abs(t) > 1e-8)
+            mape_terms = np.where(mape_valid, np.abs(error) / np.where(mape_valid, np.abs(t), 1.0), 0.0)
+            mape_count = mape_valid.sum(axis=-2)
+            mape = np.where(mape_count > 0, mape_terms.sum(axis=-2) / mape_count * 100, 0.0)
+            
+            y_range = np.where(valid, y_true, -np.inf).max(axis=-2) - np.where(valid, y_true, np.inf).min(axis=-2)
+            nrmse = np.where(y_range > 0, rmse / y_range * 100, 0.0)
+            
+            p_mean = p.sum(axis=-2) / n
+            p_dev = np.where(valid, p - np.expand_dims(p_mean, -2), 0.0)
+            correlation = (t_dev * p_dev).sum(axis=-2) / np.sqrt(ss_tot * (p_dev ** 2).sum(axis=-2))
+            correlation = np.where(n > 1, correlation, 0.0)
+        
+        metrics = {
+            'samples_used': n,
+            'mae': mae,
+            'mse': mse,
+            'rmse': rmse,
+            'r2_score': r2,
+            'smape_percent': smape,
+            'mape_percent': mape,
+            'nrmse_percent': nrmse,
+            'mean_bias_error': mbe,
+            'correlation': correlation
+        }
+        
+        # Rows grouped by day for the energy metrics and the bootstrap (each row its own group without times)
+        if times is not None:
+            times = pd.DatetimeIndex(pd.to_datetime(times))
+            day_codes, days = pd.factorize(times.normalize())
+            n_groups = len(days)
+            if step_hours is None:
+                step_hours = (times[1:] - times[:-1]).median().total_seconds() / 3600 if len(times) > 1 else 1.0
+            
+            with np.errstate(divide='ignore', invalid='ignore'):
+                hours = np.asarray(times.hour)
+                peak = valid & ((hours >= peak_hours[0]) & (hours < peak_hours[1]))[:, None]
+                metrics['peak_hour_mae'] = np.where(peak, np.abs(error), 0.0).sum(axis=-2) / peak.sum(axis=-2)
+                
+                daily_error = InterpolationMetrics._group_sums(error, day_codes, n_groups) * step_hours
+                daily_true = InterpolationMetrics._group_sums(t, day_codes, n_groups) * step_hours
+                scored_days = InterpolationMetrics._group_sums(valid.astype(np.float64), day_codes, n_groups) > 0
+                metrics['daily_energy_error'] = np.abs(daily_error).sum(axis=-1) / scored_days.sum(axis=-1)
+                metrics['daily_energy_error_percent'] = (np.abs(daily_error).sum(axis=-1) /
+                                                         np.abs(daily_true).sum(axis=-1) * 100)
+        else:
+            day_codes = np.arange(valid.shape[-2])
+            n_groups = valid.shape[-2]
+        
+        if n_bootstrap > 0:
+            # Sufficient statistics per group, targets centred on their full-sample mean for stability
+            t_centred = np.where(valid, t - np.nan_to_num(np.expand_dims(t_mean, -2)), 0.0)
+            stats = [InterpolationMetrics._group_sums(values, day_codes, n_groups)
+                     for values in (valid.astype(np.float64), np.abs(error), error ** 2, error,
+                                    t_centred, t_centred ** 2)]
+            weights = np.random.default_rng(seed).poisson(1.0, size=(n_bootstrap, n_groups)).astype(np.float64)
+            count, abs_sum, sq_sum, err_sum, t_sum, t_sq_sum = [np.moveaxis(stat @ weights.T, -1, 0)
+                                                                for stat in stats]
+            
+            with np.errstate(divide='ignore', invalid='ignore'):
+                ss_tot_boot = t_sq_sum - t_sum ** 2 / count
+                replicates = {
+                    'mae': abs_sum / count,
+                    'rmse': np.sqrt(sq_sum / count),
+                    'r2_score': np.where(ss_tot_boot > 0, 1 - sq_sum / ss_tot_boot, np.nan),
+                    'mean_bias_error': err_sum / count
+                }
+            
+            alpha = (1 - confidence) / 2 * 100
+            for key, values in replicates.items():
+                values = np.where(count > 0, values, np.nan)
+                with warnings.catch_warnings():
+                    warnings.simplefilter('ignore', RuntimeWarning)  # All-NaN combinations stay NaN
+                    metrics[f'{key}_ci_low'] = np.nanpercentile(values, alpha, axis=0)
+                    metrics[f'{key}_ci_high'] = np.nanpercentile(values, 100 - alpha, axis=0)
+        
+        # Combinations without scored values get NaN throughout (calculate_metrics returns an error instead)
+        empty = n == 0
+        for key in metrics:
+            if key != 'samples_used':
+                metrics[key] = np.where(empty, np.nan, metrics[key])
+        
+        return metrics
+    
+    @staticmethod
+    def column_metrics(batch: Dict[str, np.ndarray], power_columns: List[str], method_name: str) -> Dict[str, Dict]:
+        """Per-column dictionaries, as calculate_metrics returns them, from a (n_columns,) batch result"""
+        columns = {}
+        for col_idx, col in enumerate(power_columns):
+            if batch['samples_used'][col_idx] == 0:
+                columns[col] = {'error': 'No valid data points for metric calculation'}
+                continue
+            columns[col] = {'method': f"{method_name}_{col}", 'samples_used': int(batch['samples_used'][col_idx])}
+            for key, values in batch.items():
+                if key != 'samples_used':
+                    columns[col][key] = float(values[col_idx])
+        return columns
+    
+    @staticmethod
+    def average_metrics(batch: Dict[str, np.ndarray], keys: List[str], axis=None) -> Dict:
+        """`avg_<key>` means ignoring NaN (over every axis by default); keys with no finite value are left out"""
+        averages = {}
+        for key in keys:
+            values = batch.get(key)
+            if values is None or not np.isfinite(values).any():
+                continue
+            with warnings.catch_warnings():
+                warnings.simplefilter('ignore', RuntimeWarning)
+                averages[f'avg_{key}'] = np.nanmean(values, axis=axis)
+        return averages
+
+
+class ParallelTrainingExecutor:
+    """Distribute independent per-column model fits across a process pool"""
+    
+    def __init__(self, n_workers: Optional[int] = 1, n_threads: Optional[int] = None):
+        # n_threads caps the cores shared out (set when this executor already runs inside a worker)
+        cpu_count = n_threads or os.cpu_count() or 1
+        
+        # None or <= 0 means "use every available core"
+        if not n_workers or n_workers <= 0:
+            n_workers = cpu_count
+        self.n_workers = min(n_workers, cpu_count)
+        self.cpu_count = cpu_count
+    
+    def threads_for(self, n_tasks: int) -> int:
+        """Threads per task when mapping n_tasks: the cores split between the workers actually started,
+        so LightGBM threads don't oversubscribe and fewer tasks than workers still use every core"""
+        return max(1, self.cpu_count // max(1, min(self.n_workers, n_tasks)))
+    
+    def map(self, func, tasks: List[Tuple]) -> List:
+        """Run func(*task) for every task, preserving task order"""
+        if self.n_workers == 1 or len(tasks) <= 1:
+            return [func(*task) for task in tasks]
+        
+        from joblib import Parallel, delayed
+        
+        # joblib memory-maps large NumPy arguments (dumped once per call), so
+        # every worker reads the same shared feature matrices without copies.
+        # loky also caps BLAS/OpenMP threads inside each worker.
+        parallel = Parallel(n_jobs=min(self.n_workers, len(tasks)), backend='loky',
+                            max_nbytes='1M', mmap_mode='r')
+        return parallel(delayed(func)(*task) for task in tasks)
+
+
+class BlockCrossValidator:
+    """K-fold validation on synthetic gaps shaped like the site's real ones
+    
+    The series is cut into K contiguous segments and fold k hides observed values only inside segment k,
+    as runs whose lengths are resampled from the gaps the analyzer found. `block_wise_validation` and
+    `time_series_split_validation` hide runs per column; `system_level_validation` hides each run in every
+    power column at once, like a site-wide communication loss. Folds are fitted in parallel and scored
+    together with InterpolationMetrics.calculate_batch_metrics.
+    """
+    
+    STRATEGIES = ['block_wise_validation', 'system_level_validation', 'time_series_split_validation']
+    
+    def __init__(self, gap_analysis: Dict, n_folds: int = 5, validation_ratio: float = 0.15,
+                 strategy: Optional[str] = None, n_workers: Optional[int] = None, seed: int = 42,
+                 n_bootstrap: int = 0):
+        self.gap_analysis = gap_analysis
+        self.n_folds = n_folds
+        self.validation_ratio = validation_ratio
+        recommended = gap_analysis.get('analysis', {}).get('validation_strategy', {}).get('primary_strategy')
+        self.strategy = strategy or (recommended if recommended in self.STRATEGIES else 'block_wise_validation')
+        self.n_workers = n_workers
+        self.seed = seed
+        self.n_bootstrap = n_bootstrap
+    
+    def gap_lengths(self, power_columns: List[str]) -> np.ndarray:
+        """Lengths (rows) of the real gaps in the analyzed power columns"""
+        columns = self.gap_analysis.get('analysis', {}).get('columns', {})
+        lengths = [gap['length'] for col in power_columns for gap in columns.get(col, {}).get('gaps', [])]
+        return np.asarray(lengths, dtype=np.int64)
+    
+    def build_masks(self, df: pd.DataFrame, power_columns: List[str]) -> np.ndarray:
+        """Boolean (fold, row, column) array of observed cells to hide"""
+        rng = np.random.default_rng(self.seed)
+        observed = df[power_columns].notna().to_numpy()
+        n_rows = len(df)
+        boundaries = np.linspace(0, n_rows, self.n_folds + 1).astype(int)
+        
+        lengths = self.gap_lengths(power_columns)
+        if len(lengths) == 0:
+            lengths = np.minimum(rng.geometric(0.25, 1000), 32)  # No recorded gaps: mostly short runs
+        
+        system_level = self.strategy == 'system_level_validation'
+        masks = np.zeros((self.n_folds, n_rows, len(power_columns)), dtype=bool)
+        for fold in range(self.n_folds):
+            start, end = boundaries[fold], boundaries[fold + 1]
+            segment_rows = end - start
+            if segment_rows == 0:
+                continue
+            max_length = max(1, segment_rows // 2)
+            
+            for col_idx in ([None] if system_level else range(len(power_columns))):
+                cols = slice(None) if col_idx is None else col_idx
+                segment_observed = observed[start:end, cols]
+                target = int(segment_observed.sum() * self.validation_ratio)
+                hidden = masks[fold, start:end, cols]
+                
+                # Bounded number of draws, so sparse segments cannot loop forever
+                for _ in range(10 * target + 100):
+                    if hidden.sum() >= target:
+                        break
+                    length = min(int(rng.choice(lengths)), max_length)
+                    run_start = rng.integers(0, segment_rows - length + 1)
+                    hidden[run_start:run_start + length] = True
+                    hidden &= segment_observed
+        
+        return masks
+    
+    @staticmethod
+    def _run_fold(interpolator_class, options: Dict, interp_config: InterpolationConfig, df: pd.DataFrame,
+                  power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame],
+                  mask: np.ndarray) -> np.ndarray:
+        """Fit on the frame with the fold's cells hidden and return the predictions for those cells"""
+        df_fold = df.copy()
+        for col_idx, col in enumerate(power_columns):
+            values = df_fold[col].to_numpy(copy=True)
+            values[mask[:, col_idx]] = np.nan
+            df_fold[col] = values
+        
+        interpolator = interpolator_class(options, interpolation_config=interp_config)
+        interpolator.fit(df_fold, power_columns, time_column, weather_data)
+        df_result = interpolator.interpolate(df_fold, power_columns, time_column, weather_data)
+        return df_result[power_columns].to_numpy(dtype=np.float64)[mask]
+    
+    def run(self, interpolator_class, options: Dict, df: pd.DataFrame, power_columns: List[str],
+            time_column: str, weather_data: Optional[pd.DataFrame] = None) -> Dict:
+        """Fit and score every fold; metrics per fold and column plus averages"""
+        masks = self.build_masks(df, power_columns)
+        executor = ParallelTrainingExecutor(self.n_workers)
+        
+        # Each fold trains single-process on its share of the cores
+        fold_options = dict(options)
+        if executor.n_workers > 1:
+            fold_options['n_workers'] = 1
+            fold_options['n_threads'] = executor.threads_for(self.n_folds)
+        
+        interp_config = InterpolationConfig(self.gap_analysis)
+        tasks = [(interpolator_class, fold_options, interp_config, df, power_columns, time_column, weather_data,
+                  masks[fold]) for fold in range(self.n_folds)]
+        fold_predictions = executor.map(self._run_fold, tasks)
+        
+        y_pred = np.full(masks.shape, np.nan)
+        pooled_pred = np.full(masks.shape[1:], np.nan)  # Folds hide disjoint cells
+        for fold, predictions in enumerate(fold_predictions):
+            y_pred[fold][masks[fold]] = predictions
+            pooled_pred[masks[fold]] = predictions
+        y_true = df[power_columns].to_numpy(dtype=np.float64)
+        times = df[time_column].to_numpy()
+        batch = InterpolationMetrics.calculate_batch_metrics(y_true, y_pred, masks, times=times)
+        
+        metric_keys = InterpolationMetrics.SUMMARY_KEYS
+        column_averages = InterpolationMetrics.average_metrics(batch, metric_keys, axis=0)
+        column_metrics = {}
+        for col_idx, col in enumerate(power_columns):
+            column_metrics[col] = {'samples_used': int(batch['samples_used'][:, col_idx].sum())}
+            for key, values in column_averages.items():
+                column_metrics[col][key[len('avg_'):]] = float(values[col_idx])
+        
+        if self.n_bootstrap:
+            # Intervals from all folds' predictions pooled, rather than per fold
+            pooled = InterpolationMetrics.calculate_batch_metrics(y_true, pooled_pred, masks.any(axis=0), times=times,
+                                                                  n_bootstrap=self.n_bootstrap, seed=self.seed)
+            for col_idx, col in enumerate(power_columns):
+                for key in pooled:
+                    if '_ci_' in key:
+                        column_metrics[col][key] = float(pooled[key][col_idx])
+        
+        fold_averages = InterpolationMetrics.average_metrics(batch, metric_keys, axis=-1)
+        folds = []
+        for fold in range(self.n_folds):
+            fold_metrics = {'hidden_values': int(masks[fold].sum())}
+            fold_metrics.update({key: float(values[fold]) for key, values in fold_averages.items()})
+            folds.append(fold_metrics)
+        
+        fold_r2 = np.array([fold['avg_r2_score'] for fold in folds])
+        return {
+            'strategy': self.strategy,
+            'n_folds': self.n_folds,
+            'validation_ratio': self.validation_ratio,
+            'workers': executor.n_workers,
+            'hidden_values': int(masks.sum()),
+            'folds': folds,
+            'column_metrics': column_metrics,
+            'overall_metrics': {key: float(value)
+                                for key, value in InterpolationMetrics.average_metrics(batch, metric_keys).items()},
+            'r2_std_across_folds': float(np.nanstd(fold_r2))
+        }
+
+
+class MethodSelector:
+    """Budgeted choice of interpolation method by measured accuracy and cost
+    
+    Candidates are fitted, cheapest first, on a stratified sample of the data (contiguous blocks spread
+    evenly over the series, so every season is represented) with synthetic gaps shaped like the site's real
+    ones, until the wall-clock budget runs out. Raw R² per second would favour fast but poor methods, so the
+    choice is the fastest candidate whose R² is within `r2_tolerance` of the best one measured.
+    """
+    
+    # Cheapest first, so a tight budget still measures the fast methods
+    CANDIDATES = ['gap_local_spline', 'spline_interpolation', 'physics_based_model', 'multi_output_regression',
+                  'hybrid_interpolation', 'gaussian_process']
+    
+    def __init__(self, gap_analysis: Dict, budget_seconds: float = 60.0, sample_rows: int = 20000,
+                 n_blocks: int = 12, r2_tolerance: float = 0.01, candidates: Optional[List[str]] = None,
+                 seed: int = 42):
+        self.gap_analysis = gap_analysis
+        self.budget_seconds = budget_seconds
+        self.sample_rows = sample_rows
+        self.n_blocks = n_blocks
+        self.r2_tolerance = r2_tolerance
+        self.candidates = candidates or self.CANDIDATES
+        self.seed = seed
+    
+    def data_profile(self, df: pd.DataFrame, power_columns: List[str], options: Dict) -> Dict:
+        """Coarse description of the data; a cached selection is reused while it stays the same"""
+        overall = self.gap_analysis.get('analysis', {}).get('overall_stats', {})
+        distribution = overall.get('gap_length_distribution', {})
+        total_gaps = sum(distribution.values()) or 1
+        return {
+            'power_columns': len(power_columns),
+            'time_frequency': self.gap_analysis.get('structure', {}).get('time_frequency'),
+            'rows_log2': int(np.log2(max(len(df), 1))),
+            'missing_percent': int(df[power_columns].isna().to_numpy().mean() * 100 // 5 * 5),
+            'gap_length_shares': {label: round(count / total_gaps, 1) for label, count in distribution.items()},
+            'options': {key: value for key, value in options.items() if key not in EXECUTION_OPTIONS},
+            'candidates': self.candidates,
+            'r2_tolerance': self.r2_tolerance
+        }
+    
+    def stratified_sample(self, df: pd.DataFrame) -> pd.DataFrame:
+        """n_blocks contiguous blocks spread evenly over the series, sample_rows rows in total"""
+        if len(df) <= self.sample_rows:
+            return df
+        block_rows = self.sample_rows // self.n_blocks
+        starts = np.linspace(0, len(df) - block_rows, self.n_blocks).astype(int)
+        positions = (starts[:, None] + np.arange(block_rows)[None, :]).ravel()
+        return df.iloc[positions]
+    
+    def select(self, interpolators: Dict[str, type], options: Dict, df: pd.DataFrame, power_columns: List[str],
+               time_column: str, weather_data: Optional[pd.DataFrame] = None) -> Dict:
+        """Measure the candidates within the budget and return the choice with every trial"""
+        sample = self.stratified_sample(df)
+        mask = BlockCrossValidator(self.gap_analysis, n_folds=1, seed=self.seed).build_masks(sample, power_columns)[0]
+        y_true = sample[power_columns].to_numpy(dtype=np.float64)
+        times = sample[time_column].to_numpy()
+        interp_config = InterpolationConfig(self.gap_analysis)
+        
+        trials = []
+        start = time.perf_counter()
+        for method in self.candidates:
+            if method not in interpolators:
+                continue
+            if trials and time.perf_counter() - start >= self.budget_seconds:
+                trials.append({'method': method, 'skipped': 'budget exhausted'})
+                continue
+            
+            trial_start = time.perf_counter()
+            try:
+                with contextlib.redirect_stdout(io.StringIO()):
+                    predictions = BlockCrossValidator._run_fold(interpolators[method], options, interp_config, sample,
+                                                                power_columns, time_column, weather_data, mask)
+            except Exception as e:
+                trials.append({'method': method, 'error': str(e)})
+                continue
+            seconds = time.perf_counter() - trial_start
+            
+            y_pred = np.full(mask.shape, np.nan)
+            y_pred[mask] = predictions
+            batch = InterpolationMetrics.calculate_batch_metrics(y_true, y_pred, mask, times=times)
+            averages = InterpolationMetrics.average_metrics(batch, ['r2_score', 'mae', 'daily_energy_error_percent'])
+            trial = {'method': method, 'seconds': round(seconds, 3)}
+            trial.update({key[len('avg_'):]: float(value) for key, value in averages.items()})
+            trials.append(trial)
+            print(f"  {method}: R² {trial.get('r2_score', float('nan')):.4f} in {seconds:.2f}s")
+        
+        measured = [trial for trial in trials if np.isfinite(trial.get('r2_score', np.nan))]
+        if not measured:
+            raise ValueError("Automatic method selection failed: no candidate could be scored")
+        best_r2 = max(trial['r2_score'] for trial in measured)
+        eligible = [trial for trial in measured if trial['r2_score'] >= best_r2 - self.r2_tolerance]
+        choice = min(eligible, key=lambda trial: trial['seconds'])
+        
+        return {
+            'method': choice['method'],
+            'sample_rows': len(sample),
+            'hidden_values': int(mask.sum()),
+            'budget_seconds': self.budget_seconds,
+            'elapsed_seconds': round(time.perf_counter() - start, 3),
+            'trials': trials
+        }
+
+
+class CorrelationFeatureBlock:
+    """Historical lag/rolling features of every correlation source, shared by all per-column models
+
+    Each source contributes the features in CORRELATION_FEATURE_SUFFIXES order. The five continuous
+    features are stored as float64 (float32 in compact mode); the two availability flags are packed
+    into a bitset, eight rows per byte, and only unpacked for the rows a model asks for.
+    """
+    N_CONTINUOUS = 5  # hist_1h, hist_2h, hist_3h, hist_mean_6h, hist_std_6h
+    N_FLAGS = 2       # available, available_lag1
+
+    def __init__(self, n_rows: int, n_sources: int, dtype=np.float64):
+        self.n_rows = n_rows
+        self.values = np.empty((n_rows, n_sources * self.N_CONTINUOUS), dtype=dtype)
+        self.flags = np.zeros(((n_rows + 7) // 8, n_sources * self.N_FLAGS), dtype=np.uint8)
+
+    @property
+    def nbytes(self) -> int:
+        return self.values.nbytes + self.flags.nbytes
+
+    def set_flag(self, source: int, flag: int, values: np.ndarray):
+        """Pack one boolean flag column of a source into the bitset"""
+        self.flags[:, source * self.N_FLAGS + flag] = np.packbits(np.asarray(values, dtype=bool))
+
+    def take(self, rows: np.ndarray, block_indices: List[int], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """Dense feature matrix for `rows`, columns in block (source-major, suffix-minor) order"""
+        rows = np.asarray(rows, dtype=np.int64)
+        block_indices = np.asarray(block_indices, dtype=np.int64)
+        n_features = self.N_CONTINUOUS + self.N_FLAGS
+        sources, features = np.divmod(block_indices, n_features)
+
+        result = np.empty((len(rows), len(block_indices)), dtype=self.values.dtype) if out is None else out
+        continuous = features < self.N_CONTINUOUS
+        result[:, continuous] = self.values[np.ix_(rows, sources[continuous] * self.N_CONTINUOUS + features[continuous])]
+
+        # Bit (7 - row % 8) of byte row // 8 holds the flag (np.packbits big-endian order)
+        flag_columns = sources[~continuous] * self.N_FLAGS + features[~continuous] - self.N_CONTINUOUS
+        packed = self.flags[np.ix_(rows >> 3, flag_columns)]
+        result[:, ~continuous] = (packed >> (7 - (rows & 7))[:, None].astype(np.uint8)) & 1
+        return result
+
+
+# Smallest dtype holding each calendar feature (compact-dtype mode)
+CALENDAR_FEATURE_DTYPES = {
+    'hour': np.uint8,
+    'day_of_year': np.uint16,
+    'month': np.uint8,
+    'day_of_week': np.uint8,
+    'is_weekend': np.uint8,
+    'season': np.uint8,
+    'is_summer': np.uint8,
+    'is_winter': np.uint8
+}
+
+
+def releases_features(interpolate):
+    """Decorator for interpolate(): the feature build cached by fit() is used at most by the interpolate call
+    that follows it, and nothing is kept once that call returns"""
+    @functools.wraps(interpolate)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return interpolate(self, *args, **kwargs)
+        finally:
+            self._feature_cache = None
+    return wrapper
 
 
 class BaseInterpolator(ABC):
     """Abstract base class for all interpolation methods"""
     
-    def __init__(self, config: Optional[Dict] = None):
+    def __init__(self, config: Optional[Dict] = None, interpolation_config: Optional[InterpolationConfig] = None):
         self.config = config or {}
+        self.interp_config = interpolation_config
         self.is_fitted = False
         self.metadata = {}
         self.scaler = None
+        self._feature_cache = None
     
     @abstractmethod
     def get_method_name(self) -> str:
@@ -176,37 +725,189 @@ class BaseInterpolator(ABC):
         pass
     
     @abstractmethod
-    def fit(self, df: pd.DataFrame, power_columns: List[str], time_column: str) -> 'BaseInterpolator':
+    def fit(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> 'BaseInterpolator':
         """Fit the interpolator to training data"""
         pass
     
     @abstractmethod
-    def interpolate(self, df: pd.DataFrame, power_columns: List[str], time_column: str) -> pd.DataFrame:
+    def interpolate(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
         """Perform interpolation on missing values"""
         pass
     
+    def get_setting(self, method_name: Optional[str], key: str, default: Any = None) -> Any:
+        """Resolve a setting from interpolator config, then the method's gap analysis configuration"""
+        if self.config.get(key) is not None:
+            return self.config[key]
+        if self.interp_config:
+            method_config = self.interp_config.get_method_config(method_name)
+            if method_config.get(key) is not None:
+                return method_config[key]
+            model_parameters = method_config.get('model_parameters', {})
+            if model_parameters.get(key) is not None:
+                return model_parameters[key]
+        return default
+    
+    def get_training_executor(self, method_name: str) -> ParallelTrainingExecutor:
+        """Build the per-column training executor from config or gap analysis model parameters"""
+        return ParallelTrainingExecutor(self.get_setting(method_name, 'n_workers', 1),
+                                        self.get_setting(method_name, 'n_threads'))
+    
+    @staticmethod
+    def find_gap_runs(missing_mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Run-length gap table: start positions and lengths of consecutive missing values"""
+        padded = np.concatenate([[False], np.asarray(missing_mask, dtype=bool), [False]])
+        edges = np.flatnonzero(padded[1:] != padded[:-1])
+        starts, ends = edges[::2], edges[1::2]
+        return starts, ends - starts
+    
+    def get_solar_geometry(self, method_name: Optional[str] = None) -> SolarGeometry:
+        """Solar geometry for the site from config, method configuration or the gap analysis site block"""
+        site = (self.interp_config.gap_analysis.get('site') or {}) if self.interp_config else {}
+        latitude = self.get_setting(method_name, 'latitude', site.get('latitude'))
+        longitude = self.get_setting(method_name, 'longitude', site.get('longitude'))
+        
+        return SolarGeometry(
+            latitude=latitude,
+            longitude=longitude,
+            utc_offset_hours=self.get_setting(method_name, 'utc_offset_hours', site.get('utc_offset_hours')),
+            min_elevation=self.get_setting(method_name, 'min_solar_elevation', 0.0),
+            sunrise_hour=self.get_setting(method_name, 'sunrise_hour', 6),
+            sunset_hour=self.get_setting(method_name, 'sunset_hour', 18)
+        )
+    
+    def get_daylight_mask(self, df: pd.DataFrame, time_column: str, method_name: Optional[str] = None) -> np.ndarray:
+        """Daylight rows from solar elevation when the site location is known, else from an hour threshold"""
+        return self.get_solar_geometry(method_name).daylight_mask(df[time_column])
+    
+    def select_daylight_rows(self, df: pd.DataFrame, time_column: str, method_name: str) -> pd.DataFrame:
+        """Training rows for daylight-only mode (all rows otherwise)"""
+        if not self.get_setting(method_name, 'daylight_only', False):
+            return df
+        return df.loc[self.get_daylight_mask(df, time_column, method_name)]
+    
+    # Cloud cover (%) edges between clear, broken and overcast weather regimes
+    CLOUD_REGIME_EDGES = [20.0, 60.0]
+    
+    def training_strata(self, df_features: pd.DataFrame) -> np.ndarray:
+        """Stratum id per row: hour of day x season x weather regime (cloud cover, when weather is joined)"""
+        hour = df_features['hour'].to_numpy().astype(np.int64)
+        season = (df_features['month'].to_numpy().astype(np.int64) % 12) // 3
+        regime = np.zeros(len(df_features), dtype=np.int64)
+        if 'cloud_cover' in df_features.columns:
+            cloud = df_features['cloud_cover'].to_numpy(dtype=float)
+            regime = np.where(np.isnan(cloud), len(self.CLOUD_REGIME_EDGES) + 1,
+                              np.digitize(cloud, self.CLOUD_REGIME_EDGES))
+        return (hour * 4 + season) * (len(self.CLOUD_REGIME_EDGES) + 2) + regime
+    
+    def sample_training_rows(self, rows: np.ndarray, strata: np.ndarray, method_name: str) -> np.ndarray:
+        """Keep at most `max_rows_per_stratum` training rows per stratum, chosen at random (all rows when unset)
+
+        Accuracy plateaus long before every row of a multi-year history is used, so capping each stratum
+        bounds training time while keeping every hour, season and weather regime represented.
+        """
+        cap = self.get_setting(method_name, 'max_rows_per_stratum')
+        if not cap or len(rows) == 0:
+            return rows
+        
+        row_strata = strata[rows]
+        counts = np.bincount(row_strata)
+        if counts.max() <= cap:
+            return rows
+        
+        # Random order within each stratum, then the first `cap` of each
+        rng = np.random.RandomState(self.get_setting(method_name, 'sample_seed', 42))
+        order = np.lexsort((rng.random_sample(len(rows)), row_strata))
+        rank = np.arange(len(rows)) - np.repeat(np.cumsum(counts) - counts, counts)
+        return rows[np.sort(order[rank < cap])]
+    
+    def interpolate_daylight_only(self, df: pd.DataFrame, power_columns: List[str], time_column: str,
+                                  weather_data: Optional[pd.DataFrame], method_name: str, interpolate_rows) -> pd.DataFrame:
+        """Run `interpolate_rows` on daylight rows only and fill night rows with zero directly"""
+        daylight = self.get_daylight_mask(df, time_column, method_name)
+        columns = [col for col in power_columns if col in df.columns]
+        df_result = df.copy()
+        
+        if daylight.any():
+            df_daylight = interpolate_rows(df.loc[daylight], columns, time_column, weather_data)
+            df_result.loc[daylight, columns] = df_daylight[columns].to_numpy()
+        
+        # Night rows are never featurised or predicted
+        df_result.loc[~daylight, columns] = 0
+        
+        return self.apply_solar_constraints(df_result, power_columns, time_column)
+    
+    @traced('constraints')
     def apply_solar_constraints(self, df: pd.DataFrame, power_columns: List[str], time_column: str) -> pd.DataFrame:
         """Apply solar physics constraints"""
         df_result = df.copy()
         
         # Convert time column to datetime
         df_result[time_column] = pd.to_datetime(df_result[time_column])
-        df_result['hour'] = df_result[time_column].dt.hour
         
         # Solar constraint: nighttime power = 0
-        night_mask = (df_result['hour'] <= 5) | (df_result['hour'] >= 19)
+        night_mask = ~self.get_daylight_mask(df_result, time_column)
         
         for col in power_columns:
             df_result.loc[night_mask, col] = 0
             # Ensure no negative values
             df_result[col] = df_result[col].clip(lower=0)
         
-        # Remove temporary hour column
-        df_result = df_result.drop('hour', axis=1)
-        
         return df_result
     
+    def refit(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> 'BaseInterpolator':
+        """Update an already fitted interpolator with additional rows (defaults to a full fit)"""
+        return self.fit(df, power_columns, time_column, weather_data)
+    
+    def partial_fit(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> 'BaseInterpolator':
+        """Update the fitted state with a batch of new rows only, at a cost proportional to the batch"""
+        raise NotImplementedError(f"{type(self).__name__} does not support incremental updates")
+    
+    def to_artifact(self) -> Dict:
+        """Snapshot of the fitted state for the model registry (transient caches dropped)"""
+        state = self.__dict__.copy()
+        state['_feature_cache'] = None
+        state['interp_config'] = self.interp_config.gap_analysis if self.interp_config else None
+        return {'class': type(self).__name__, 'state': state}
+    
+    @classmethod
+    def from_artifact(cls, artifact: Dict) -> 'BaseInterpolator':
+        """Rebuild a fitted interpolator from a registry artifact"""
+        state = dict(artifact['state'])
+        if state.get('interp_config') is not None:
+            state['interp_config'] = InterpolationConfig(state['interp_config'])
+        
+        interpolator = cls.__new__(cls)
+        interpolator.__dict__.update(state)
+        return interpolator
+    
+    @traced('features')
     def create_features(self, df: pd.DataFrame, time_column: str, weather_data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Create basic features for interpolation, reusing the previous build for the same time axis once
+        (e.g. fit's build in the interpolate call that follows)"""
+        cache = self._feature_cache
+        self._feature_cache = None
+        if (cache is not None and cache['weather_data'] is weather_data and
+                cache['time_column'] == time_column and df.index.equals(cache['index']) and
+                set(df.columns) <= set(cache['features'].columns) and
+                np.array_equal(df[time_column].to_numpy(), cache['time_values'])):
+            # Same timestamps and weather: only the observed values can differ
+            df_features = cache['features']
+            for col in df.columns:
+                if col != time_column:
+                    df_features[col] = df[col].to_numpy()
+            return df_features
+        
+        df_features = self._build_features(df, time_column, weather_data)
+        self._feature_cache = {
+            'time_column': time_column,
+            'time_values': df[time_column].to_numpy(),
+            'index': df.index,
+            'weather_data': weather_data,
+            'features': df_features
+        }
+        return df_features.copy()
+    
+    def _build_features(self, df: pd.DataFrame, time_column: str, weather_data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
         """Create basic features for interpolation"""
         df_features = df.copy()
         
@@ -229,9 +930,32 @@ class BaseInterpolator(ABC):
         # Add weather features if available
         if weather_data is not None:
             df_features = self._add_weather_features(df_features, time_column, weather_data)
-        
+
+        if self.use_compact_dtypes():
+            df_features = self.compact_features(df_features)
+
         return df_features
+
+    def use_compact_dtypes(self, method_name: Optional[str] = None) -> bool:
+        """Whether features are built as float32 / small unsigned integers instead of float64 / int64"""
+        return bool(self.get_setting(method_name, 'compact_dtypes', False))
+
+    @staticmethod
+    def as_column_dtype(df: pd.DataFrame, column: str, values: np.ndarray) -> np.ndarray:
+        """Filled values in the column's own dtype (float32 power columns in compact-dtype mode)"""
+        return np.asarray(values, dtype=df[column].dtype)
     
+    @staticmethod
+    def compact_features(df_features: pd.DataFrame) -> pd.DataFrame:
+        """Downcast calendar features to uint8/uint16 and every other float64 column to float32"""
+        dtypes = {}
+        for col in df_features.columns:
+            if col in CALENDAR_FEATURE_DTYPES:
+                dtypes[col] = CALENDAR_FEATURE_DTYPES[col]
+            elif df_features[col].dtype == np.float64:
+                dtypes[col] = np.float32
+        return df_features.astype(dtypes, copy=False)
+
     def _add_weather_features(self, df: pd.DataFrame, time_column: str, weather_data: pd.DataFrame) -> pd.DataFrame:
         """Add comprehensive weather features to the dataframe"""
         df_weather = df.copy()
@@ -337,7 +1061,7 @@ class SplineInterpolator(BaseInterpolator):
     def get_method_name(self) -> str:
         return "Cubic Spline Interpolation"
     
-    def fit(self, df: pd.DataFrame, power_columns: List[str], time_column: str) -> 'SplineInterpolator':
+    def fit(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> 'SplineInterpolator':
         """Splines don't require fitting"""
         self.is_fitted = True
         self.metadata = {
@@ -347,8 +1071,10 @@ class SplineInterpolator(BaseInterpolator):
         }
         return self
     
-    def interpolate(self, df: pd.DataFrame, power_columns: List[str], time_column: str) -> pd.DataFrame:
+    @releases_features
+    def interpolate(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
         """Perform spline interpolation"""
+        from scipy import interpolate
         df_result = df.copy()
         
         # Convert time to numeric for interpolation
@@ -373,7 +1099,166 @@ class SplineInterpolator(BaseInterpolator):
                     # Fill missing values
                     missing_mask = df_result[col].isna()
                     if missing_mask.any():
-                        df_result.loc[missing_mask, col] = spline(time_numeric[missing_mask])
+                        df_result.loc[missing_mask, col] = self.as_column_dtype(df_result, col, spline(time_numeric[missing_mask]))
+        
+        # Apply solar constraints
+        df_result = self.apply_solar_constraints(df_result, power_columns, time_column)
+        
+        return df_result
+
+
+class GapLocalSplineInterpolator(BaseInterpolator):
+    """Gap-local spline/PCHIP interpolation: fits only a small window of observed points around each gap"""
+    
+    SUPPORTED_KINDS = ['cubic', 'pchip', 'akima', 'linear']
+    
+    def get_method_name(self) -> str:
+        return "Gap-Local Spline Interpolation"
+    
+    def fit(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> 'GapLocalSplineInterpolator':
+        """Local splines don't require fitting"""
+        kind = self.get_setting('gap_local_spline', 'kind', 'pchip')
+        if kind not in self.SUPPORTED_KINDS:
+            raise ValueError(f"Unsupported spline kind '{kind}', expected one of {self.SUPPORTED_KINDS}")
+        
+        self.is_fitted = True
+        self.metadata = {
+            'method': 'gap_local_spline',
+            'kind': kind,
+            'window': self.get_setting('gap_local_spline', 'window', 4),
+            'max_gap_length': self.get_setting('gap_local_spline', 'max_gap_length'),
+            'extrapolation': 'nearest'
+        }
+        return self
+    
+    def _interpolate_window(self, x_context: np.ndarray, y_context: np.ndarray, x_gap: np.ndarray, kind: str) -> np.ndarray:
+        """Evaluate one local interpolant over a gap (cubic and akima kinds, which depend on the whole window)"""
+        from scipy import interpolate
+        if len(x_context) < 4:
+            return np.interp(x_gap, x_context, y_context)  # Too few points for a cubic fit
+        
+        if kind == 'akima':
+            return interpolate.Akima1DInterpolator(x_context, y_context)(x_gap)
+        return interpolate.CubicSpline(x_context, y_context)(x_gap)
+    
+    @staticmethod
+    def _pchip_slope(h_before: np.ndarray, m_before: np.ndarray, h_after: np.ndarray, m_after: np.ndarray) -> np.ndarray:
+        """PCHIP derivative at an inner knot from the widths and slopes of the intervals either side (as scipy)"""
+        w1 = 2 * h_after + h_before
+        w2 = h_after + 2 * h_before
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope = (w1 + w2) / (w1 / m_before + w2 / m_after)
+        flat = (np.sign(m_before) != np.sign(m_after)) | (m_before == 0) | (m_after == 0)
+        return np.where(flat, 0.0, slope)
+    
+    @staticmethod
+    def _pchip_end_slope(h0: np.ndarray, m0: np.ndarray, h1: np.ndarray, m1: np.ndarray) -> np.ndarray:
+        """PCHIP derivative at the first or last knot (h0, m0: the end interval; h1, m1: the next one in)"""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            slope = ((2 * h0 + h1) * m0 - h0 * m1) / (h0 + h1)
+        slope = np.where(np.sign(slope) != np.sign(m0), 0.0, slope)
+        return np.where((np.sign(m0) != np.sign(m1)) & (np.abs(slope) > 3 * np.abs(m0)), 3 * m0, slope)
+    
+    def _fill_column(self, x: np.ndarray, values: np.ndarray, gap_starts: np.ndarray, gap_lengths: np.ndarray,
+                     kind: str, window: int) -> None:
+        """Fill the given gaps of one column in place, all gaps at once for the linear and pchip kinds
+        
+        Only the observed points next to a gap shape it: linear uses one on each side, pchip two
+        (its slopes at the gap's ends), and cubic/akima the whole window, evaluated gap by gap.
+        """
+        observed = np.flatnonzero(~np.isnan(values))
+        if len(observed) == 0 or len(gap_starts) == 0:
+            return
+        
+        # observed[pos - 1] is the last observed row before each gap and observed[pos] the first after it
+        pos = np.searchsorted(observed, gap_starts)
+        gap_index = np.repeat(np.arange(len(gap_starts)), gap_lengths)
+        gap_rows = np.repeat(gap_starts - np.cumsum(gap_lengths) + gap_lengths, gap_lengths) + np.arange(len(gap_index))
+        
+        # Gaps at the edge of the series hold the nearest observed value
+        hold = np.where(pos == 0, observed[0], observed[-1])
+        edge = (pos == 0) | (pos == len(observed))
+        edge_rows = edge[gap_index]
+        values[gap_rows[edge_rows]] = values[hold[gap_index[edge_rows]]]
+        
+        inner = ~edge
+        if not inner.any():
+            return
+        n_left = np.minimum(pos, window)
+        n_right = np.minimum(len(observed) - pos, window)
+        
+        if kind in ('cubic', 'akima'):
+            # (gaps x 2 * window) context index into the observed rows, masked where the series runs out
+            context = pos[:, None] + np.arange(-window, window)
+            in_range = (context >= 0) & (context < len(observed))
+            context_rows = observed[np.clip(context, 0, len(observed) - 1)]
+            for gap in np.flatnonzero(inner):
+                rows = np.arange(gap_starts[gap], gap_starts[gap] + gap_lengths[gap])
+                window_rows = context_rows[gap][in_range[gap]]
+                values[rows] = self._interpolate_window(x[window_rows], values[window_rows], x[rows], kind)
+            return
+        
+        def knot(offset):
+            rows = observed[np.clip(pos + offset, 0, len(observed) - 1)]
+            return x[rows], values[rows]
+        
+        x_l2, y_l2 = knot(-2)
+        x_l1, y_l1 = knot(-1)
+        x_r1, y_r1 = knot(0)
+        x_r2, y_r2 = knot(1)
+        
+        h = x_r1 - x_l1
+        m = (y_r1 - y_l1) / h
+        
+        # Fewer than four points fall back to linear, as a cubic fit would need more
+        cubic = inner & (n_left + n_right >= 4) & (kind == 'pchip')
+        if cubic.any():
+            with np.errstate(divide='ignore', invalid='ignore'):
+                h_left, m_left = x_l1 - x_l2, (y_l1 - y_l2) / (x_l1 - x_l2)
+                h_right, m_right = x_r2 - x_r1, (y_r2 - y_r1) / (x_r2 - x_r1)
+            slope_left = np.where(n_left >= 2, self._pchip_slope(h_left, m_left, h, m),
+                                  self._pchip_end_slope(h, m, h_right, m_right))
+            slope_right = np.where(n_right >= 2, self._pchip_slope(h, m, h_right, m_right),
+                                   self._pchip_end_slope(h, m, h_left, m_left))
+            slope_left = np.where(cubic, slope_left, m)
+            slope_right = np.where(cubic, slope_right, m)
+        else:
+            slope_left = slope_right = m
+        
+        # Cubic Hermite on the gap's interval; with both end slopes equal to m it is the straight line
+        rows = gap_rows[inner[gap_index]]
+        g = gap_index[inner[gap_index]]
+        t = (x[rows] - x_l1[g]) / h[g]
+        t2, t3 = t * t, t * t * t
+        values[rows] = ((2 * t3 - 3 * t2 + 1) * y_l1[g] + (t3 - 2 * t2 + t) * h[g] * slope_left[g] +
+                        (3 * t2 - 2 * t3) * y_r1[g] + (t3 - t2) * h[g] * slope_right[g])
+    
+    @releases_features
+    def interpolate(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Fill each gap from the observed points immediately around it"""
+        if not self.is_fitted:
+            raise ValueError("Must call fit() before interpolate()")
+        
+        df_result = df.copy()
+        columns = [col for col in power_columns if col in df_result.columns]
+        
+        kind = self.metadata['kind']
+        window = self.metadata['window']
+        max_gap_length = self.metadata['max_gap_length']
+        
+        # Seconds since the first timestamp keeps irregular sampling intact
+        times = pd.to_datetime(df_result[time_column])
+        x = (times - times.iloc[0]).dt.total_seconds().to_numpy()
+        
+        values = df_result[columns].to_numpy(dtype=float, copy=True)
+        for col_idx in range(len(columns)):
+            gap_starts, gap_lengths = self.find_gap_runs(np.isnan(values[:, col_idx]))
+            if max_gap_length is not None:
+                short = gap_lengths <= max_gap_length
+                gap_starts, gap_lengths = gap_starts[short], gap_lengths[short]
+            self._fill_column(x, values[:, col_idx], gap_starts, gap_lengths, kind, window)
+        
+        df_result[columns] = values
         
         # Apply solar constraints
         df_result = self.apply_solar_constraints(df_result, power_columns, time_column)
@@ -384,66 +1269,233 @@ class SplineInterpolator(BaseInterpolator):
 class GaussianProcessInterpolator(BaseInterpolator):
     """Gaussian Process interpolation for medium gaps"""
     
-    def __init__(self, config: Optional[Dict] = None):
-        super().__init__(config)
+    # Exact GP below this many training points, exact GP on an evenly spaced subset of them above it
+    DEFAULT_MAX_EXACT_POINTS = 2000
+    
+    def __init__(self, config: Optional[Dict] = None, interpolation_config: Optional[InterpolationConfig] = None):
+        super().__init__(config, interpolation_config)
         self.gp_models = {}
     
     def get_method_name(self) -> str:
         return "Gaussian Process Regression"
     
-    def fit(self, df: pd.DataFrame, power_columns: List[str], time_column: str) -> 'GaussianProcessInterpolator':
-        """Fit GP models for each power column"""
+    def _build_kernel(self):
+        """Kernel shared by all GP modes: amplitude x smooth trend x rough local variation, plus noise
+        
+        Targets are standardized (normalize_y) and features MinMax-scaled, so unit amplitude and length
+        scales of a fraction of the feature range are the natural starting points.
+        """
+        from sklearn.gaussian_process.kernels import RBF, ConstantKernel, Matern, WhiteKernel
+        return (ConstantKernel(1.0, constant_value_bounds=(1e-2, 1e2)) *
+                RBF(length_scale=0.5, length_scale_bounds=(1e-3, 1e2)) *
+                Matern(length_scale=0.1, length_scale_bounds=(1e-3, 1e2), nu=1.5) +
+                WhiteKernel(noise_level=1e-2, noise_level_bounds=(1e-6, 1.0)))
+    
+    def _select_training_rows(self, complete_rows: np.ndarray, mode: str) -> np.ndarray:
+        """Training rows for a mode: all rows for exact GPs, an evenly spread subset of them otherwise
+        (subset of data: the GP is exact on the subset and never sees the other rows)"""
+        if mode == 'exact':
+            return complete_rows
+        
+        n_subset = self.get_setting('gaussian_process', 'subset_points', 1000)
+        if len(complete_rows) <= n_subset:
+            return complete_rows
+        
+        # Evenly spaced in time so every season and hour stays represented
+        positions = np.linspace(0, len(complete_rows) - 1, n_subset).round().astype(int)
+        return complete_rows[np.unique(positions)]
+    
+    def fit(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> 'GaussianProcessInterpolator':
+        """Fit GP models for each power column (exact, subset-of-data or local mode)
+        
+        Subset fits are scored on complete rows left out of the subset (`holdout_r2` in the metadata),
+        with a warning when they do worse than predicting the column mean.
+        """
+        from sklearn.preprocessing import MinMaxScaler
+        df = self.select_daylight_rows(df, time_column, 'gaussian_process')
         
         # Create features
         df_features = self.create_features(df, time_column)
         
         feature_cols = ['hour', 'day_of_year', 'hour_sin', 'hour_cos', 'day_sin', 'day_cos']
+        feature_matrix = df_features[feature_cols].to_numpy(dtype=float)
         
+        gp_mode = self.get_setting('gaussian_process', 'gp_mode', 'auto')
+        max_exact_points = self.get_setting('gaussian_process', 'max_exact_points', self.DEFAULT_MAX_EXACT_POINTS)
+        n_restarts = self.get_setting('gaussian_process', 'n_restarts_optimizer', 3)
+        
+        # Restart starting points, sampled exactly like sklearn's built-in restarts
+        base_kernel = self._build_kernel()
+        rng = np.random.RandomState(42)
+        bounds = base_kernel.bounds
+        restart_thetas = [base_kernel.theta] + [rng.uniform(bounds[:, 0], bounds[:, 1]) for _ in range(n_restarts)]
+        
+        # One task per (column, restart) so restarts run in parallel as well
+        tasks = []
+        column_info = {}
         for col in power_columns:
             if col in df_features.columns:
                 # Get complete cases
-                complete_mask = df_features[col].notna()
+                complete_rows = np.flatnonzero(df_features[col].notna().to_numpy())
                 
-                if complete_mask.sum() > 10:  # Need sufficient data
-                    X_train = df_features.loc[complete_mask, feature_cols]
-                    y_train = df_features.loc[complete_mask, col]
-                    
-                    # Configure kernel
-                    kernel = (RBF(length_scale=10.0) * 
-                             Matern(length_scale=5.0, nu=1.5) + 
-                             WhiteKernel(noise_level=1e-2))
-                    
-                    # Fit GP model
-                    gp = GaussianProcessRegressor(
-                        kernel=kernel,
-                        alpha=1e-6,
-                        n_restarts_optimizer=3,
-                        random_state=42
-                    )
+                if len(complete_rows) > 10:  # Need sufficient data
+                    mode = gp_mode
+                    if mode == 'auto':
+                        mode = 'exact' if len(complete_rows) <= max_exact_points else 'subset'
+                    train_rows = self._select_training_rows(complete_rows, mode)
                     
                     # Scale features
                     scaler = MinMaxScaler()
-                    X_train_scaled = scaler.fit_transform(X_train)
-                    
-                    gp.fit(X_train_scaled, y_train)
+                    X_train_scaled = scaler.fit_transform(feature_matrix[train_rows])
+                    y_train = df_features[col].to_numpy(dtype=float)[train_rows]
                     
-                    self.gp_models[col] = {
-                        'model': gp,
-                        'scaler': scaler,
-                        'feature_cols': feature_cols
-                    }
+                    column_info[col] = {'scaler': scaler, 'mode': mode, 'training_points': len(train_rows),
+                                        'holdout_rows': self._holdout_rows(complete_rows, train_rows)}
+                    for theta in restart_thetas:
+                        tasks.append((col, X_train_scaled, y_train, base_kernel.clone_with_theta(theta)))
+        
+        executor = self.get_training_executor('gaussian_process')
+        fitted = executor.map(GaussianProcessInterpolator._fit_restart, [task[1:] for task in tasks])
+        
+        # Keep the restart with the highest log marginal likelihood per column
+        best_models = {}
+        for (col, *_), gp in zip(tasks, fitted):
+            if col not in best_models or gp.log_marginal_likelihood_value_ > best_models[col].log_marginal_likelihood_value_:
+                best_models[col] = gp
+        
+        for col, gp in best_models.items():
+            self.gp_models[col] = {
+                'model': gp,
+                'scaler': column_info[col]['scaler'],
+                'feature_cols': feature_cols,
+                'mode': column_info[col]['mode'],
+                'training_points': column_info[col]['training_points'],
+                'holdout_r2': None
+            }
+            holdout_rows = column_info[col]['holdout_rows']
+            if len(holdout_rows) > 1:
+                y_holdout = df_features[col].to_numpy(dtype=float)[holdout_rows]
+                predictions = self._predict_batched(gp, column_info[col]['scaler'].transform(feature_matrix[holdout_rows]))
+                total = np.sum((y_holdout - y_holdout.mean()) ** 2)
+                r2 = float(1 - np.sum((y_holdout - predictions) ** 2) / total) if total > 0 else None
+                self.gp_models[col]['holdout_r2'] = r2
+                if r2 is not None and r2 < 0:
+                    print(f"Warning: {column_info[col]['mode']} GP for {col} scores R² {r2:.2f} on rows outside its "
+                          f"{column_info[col]['training_points']}-point subset, worse than the column mean")
         
         self.is_fitted = True
         self.metadata = {
             'method': 'gaussian_process',
             'models_trained': len(self.gp_models),
-            'kernel_type': 'RBF + Matern + WhiteNoise'
+            'kernel_type': 'Constant x RBF x Matern + WhiteNoise',
+            'gp_modes': {col: info['mode'] for col, info in self.gp_models.items()},
+            'training_points': {col: info['training_points'] for col, info in self.gp_models.items()},
+            'holdout_r2': {col: info['holdout_r2'] for col, info in self.gp_models.items()},
+            'training_workers': executor.n_workers,
+            'daylight_only': self.get_setting('gaussian_process', 'daylight_only', False)
         }
         
         return self
     
-    def interpolate(self, df: pd.DataFrame, power_columns: List[str], time_column: str) -> pd.DataFrame:
+    @staticmethod
+    def _holdout_rows(complete_rows: np.ndarray, train_rows: np.ndarray, max_rows: int = 1000) -> np.ndarray:
+        """Up to max_rows evenly spaced complete rows that the subset left out"""
+        left_out = np.setdiff1d(complete_rows, train_rows, assume_unique=True)
+        if len(left_out) <= max_rows:
+            return left_out
+        return left_out[np.linspace(0, len(left_out) - 1, max_rows).round().astype(int)]
+    
+    @staticmethod
+    def _fit_restart(X_train_scaled: np.ndarray, y_train: np.ndarray, kernel) -> GaussianProcessRegressor:
+        """Optimise a GP from one starting point (runs inside a training worker)"""
+        from sklearn.gaussian_process import GaussianProcessRegressor
+        gp = GaussianProcessRegressor(
+            kernel=kernel,
+            alpha=1e-6,
+            normalize_y=True,
+            n_restarts_optimizer=0,
+            random_state=42
+        )
+        gp.fit(X_train_scaled, y_train)
+        return gp
+    
+    def refit(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> 'GaussianProcessInterpolator':
+        """Refit on all rows reusing the already optimised kernel hyperparameters"""
+        if not self.is_fitted or not self.gp_models:
+            return self.fit(df, power_columns, time_column, weather_data)
+        
+        df = self.select_daylight_rows(df, time_column, 'gaussian_process')
+        df_features = self.create_features(df, time_column)
+        
+        tasks = []
+        task_columns = []
+        for col, model_info in self.gp_models.items():
+            complete_rows = np.flatnonzero(df_features[col].notna().to_numpy())
+            train_rows = self._select_training_rows(complete_rows, model_info.get('mode', 'exact'))
+            X_train = model_info['scaler'].transform(df_features[model_info['feature_cols']].to_numpy(dtype=float)[train_rows])
+            y_train = df_features[col].to_numpy(dtype=float)[train_rows]
+            tasks.append((model_info['model'], X_train, y_train))
+            task_columns.append(col)
+        
+        executor = self.get_training_executor('gaussian_process')
+        for col, gp in zip(task_columns, executor.map(GaussianProcessInterpolator._refit_column_model, tasks)):
+            self.gp_models[col]['model'] = gp
+        
+        self.metadata['warm_started'] = True
+        return self
+    
+    @staticmethod
+    def _refit_column_model(gp: GaussianProcessRegressor, X_train_scaled: np.ndarray, y_train: np.ndarray) -> GaussianProcessRegressor:
+        """Refit a GP with fixed, previously learned kernel hyperparameters (no optimizer restarts)"""
+        from sklearn.gaussian_process import GaussianProcessRegressor
+        refitted = GaussianProcessRegressor(kernel=gp.kernel_, alpha=gp.alpha, normalize_y=gp.normalize_y, optimizer=None)
+        refitted.fit(X_train_scaled, y_train)
+        return refitted
+    
+    def _predict_batched(self, gp_model: GaussianProcessRegressor, X_scaled: np.ndarray) -> np.ndarray:
+        """Predict in fixed-size batches so the cross-covariance matrix stays bounded"""
+        batch_size = self.get_setting('gaussian_process', 'predict_batch_size', 5000)
+        predictions = np.empty(len(X_scaled))
+        for start in range(0, len(X_scaled), batch_size):
+            predictions[start:start + batch_size] = gp_model.predict(X_scaled[start:start + batch_size])
+        return predictions
+    
+    def _predict_local(self, model_info: Dict, feature_matrix: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Fill each gap with a GP fitted only on the observed points around it"""
+        window = self.get_setting('gaussian_process', 'local_window', 96)
+        observed_rows = np.flatnonzero(~np.isnan(values))
+        filled = values.copy()
+        
+        gap_starts, gap_lengths = self.find_gap_runs(np.isnan(values))
+        for start, length in zip(gap_starts, gap_lengths):
+            # `window` observed points on each side of the gap
+            split = np.searchsorted(observed_rows, start)
+            context_rows = observed_rows[max(0, split - window):split + window]
+            gap_rows = np.arange(start, start + length)
+            
+            if len(context_rows) > 10:
+                # Hyperparameters come from the global fit, so no optimisation per gap
+                local_gp = GaussianProcessInterpolator._refit_column_model(
+                    model_info['model'],
+                    model_info['scaler'].transform(feature_matrix[context_rows]),
+                    values[context_rows]
+                )
+                filled[gap_rows] = self._predict_batched(local_gp, model_info['scaler'].transform(feature_matrix[gap_rows]))
+            else:
+                filled[gap_rows] = self._predict_batched(model_info['model'], model_info['scaler'].transform(feature_matrix[gap_rows]))
+        
+        return filled
+    
+    @releases_features
+    def interpolate(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
         """Perform GP interpolation"""
+        if self.get_setting('gaussian_process', 'daylight_only', False):
+            return self.interpolate_daylight_only(df, power_columns, time_column, weather_data,
+                                                  'gaussian_process', self._interpolate_rows)
+        return self._interpolate_rows(df, power_columns, time_column, weather_data)
+    
+    def _interpolate_rows(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Predict every missing row of the given frame"""
         if not self.is_fitted:
             raise ValueError("Must call fit() before interpolate()")
         
@@ -453,23 +1505,21 @@ class GaussianProcessInterpolator(BaseInterpolator):
         for col in power_columns:
             if col in self.gp_models and col in df_features.columns:
                 model_info = self.gp_models[col]
-                gp_model = model_info['model']
-                scaler = model_info['scaler']
-                feature_cols = model_info['feature_cols']
+                feature_matrix = df_features[model_info['feature_cols']].to_numpy(dtype=float)
+                values = df_features[col].to_numpy(dtype=float, copy=True)
                 
                 # Find missing values
-                missing_mask = df_features[col].isna()
+                missing_mask = np.isnan(values)
                 
                 if missing_mask.any():
-                    # Prepare features for missing values
-                    X_missing = df_features.loc[missing_mask, feature_cols]
-                    X_missing_scaled = scaler.transform(X_missing)
-                    
-                    # Predict
-                    y_pred, y_std = gp_model.predict(X_missing_scaled, return_std=True)
+                    if model_info.get('mode') == 'local':
+                        values = self._predict_local(model_info, feature_matrix, values)
+                    else:
+                        X_missing_scaled = model_info['scaler'].transform(feature_matrix[missing_mask])
+                        values[missing_mask] = self._predict_batched(model_info['model'], X_missing_scaled)
                     
                     # Fill missing values
-                    df_result.loc[missing_mask, col] = y_pred
+                    df_result.loc[df_result.index[missing_mask], col] = self.as_column_dtype(df_result, col, values[missing_mask])
         
         # Apply solar constraints
         df_result = self.apply_solar_constraints(df_result, power_columns, time_column)
@@ -480,41 +1530,122 @@ class GaussianProcessInterpolator(BaseInterpolator):
 class PhysicsBasedInterpolator(BaseInterpolator):
     """Physics-based solar interpolation"""
     
-    def __init__(self, config: Optional[Dict] = None):
-        super().__init__(config)
+    def __init__(self, config: Optional[Dict] = None, interpolation_config: Optional[InterpolationConfig] = None):
+        super().__init__(config, interpolation_config)
         self.system_parameters = {}
+        self.capacity_histograms = {}
     
     def get_method_name(self) -> str:
         return "Physics-Based Solar Model"
     
-    def fit(self, df: pd.DataFrame, power_columns: List[str], time_column: str) -> 'PhysicsBasedInterpolator':
+    # Resolution of the daytime power histograms that max_capacity is updated from
+    CAPACITY_BINS = 256
+    
+    @staticmethod
+    def _histogram_quantile(counts: np.ndarray, top: float, q: float) -> float:
+        """Quantile of a histogram over [0, top], interpolated linearly inside the bin"""
+        cumulative = np.cumsum(counts)
+        target = q * cumulative[-1]
+        i = int(np.searchsorted(cumulative, target))
+        below = cumulative[i - 1] if i > 0 else 0.0
+        fraction = (target - below) / counts[i] if counts[i] > 0 else 0.0
+        return float((i + fraction) * top / len(counts))
+    
+    def _update_capacity_histogram(self, col: str, values: np.ndarray, decay: float = 1.0) -> Dict:
+        """Add daytime values to the column's histogram, doubling its range (merging bin pairs) as needed"""
+        histogram = self.capacity_histograms.get(col)
+        if histogram is None:
+            histogram = {'top': max(float(values.max()) * 1.25, 1e-9), 'counts': np.zeros(self.CAPACITY_BINS)}
+            self.capacity_histograms[col] = histogram
+        
+        counts = histogram['counts'] * decay
+        top = histogram['top']
+        while values.max() > top:
+            counts = np.concatenate([counts.reshape(-1, 2).sum(axis=1), np.zeros(len(counts) // 2)])
+            top *= 2
+        bins = np.minimum((np.clip(values, 0, None) * len(counts) / top).astype(np.int64), len(counts) - 1)
+        histogram['counts'] = counts + np.bincount(bins, minlength=len(counts))
+        histogram['top'] = top
+        return histogram
+    
+    def fit(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> 'PhysicsBasedInterpolator':
         """Estimate system parameters from available data"""
         
         df_temp = df.copy()
         df_temp[time_column] = pd.to_datetime(df_temp[time_column])
-        df_temp['hour'] = df_temp[time_column].dt.hour
+        
+        geometry = self.get_solar_geometry('physics_based_model')
+        daytime_mask = geometry.daylight_mask(df_temp[time_column])
+        clear_sky = geometry.clear_sky(df_temp[time_column]) if geometry.has_location else None
+        self.capacity_histograms = {}
         
         for col in power_columns:
             if col in df_temp.columns:
                 # Estimate maximum capacity (peak power during good conditions)
-                daytime_mask = (df_temp['hour'] >= 6) & (df_temp['hour'] <= 18)
                 daytime_data = df_temp.loc[daytime_mask, col].dropna()
                 
                 if len(daytime_data) > 0:
                     self.system_parameters[col] = {
                         'max_capacity': float(daytime_data.quantile(0.95)),
                         'mean_daytime': float(daytime_data.mean()),
+                        'daytime_count': float(len(daytime_data)),
                         'peak_hour': int(daytime_data.idxmax() if len(daytime_data) > 0 else 12)
                     }
+                    # Kept so partial_fit can move the capacity quantile without the history
+                    self._update_capacity_histogram(col, daytime_data.to_numpy(dtype=float))
+                    
+                    if clear_sky is not None:
+                        # Output per W/m² of clear-sky irradiance on good (upper-quantile) days
+                        sunny = daytime_mask & (clear_sky > 200) & df_temp[col].notna().to_numpy()
+                        if sunny.any():
+                            ratio = df_temp.loc[sunny, col].to_numpy() / clear_sky[sunny]
+                            self.system_parameters[col]['clear_sky_ratio'] = float(np.quantile(ratio, 0.9))
         
         self.is_fitted = True
         self.metadata = {
             'method': 'physics_based',
-            'estimated_parameters': len(self.system_parameters)
+            'estimated_parameters': len(self.system_parameters),
+            'clear_sky_model': geometry.has_location
         }
         
         return self
     
+    def partial_fit(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> 'PhysicsBasedInterpolator':
+        """Update max_capacity (running 95th percentile) and the daytime mean from a batch of new rows
+
+        The quantile is read from a fixed-size histogram of daytime power, so each update costs time
+        proportional to the batch. `capacity_decay` (default 1.0, no forgetting) below 1 down-weights
+        earlier batches, e.g. to follow degradation.
+        """
+        if not self.is_fitted:
+            return self.fit(df, power_columns, time_column, weather_data)
+        if not hasattr(self, 'capacity_histograms'):
+            self.capacity_histograms = {}  # Artifact saved before incremental updates existed
+        
+        decay = self.get_setting('physics_based_model', 'capacity_decay', 1.0)
+        times = pd.to_datetime(df[time_column])
+        daytime_mask = self.get_solar_geometry('physics_based_model').daylight_mask(times)
+        
+        for col in power_columns:
+            if col not in df.columns:
+                continue
+            values = df.loc[daytime_mask, col].dropna().to_numpy(dtype=float)
+            if len(values) == 0:
+                continue
+            
+            params = self.system_parameters.setdefault(col, {'mean_daytime': 0.0, 'daytime_count': 0.0, 'peak_hour': 12})
+            histogram = self._update_capacity_histogram(col, values, decay)
+            params['max_capacity'] = self._histogram_quantile(histogram['counts'], histogram['top'], 0.95)
+            
+            # Exponentially weighted running mean (plain running mean without decay)
+            weight = params.get('daytime_count', 0.0) * decay
+            params['mean_daytime'] = (params['mean_daytime'] * weight + values.sum()) / (weight + len(values))
+            params['daytime_count'] = weight + len(values)
+        
+        self.metadata['estimated_parameters'] = len(self.system_parameters)
+        self.metadata['partial_fit_batches'] = self.metadata.get('partial_fit_batches', 0) + 1
+        return self
+    
     def calculate_theoretical_solar_curve(self, hours: np.ndarray, max_capacity: float, peak_hour: int = 12) -> np.ndarray:
         """Calculate theoretical solar power curve"""
         # Simple solar curve model (bell curve centered at solar noon)
@@ -532,36 +1663,41 @@ class PhysicsBasedInterpolator(BaseInterpolator):
         
         return power
     
-    def interpolate(self, df: pd.DataFrame, power_columns: List[str], time_column: str) -> pd.DataFrame:
+    @releases_features
+    def interpolate(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
         """Perform physics-based interpolation"""
         if not self.is_fitted:
             raise ValueError("Must call fit() before interpolate()")
         
         df_result = df.copy()
         df_result[time_column] = pd.to_datetime(df_result[time_column])
-        df_result['hour'] = df_result[time_column].dt.hour
+        hours = df_result[time_column].dt.hour.to_numpy()
+        
+        geometry = self.get_solar_geometry('physics_based_model')
+        clear_sky = geometry.clear_sky(df_result[time_column]) if geometry.has_location else None
         
         for col in power_columns:
             if col in self.system_parameters and col in df_result.columns:
                 params = self.system_parameters[col]
                 
                 # Find missing values
-                missing_mask = df_result[col].isna()
+                missing_mask = df_result[col].isna().to_numpy()
                 
                 if missing_mask.any():
-                    # Calculate theoretical curve for missing hours
-                    missing_hours = df_result.loc[missing_mask, 'hour'].values
-                    theoretical_power = self.calculate_theoretical_solar_curve(
-                        missing_hours, 
-                        params['max_capacity'],
-                        params.get('peak_hour', 12)
-                    )
+                    if clear_sky is not None and 'clear_sky_ratio' in params:
+                        # Clear-sky irradiance scaled to this inverter, capped at its capacity
+                        theoretical_power = np.minimum(params['clear_sky_ratio'] * clear_sky[missing_mask],
+                                                       params['max_capacity'])
+                    else:
+                        # Calculate theoretical curve for missing hours
+                        theoretical_power = self.calculate_theoretical_solar_curve(
+                            hours[missing_mask], 
+                            params['max_capacity'],
+                            params.get('peak_hour', 12)
+                        )
                     
                     # Fill missing values
-                    df_result.loc[missing_mask, col] = theoretical_power
-        
-        # Remove temporary hour column
-        df_result = df_result.drop('hour', axis=1)
+                    df_result.loc[missing_mask, col] = self.as_column_dtype(df_result, col, theoretical_power)
         
         # Apply solar constraints
         df_result = self.apply_solar_constraints(df_result, power_columns, time_column)
@@ -572,11 +1708,15 @@ class PhysicsBasedInterpolator(BaseInterpolator):
 class MultiOutputRegressionInterpolator(BaseInterpolator):
     """Multi-output regression for correlated equipment"""
     
+    # Historical features derived from each correlated equipment column
+    CORRELATION_FEATURE_SUFFIXES = ['hist_1h', 'hist_2h', 'hist_3h', 'hist_mean_6h',
+                                    'hist_std_6h', 'available', 'available_lag1']
+    
     def __init__(self, config: Optional[Dict] = None, interpolation_config: Optional[InterpolationConfig] = None):
-        super().__init__(config)
-        self.interp_config = interpolation_config
+        super().__init__(config, interpolation_config)
         self.model = None
         self.feature_columns = None
+        self.correlation_sources = []
         self.scaler_X = None
         self.scaler_y = None
     
@@ -585,6 +1725,7 @@ class MultiOutputRegressionInterpolator(BaseInterpolator):
     
     def fit(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> 'MultiOutputRegressionInterpolator':
         """Adaptive fitting based on gap analysis recommendations"""
+        df = self.select_daylight_rows(df, time_column, 'multi_output_regression')
         
         # Get method-specific configuration
         method_config = self.interp_config.get_method_config('multi_output_regression') if self.interp_config else {}
@@ -603,8 +1744,134 @@ class MultiOutputRegressionInterpolator(BaseInterpolator):
             # Train single multi-output model
             self._fit_multi_output_model(df, power_columns, time_column, weather_data, method_config)
         
+        self.metadata['daylight_only'] = self.get_setting('multi_output_regression', 'daylight_only', False)
+        return self
+    
+    def refit(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> 'MultiOutputRegressionInterpolator':
+        """Warm-start the fitted boosters with a few extra rounds over all available rows"""
+        if not self.is_fitted or not isinstance(self.model, dict) or not self.model:
+            return self.fit(df, power_columns, time_column, weather_data)
+        
+        method_config = self.interp_config.get_method_config('multi_output_regression') if self.interp_config else {}
+        model_params = method_config.get('model_parameters', {})
+        warm_start_rounds = model_params.get('warm_start_rounds', max(1, model_params.get('n_estimators', 200) // 10))
+        
+        task_columns, tasks = self._update_tasks(df, power_columns, time_column, weather_data)
+        executor = self.get_training_executor('multi_output_regression')
+        updated = executor.map(MultiOutputRegressionInterpolator._continue_boosting,
+                               [task + (warm_start_rounds,) for task in tasks])
+        self._store_updated_models(task_columns, updated)
+        
+        self.metadata['warm_start_rounds'] = warm_start_rounds
+        self.metadata['warm_started'] = True
+        return self
+    
+    def partial_fit(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> 'MultiOutputRegressionInterpolator':
+        """Update the fitted boosters from a batch of new rows only
+
+        Batches of at least `partial_fit_min_rows` (100) rows add `partial_fit_rounds` (5) trees per model
+        until a model holds `partial_fit_max_trees` (400). Smaller batches, and every batch after that,
+        re-estimate the existing leaf values instead (`Booster.refit`, keeping `partial_fit_decay_rate` (0.9)
+        of the old values). Model size stays bounded and each update costs time proportional to the batch.
+        Features are built from the batch alone, so include an hour or two of preceding rows as context.
+        """
+        if not self.is_fitted:
+            return self.fit(df, power_columns, time_column, weather_data)
+        if not isinstance(self.model, dict) or not self.model:
+            # Refitting on the batch alone would replace a model trained on the site's history
+            raise NotImplementedError("Only per-column boosters support incremental updates")
+        
+        settings = (self.get_setting('multi_output_regression', 'partial_fit_rounds', 5),
+                    self.get_setting('multi_output_regression', 'partial_fit_max_trees', 400),
+                    self.get_setting('multi_output_regression', 'partial_fit_min_rows', 100),
+                    self.get_setting('multi_output_regression', 'partial_fit_decay_rate', 0.9))
+        task_columns, tasks = self._update_tasks(df, power_columns, time_column, weather_data)
+        # Batches are small, so updates run in this process rather than on the worker pool
+        updated = [self._update_booster(*task, *settings) for task in tasks]
+        self._store_updated_models(task_columns, updated)
+        
+        self.metadata['partial_fit_batches'] = self.metadata.get('partial_fit_batches', 0) + 1
+        self.metadata['partial_fit_rows'] = self.metadata.get('partial_fit_rows', 0) + len(df)
         return self
     
+    @staticmethod
+    def _update_booster(lgb_model, X: np.ndarray, y: np.ndarray, rounds: int, max_trees: int, min_rows: int,
+                        decay_rate: float):
+        """Add trees for a large enough batch while under the tree cap, otherwise refit the leaf values"""
+        import lightgbm as lgb
+        if len(y) == 0:
+            return lgb_model
+        
+        booster = lgb_model if isinstance(lgb_model, lgb.Booster) else lgb_model.booster_
+        if len(y) >= min_rows and booster.current_iteration() + rounds <= max_trees:
+            return MultiOutputRegressionInterpolator._continue_boosting(lgb_model, X, y, rounds)
+        return booster.refit(X, y, decay_rate=decay_rate)
+    
+    def _update_tasks(self, df: pd.DataFrame, power_columns: List[str], time_column: str,
+                      weather_data: Optional[pd.DataFrame]) -> Tuple[List[str], List[Tuple]]:
+        """(model, scaled features, target) per fitted column for updating the models with the rows of `df`"""
+        df = self.select_daylight_rows(df, time_column, 'multi_output_regression')
+        df_features = self.create_features(df, time_column, weather_data)
+        
+        tasks = []
+        task_columns = []
+        if isinstance(list(self.model.values())[0], dict):
+            # Correlation models: rebuild the shared block from the full data,
+            # keep each model's fitted scaler so existing trees stay valid
+            dtype = self._feature_dtype()
+            base_matrix = df_features[self.feature_columns].to_numpy(dtype=dtype)
+            correlation_block, _ = self._build_correlation_block(df_features, self.correlation_sources, dtype)
+            strata = self.training_strata(df_features)
+            
+            for col, model_info in self.model.items():
+                rows = self.sample_training_rows(np.flatnonzero(df_features[col].notna().to_numpy()), strata,
+                                                 'multi_output_regression')
+                clean_mask = ~np.isnan(base_matrix[rows]).any(axis=1)
+                if not clean_mask.any():
+                    continue
+                X = self._gather_features(base_matrix, correlation_block, rows[clean_mask], model_info['block_indices'])
+                y = df_features[col].to_numpy(dtype=float)[rows]
+                tasks.append((model_info['model'], model_info['scaler'].transform(X), y[clean_mask]))
+                task_columns.append(col)
+        else:
+            # Independent models share one scaled training matrix
+            train_mask = self._sampled_mask(df_features, df_features[power_columns].notna().all(axis=1))
+            if not train_mask.any():
+                return [], []
+            X_scaled = self.scaler_X.transform(df_features.loc[train_mask, self.feature_columns])
+            y_scaled = self.scaler_y.transform(df_features.loc[train_mask, power_columns])
+            
+            for i, col in enumerate(power_columns):
+                if col in self.model and len(X_scaled):
+                    tasks.append((self.model[col], X_scaled, y_scaled[:, i]))
+                    task_columns.append(col)
+        
+        return task_columns, tasks
+    
+    def _store_updated_models(self, task_columns: List[str], updated: List):
+        """Put updated boosters back in place of the models they were built from"""
+        for col, lgb_model in zip(task_columns, updated):
+            if isinstance(self.model[col], dict):
+                self.model[col]['model'] = lgb_model
+            else:
+                self.model[col] = lgb_model
+    
+    @staticmethod
+    def _continue_boosting(lgb_model, X: np.ndarray, y: np.ndarray, rounds: int):
+        """Add boosting rounds on top of an existing model or booster (runs inside a training worker)"""
+        import lightgbm as lgb
+        if len(y) == 0:
+            return lgb_model
+        
+        if isinstance(lgb_model, lgb.Booster):
+            params = {key: value for key, value in lgb_model.params.items() if key != 'num_iterations'}
+            return lgb.train(params, lgb.Dataset(X, label=y, params={'verbose': -1}), num_boost_round=rounds,
+                             init_model=lgb_model)
+        
+        updated_model = lgb.LGBMRegressor(**{**lgb_model.get_params(), 'n_estimators': rounds})
+        updated_model.fit(X, y, init_model=lgb_model.booster_)
+        return updated_model
+    
     def _fit_independent_with_correlation(self, df: pd.DataFrame, power_columns: List[str], 
                                         time_column: str, weather_data: Optional[pd.DataFrame], 
                                         method_config: Dict):
@@ -616,113 +1883,241 @@ class MultiOutputRegressionInterpolator(BaseInterpolator):
         # Train individual models with proper correlation features
         self.model = {}
         model_params = method_config.get('model_parameters', {})
-        correlation_features = method_config.get('correlation_features', power_columns)
+        self.correlation_sources = self._resolve_correlation_sources(
+            df_features, power_columns, method_config.get('correlation_features', power_columns)
+        )
+        
+        # Shared feature matrices: time/weather features plus the lag/rolling
+        # block, computed once per source column and reused by every target
+        self.feature_columns = self._get_safe_feature_columns(df_features, exclude=power_columns)
+        dtype = self._feature_dtype()
+        base_matrix = df_features[self.feature_columns].to_numpy(dtype=dtype)
+        correlation_block, block_names = self._build_correlation_block(df_features, self.correlation_sources, dtype)
+        
+        # Correlation strengths on pairwise-complete training rows (no leakage)
+        strength_matrix = df_features[list(dict.fromkeys(power_columns + self.correlation_sources))].corr(min_periods=11).abs()
+        
+        strata = self.training_strata(df_features)
+        n_available = 0
+        
+        executor = self.get_training_executor('multi_output_regression')
+        lgb_params = {
+            'n_estimators': model_params.get('n_estimators', 200),
+            'learning_rate': model_params.get('learning_rate', 0.1),
+            'max_depth': model_params.get('max_depth', 6),
+            'feature_fraction': model_params.get('feature_fraction', 0.9),
+            'random_state': model_params.get('random_state', 42),
+            'verbose': -1
+        }
+        early_stopping = self._early_stopping_settings()
         
+        tasks = []
+        task_info = []
         for target_col in power_columns:
             print(f"Training model for {target_col}...")
             
             # Get rows where target column has data
-            target_complete_mask = df_features[target_col].notna()
+            target_values = df_features[target_col].to_numpy(dtype=float)
+            train_rows = np.flatnonzero(~np.isnan(target_values))
             
-            if target_complete_mask.sum() < 50:
+            if len(train_rows) < 50:
                 print(f"Insufficient data for {target_col}, skipping...")
                 continue
+            n_available += len(train_rows)
+            train_rows = self.sample_training_rows(train_rows, strata, 'multi_output_regression')
             
-            # Create correlation features ONLY from other equipment that has data at same time
-            df_with_correlation = df_features.copy()
+            # Column-index view of the shared block: every source except the target
+            block_indices = self._correlation_block_indices(self.correlation_sources, exclude=target_col)
+            correlation_strengths = {
+                corr_col: float(np.nan_to_num(strength_matrix.loc[target_col, corr_col]))
+                for corr_col in self.correlation_sources if corr_col != target_col
+            }
+            feature_cols = self.feature_columns + [block_names[i] for i in block_indices]
             
-            for corr_col in correlation_features:
-                if corr_col != target_col and corr_col in df_features.columns:
-                    
-                    # SAFE CORRELATION FEATURES:
-                    # 1. Historical correlation (only past data, no leakage)
-                    df_with_correlation[f'{corr_col}_hist_1h'] = df_features[corr_col].shift(1).fillna(0)
-                    df_with_correlation[f'{corr_col}_hist_2h'] = df_features[corr_col].shift(2).fillna(0)
-                    df_with_correlation[f'{corr_col}_hist_3h'] = df_features[corr_col].shift(3).fillna(0)
-                    
-                    # 2. Historical rolling statistics (backward-looking only)
-                    df_with_correlation[f'{corr_col}_hist_mean_6h'] = (
-                        df_features[corr_col].shift(1).rolling(window=6, min_periods=1).mean().fillna(0)
-                    )
-                    df_with_correlation[f'{corr_col}_hist_std_6h'] = (
-                        df_features[corr_col].shift(1).rolling(window=6, min_periods=1).std().fillna(0)
-                    )
-                    
-                    # 3. Equipment availability indicator (no leakage)
-                    df_with_correlation[f'{corr_col}_available'] = (~df_features[corr_col].isna()).astype(int)
-                    df_with_correlation[f'{corr_col}_available_lag1'] = df_with_correlation[f'{corr_col}_available'].shift(1).fillna(0)
-            
-            # Select training data (only where target is available)
-            train_mask = target_complete_mask
-            
-            # Compute correlation strength features on training data only
-            correlation_strengths = {}
-            for corr_col in correlation_features:
-                if corr_col != target_col and corr_col in df_features.columns:
-                    # Calculate correlation on training data
-                    train_data = df_features.loc[train_mask, [target_col, corr_col]].dropna()
-                    if len(train_data) > 10:
-                        correlation_strength = abs(train_data[target_col].corr(train_data[corr_col]))
-                        correlation_strengths[corr_col] = correlation_strength
-                        # Add as constant feature
-                        df_with_correlation[f'{corr_col}_correlation_strength'] = correlation_strength
-                    else:
-                        correlation_strengths[corr_col] = 0.0
-                        df_with_correlation[f'{corr_col}_correlation_strength'] = 0.0
-            
-            # Get feature columns (exclude all target power columns to prevent leakage)
-            feature_cols = self._get_safe_feature_columns(df_with_correlation, exclude=power_columns)
-            
-            # Prepare training data
-            X_train = df_with_correlation.loc[train_mask, feature_cols]
-            y_train = df_features.loc[train_mask, target_col]
-            
-            # Remove any remaining NaN values
-            train_clean_mask = ~(X_train.isna().any(axis=1) | y_train.isna())
-            if train_clean_mask.sum() < 50:
+            # Workers gather their own rows from the shared matrices
+            tasks.append((base_matrix, correlation_block, train_rows, block_indices,
+                          target_values[train_rows], lgb_params, early_stopping))
+            task_info.append((target_col, feature_cols, block_indices, correlation_strengths))
+        
+        # Shared by every task, so set once the number of columns trained is known
+        lgb_params['n_jobs'] = executor.threads_for(len(tasks))
+        fitted = executor.map(MultiOutputRegressionInterpolator._fit_correlation_column, tasks)
+        boosting_rounds = {}
+        
+        for (target_col, feature_cols, block_indices, correlation_strengths), result in zip(task_info, fitted):
+            if result is None:
                 print(f"Insufficient clean training data for {target_col}, skipping...")
                 continue
-                
-            X_train_clean = X_train.loc[train_clean_mask]
-            y_train_clean = y_train.loc[train_clean_mask]
-            
-            # Scale features
-            scaler = MinMaxScaler()
-            X_train_scaled = scaler.fit_transform(X_train_clean)
-            
-            # Train model
-            lgb_model = lgb.LGBMRegressor(
-                n_estimators=model_params.get('n_estimators', 200),
-                learning_rate=model_params.get('learning_rate', 0.1),
-                max_depth=model_params.get('max_depth', 6),
-                feature_fraction=model_params.get('feature_fraction', 0.9),
-                random_state=model_params.get('random_state', 42),
-                verbose=-1
-            )
-            
-            lgb_model.fit(X_train_scaled, y_train_clean)
             
+            lgb_model, scaler, n_samples = result
+            boosting_rounds[target_col] = lgb_model.booster_.current_iteration()
             self.model[target_col] = {
                 'model': lgb_model,
                 'scaler': scaler,
                 'feature_cols': feature_cols,
+                'block_indices': block_indices,
                 'correlation_strengths': correlation_strengths
             }
             
-            print(f"Model for {target_col} trained with {len(feature_cols)} features on {len(y_train_clean)} samples")
+            print(f"Model for {target_col} trained with {len(feature_cols)} features on {n_samples} samples")
         
         self.is_fitted = True
         self.metadata = {
             'method': 'multi_output_lgb_with_safe_correlation',
             'models_trained': len(self.model),
             'correlation_features_used': True,
-            'leakage_prevention': 'historical_features_only'
+            'correlation_sources': len(self.correlation_sources),
+            'leakage_prevention': 'historical_features_only',
+            'training_workers': executor.n_workers,
+            'boosting_rounds': boosting_rounds
         }
+        self._record_sampling(n_available, sum(len(task[2]) for task in tasks))
+    
+    @staticmethod
+    def _fit_correlation_column(base_matrix: np.ndarray, correlation_block: CorrelationFeatureBlock, train_rows: np.ndarray,
+                                block_indices: List[int], y_train: np.ndarray, lgb_params: Dict,
+                                early_stopping: Optional[Dict] = None) -> Optional[Tuple]:
+        """Fit one target's model from the shared feature matrices (runs inside a training worker)"""
+        import lightgbm as lgb
+        from sklearn.preprocessing import MinMaxScaler
+        # Remove any remaining NaN values (only base features can be NaN, the block is filled)
+        train_clean_mask = ~np.isnan(base_matrix[train_rows]).any(axis=1)
+        if train_clean_mask.sum() < 50:
+            return None
+        
+        X_train_clean = MultiOutputRegressionInterpolator._gather_features(
+            base_matrix, correlation_block, train_rows[train_clean_mask], block_indices)
+        y_train_clean = y_train[train_clean_mask]
+        
+        # Scale features in place
+        scaler = MinMaxScaler(copy=False)
+        X_train_scaled = scaler.fit_transform(X_train_clean)
+        
+        # Train model, stopping once the time-blocked holdout stops improving
+        lgb_model = lgb.LGBMRegressor(**lgb_params)
+        fit_rows, holdout_rows = MultiOutputRegressionInterpolator._early_stopping_split(len(y_train_clean), early_stopping)
+        if len(holdout_rows):
+            lgb_model.fit(X_train_scaled[fit_rows], y_train_clean[fit_rows],
+                          eval_set=[(X_train_scaled[holdout_rows], y_train_clean[holdout_rows])],
+                          callbacks=[lgb.early_stopping(early_stopping['rounds'], verbose=False)])
+        else:
+            lgb_model.fit(X_train_scaled, y_train_clean)
+        
+        return lgb_model, scaler, len(y_train_clean)
+    
+    @staticmethod
+    def _gather_features(base_matrix: np.ndarray, correlation_block: CorrelationFeatureBlock,
+                         rows: np.ndarray, block_indices: List[int]) -> np.ndarray:
+        """Base and correlation features for `rows`, written into one matrix without intermediate copies"""
+        n_base = base_matrix.shape[1]
+        X = np.empty((len(rows), n_base + len(block_indices)), dtype=base_matrix.dtype)
+        X[:, :n_base] = base_matrix[rows]
+        correlation_block.take(rows, block_indices, out=X[:, n_base:])
+        return X
+    
+    @staticmethod
+    def _fit_target_columns(X_train: np.ndarray, Y_train: np.ndarray, lgb_params: Dict, n_rounds: int,
+                            early_stopping: Optional[Dict] = None) -> List[lgb.Booster]:
+        """Fit one booster per target column on a shared training matrix (runs inside a training worker)
+
+        The matrix is binned once into a LightGBM Dataset whose label is swapped per target, instead of
+        re-binning the identical features for every column.
+        """
+        import lightgbm as lgb
+        train_rows, holdout_rows = MultiOutputRegressionInterpolator._early_stopping_split(len(X_train), early_stopping)
+        dataset_params = {'verbose': -1}
+        train_set = lgb.Dataset(X_train[train_rows], label=Y_train[train_rows, 0], params=dataset_params,
+                                free_raw_data=False).construct()
+        valid_set = None
+        if len(holdout_rows):
+            valid_set = lgb.Dataset(X_train[holdout_rows], label=Y_train[holdout_rows, 0], reference=train_set,
+                                    params=dataset_params, free_raw_data=False).construct()
+        
+        boosters = []
+        for j in range(Y_train.shape[1]):
+            train_set.set_label(Y_train[train_rows, j])
+            if valid_set is None:
+                boosters.append(lgb.train(lgb_params, train_set, num_boost_round=n_rounds))
+                continue
+            valid_set.set_label(Y_train[holdout_rows, j])
+            boosters.append(lgb.train(lgb_params, train_set, num_boost_round=n_rounds, valid_sets=[valid_set],
+                                      callbacks=[lgb.early_stopping(early_stopping['rounds'], verbose=False)]))
+        return boosters
+    
+    @staticmethod
+    def _early_stopping_split(n_rows: int, early_stopping: Optional[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """Training positions and a time-blocked holdout: every k-th of 10k contiguous blocks,
+        so the holdout is `fraction` of the rows spread across the whole history (empty without early stopping)"""
+        if not early_stopping or n_rows < early_stopping['min_rows']:
+            return np.arange(n_rows), np.arange(0)
+        step = max(2, int(round(1 / early_stopping['fraction'])))
+        block = np.arange(n_rows) * (10 * step) // n_rows
+        holdout = block % step == step - 1
+        return np.flatnonzero(~holdout), np.flatnonzero(holdout)
+    
+    def _early_stopping_settings(self) -> Optional[Dict]:
+        """Early stopping rounds and holdout share from the method's settings (None when disabled)"""
+        rounds = self.get_setting('multi_output_regression', 'early_stopping_rounds', 20)
+        if not rounds:
+            return None
+        return {
+            'rounds': rounds,
+            'fraction': self.get_setting('multi_output_regression', 'early_stopping_fraction', 0.1),
+            'min_rows': self.get_setting('multi_output_regression', 'early_stopping_min_rows', 500)
+        }
+    
+    def _feature_dtype(self):
+        """Dtype of the shared feature matrices (float32 in compact-dtype mode)"""
+        return np.float32 if self.use_compact_dtypes('multi_output_regression') else np.float64
+    
+    def _resolve_correlation_sources(self, df_features: pd.DataFrame, power_columns: List[str],
+                                     correlation_features: List[str]) -> List[str]:
+        """Resolve configured correlation columns, falling back to all power columns"""
+        sources = [col for col in correlation_features if col in df_features.columns]
+        return sources or [col for col in power_columns if col in df_features.columns]
+    
+    def _build_correlation_block(self, df_features: pd.DataFrame, source_columns: List[str],
+                                 dtype=np.float64) -> Tuple[CorrelationFeatureBlock, List[str]]:
+        """Compute historical lag/rolling features exactly once per source column"""
+        block = CorrelationFeatureBlock(len(df_features), len(source_columns), dtype)
+        block_names = []
+        
+        for i, corr_col in enumerate(source_columns):
+            series = df_features[corr_col]
+            history = series.shift(1)
+            rolling = history.rolling(window=6, min_periods=1)
+            available = series.notna().to_numpy()
+            
+            # Same order as CORRELATION_FEATURE_SUFFIXES
+            offset = i * block.N_CONTINUOUS
+            block.values[:, offset] = history.fillna(0).to_numpy()
+            block.values[:, offset + 1] = series.shift(2).fillna(0).to_numpy()
+            block.values[:, offset + 2] = series.shift(3).fillna(0).to_numpy()
+            block.values[:, offset + 3] = rolling.mean().fillna(0).to_numpy()
+            block.values[:, offset + 4] = rolling.std().fillna(0).to_numpy()
+            block.set_flag(i, 0, available)
+            lagged = np.zeros_like(available)
+            lagged[1:] = available[:-1]
+            block.set_flag(i, 1, lagged)
+            
+            block_names.extend(f'{corr_col}_{suffix}' for suffix in self.CORRELATION_FEATURE_SUFFIXES)
+        
+        return block, block_names
+    
+    def _correlation_block_indices(self, source_columns: List[str], exclude: Optional[str] = None) -> List[int]:
+        """Column indices into the shared correlation block for all sources except `exclude`"""
+        n_features = len(self.CORRELATION_FEATURE_SUFFIXES)
+        indices = []
+        for i, corr_col in enumerate(source_columns):
+            if corr_col != exclude:
+                indices.extend(range(i * n_features, (i + 1) * n_features))
+        return indices
     
     def _fit_independent_models(self, df: pd.DataFrame, power_columns: List[str], 
                               time_column: str, weather_data: Optional[pd.DataFrame], 
                               method_config: Dict):
         """Train completely separate models (original behavior)"""
+        from sklearn.preprocessing import MinMaxScaler
         
         # Create features
         df_features = self.create_features(df, time_column, weather_data)
@@ -756,10 +2151,11 @@ class MultiOutputRegressionInterpolator(BaseInterpolator):
         
         # Get complete cases (all power columns have values)
         complete_mask = df_features[power_columns].notna().all(axis=1)
+        train_mask = self._sampled_mask(df_features, complete_mask)
         
         if complete_mask.sum() > 100:  # Need sufficient training data
-            X_train = df_features.loc[complete_mask, self.feature_columns]
-            y_train = df_features.loc[complete_mask, power_columns]
+            X_train = df_features.loc[train_mask, self.feature_columns]
+            y_train = df_features.loc[train_mask, power_columns]
             
             # Scale features
             self.scaler_X = MinMaxScaler()
@@ -768,28 +2164,53 @@ class MultiOutputRegressionInterpolator(BaseInterpolator):
             X_train_scaled = self.scaler_X.fit_transform(X_train)
             y_train_scaled = self.scaler_y.fit_transform(y_train)
             
-            # Train LightGBM model for each target
-            self.model = {}
-            for i, col in enumerate(power_columns):
-                lgb_model = lgb.LGBMRegressor(
-                    n_estimators=200,
-                    learning_rate=0.1,
-                    max_depth=6,
-                    random_state=42,
-                    verbose=-1
-                )
-                lgb_model.fit(X_train_scaled, y_train_scaled[:, i])
-                self.model[col] = lgb_model
+            # Train LightGBM model for each target: every worker bins the shared matrix once
+            # and trains its share of the targets on that Dataset
+            executor = self.get_training_executor('multi_output_regression')
+            groups = [group for group in np.array_split(np.arange(len(power_columns)), executor.n_workers) if len(group)]
+            lgb_params = {
+                'objective': 'regression',
+                'learning_rate': 0.1,
+                'max_depth': 6,
+                'seed': 42,
+                'num_threads': executor.threads_for(len(groups)),
+                'verbose': -1
+            }
+            tasks = [(X_train_scaled, y_train_scaled[:, group], lgb_params, 200, self._early_stopping_settings())
+                     for group in groups]
+            fitted = executor.map(MultiOutputRegressionInterpolator._fit_target_columns, tasks)
+            self.model = dict(zip(power_columns, itertools.chain.from_iterable(fitted)))
         
         self.is_fitted = True
         self.metadata = {
             'method': 'multi_output_lgb',
             'models_trained': len(self.model) if self.model else 0,
-            'training_samples': complete_mask.sum() if 'complete_mask' in locals() else 0
+            'training_samples': complete_mask.sum() if 'complete_mask' in locals() else 0,
+            'boosting_rounds': {col: booster.current_iteration() for col, booster in (self.model or {}).items()}
         }
+        self._record_sampling(int(complete_mask.sum()), int(train_mask.sum()))
         
         return self
     
+    def _sampled_mask(self, df_features: pd.DataFrame, complete_mask: pd.Series) -> np.ndarray:
+        """Complete-case rows after capping each training stratum"""
+        complete_mask = complete_mask.to_numpy()
+        rows = self.sample_training_rows(np.flatnonzero(complete_mask), self.training_strata(df_features),
+                                         'multi_output_regression')
+        if len(rows) == complete_mask.sum():
+            return complete_mask
+        train_mask = np.zeros(len(complete_mask), dtype=bool)
+        train_mask[rows] = True
+        return train_mask
+    
+    def _record_sampling(self, n_available: int, n_used: int):
+        """Note in the metadata how far stratified sampling cut the training rows"""
+        cap = self.get_setting('multi_output_regression', 'max_rows_per_stratum')
+        if cap:
+            self.metadata['max_rows_per_stratum'] = cap
+            self.metadata['training_rows_available'] = n_available
+            self.metadata['training_rows_sampled'] = n_used
+    
     def _get_feature_columns(self, df_features: pd.DataFrame, exclude: List[str] = None) -> List[str]:
         """Get feature columns excluding specified columns"""
         exclude = exclude or []
@@ -822,6 +2243,8 @@ class MultiOutputRegressionInterpolator(BaseInterpolator):
                                time_column: str, weather_data: Optional[pd.DataFrame], 
                                method_config: Dict):
         """Train single multi-output model"""
+        import lightgbm as lgb
+        from sklearn.preprocessing import MinMaxScaler
         # Create features
         df_features = self.create_features(df, time_column, weather_data)
         
@@ -854,10 +2277,11 @@ class MultiOutputRegressionInterpolator(BaseInterpolator):
         
         # Get complete cases (all power columns have values)
         complete_mask = df_features[power_columns].notna().all(axis=1)
+        train_mask = self._sampled_mask(df_features, complete_mask)
         
         if complete_mask.sum() > 100:  # Need sufficient training data
-            X_train = df_features.loc[complete_mask, self.feature_columns]
-            y_train = df_features.loc[complete_mask, power_columns]
+            X_train = df_features.loc[train_mask, self.feature_columns]
+            y_train = df_features.loc[train_mask, power_columns]
             
             # Scale features
             self.scaler_X = MinMaxScaler()
@@ -884,7 +2308,9 @@ class MultiOutputRegressionInterpolator(BaseInterpolator):
             'models_trained': 1,
             'training_samples': complete_mask.sum() if 'complete_mask' in locals() else 0
         }
+        self._record_sampling(int(complete_mask.sum()), int(train_mask.sum()))
     
+    @releases_features
     def interpolate(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
         """Perform multi-output interpolation"""
         if not self.is_fitted or not self.model:
@@ -893,46 +2319,16 @@ class MultiOutputRegressionInterpolator(BaseInterpolator):
             spline_interpolator.fit(df, power_columns, time_column, weather_data)
             return spline_interpolator.interpolate(df, power_columns, time_column, weather_data)
         
+        if self.get_setting('multi_output_regression', 'daylight_only', False):
+            return self.interpolate_daylight_only(df, power_columns, time_column, weather_data,
+                                                  'multi_output_regression', self._interpolate_rows)
+        return self._interpolate_rows(df, power_columns, time_column, weather_data)
+    
+    def _interpolate_rows(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Predict every missing row of the given frame"""
         df_result = df.copy()
         df_features = self.create_features(df_result, time_column, weather_data)
         
-        # Add SAFE correlation features if this was used during training
-        if (self.interp_config and 
-            self.interp_config.should_use_correlation('multi_output_regression') and
-            self.interp_config.should_model_independently('multi_output_regression')):
-            
-            correlation_features = self.interp_config.get_correlation_features('multi_output_regression')
-            if not correlation_features:
-                correlation_features = power_columns
-            
-            # Create the same safe correlation features used in training
-            for target_col in power_columns:
-                for corr_col in correlation_features:
-                    if corr_col != target_col and corr_col in df_features.columns:
-                        # Historical features only (no leakage)
-                        df_features[f'{corr_col}_hist_1h'] = df_features[corr_col].shift(1).fillna(0)
-                        df_features[f'{corr_col}_hist_2h'] = df_features[corr_col].shift(2).fillna(0)
-                        df_features[f'{corr_col}_hist_3h'] = df_features[corr_col].shift(3).fillna(0)
-                        
-                        # Historical statistics
-                        df_features[f'{corr_col}_hist_mean_6h'] = (
-                            df_features[corr_col].shift(1).rolling(window=6, min_periods=1).mean().fillna(0)
-                        )
-                        df_features[f'{corr_col}_hist_std_6h'] = (
-                            df_features[corr_col].shift(1).rolling(window=6, min_periods=1).std().fillna(0)
-                        )
-                        
-                        # Availability indicators
-                        df_features[f'{corr_col}_available'] = (~df_features[corr_col].isna()).astype(int)
-                        df_features[f'{corr_col}_available_lag1'] = df_features[f'{corr_col}_available'].shift(1).fillna(0)
-                        
-                        # Correlation strength (constant from training)
-                        if target_col in self.model and 'correlation_strengths' in self.model[target_col]:
-                            correlation_strength = self.model[target_col]['correlation_strengths'].get(corr_col, 0.0)
-                            df_features[f'{corr_col}_correlation_strength'] = correlation_strength
-                        else:
-                            df_features[f'{corr_col}_correlation_strength'] = 0.0
-        
         # Find rows with any missing values
         missing_mask = df_features[power_columns].isna().any(axis=1)
         
@@ -943,29 +2339,33 @@ class MultiOutputRegressionInterpolator(BaseInterpolator):
                 sample_model = list(self.model.values())[0]
                 if isinstance(sample_model, dict):
                     # Independent models with correlation (new adaptive method)
+                    dtype = self._feature_dtype()
+                    base_matrix = df_features[self.feature_columns].to_numpy(dtype=dtype)
+                    correlation_block, _ = self._build_correlation_block(df_features, self.correlation_sources, dtype)
+                    
                     for col in power_columns:
                         if col in self.model:
                             # Find missing values for this specific column
-                            col_missing_mask = df_features[col].isna()
+                            col_missing_rows = np.flatnonzero(df_features[col].isna().to_numpy())
                             
-                            if col_missing_mask.any():
+                            if len(col_missing_rows) > 0:
                                 model_info = self.model[col]
-                                feature_cols = model_info['feature_cols']
                                 
-                                # Prepare features for missing values
-                                X_missing = df_features.loc[col_missing_mask, feature_cols]
+                                # Prepare features for missing values from the shared matrices
+                                X_missing = self._gather_features(base_matrix, correlation_block, col_missing_rows,
+                                                                  model_info['block_indices'])
                                 
                                 # Handle any remaining NaN in features
-                                X_missing = X_missing.fillna(0)
+                                X_missing[np.isnan(X_missing)] = 0.0
                                 
                                 # Scale and predict
                                 X_missing_scaled = model_info['scaler'].transform(X_missing)
                                 predictions = model_info['model'].predict(X_missing_scaled)
                                 
                                 # Fill missing values
-                                df_result.loc[col_missing_mask, col] = predictions
+                                df_result.loc[df_result.index[col_missing_rows], col] = self.as_column_dtype(df_result, col, predictions)
                                 
-                                print(f"Filled {col_missing_mask.sum()} missing values for {col}")
+                                print(f"Filled {len(col_missing_rows)} missing values for {col}")
                 else:
                     # Original independent models (no configuration)
                     X_missing = df_features.loc[missing_mask, self.feature_columns]
@@ -982,9 +2382,12 @@ class MultiOutputRegressionInterpolator(BaseInterpolator):
                     
                     # Fill missing values
                     for i, col in enumerate(power_columns):
-                        col_missing_mask = df_features.loc[missing_mask, col].isna()
+                        col_missing_mask = df_features.loc[missing_mask, col].isna().to_numpy()
                         if col_missing_mask.any():
-                            df_result.loc[missing_mask & df_features[col].isna(), col] = predictions_unscaled[col_missing_mask, i]
+                            # Positional: the daylight-only frame's index is not contiguous
+                            rows = np.flatnonzero((missing_mask & df_features[col].isna()).to_numpy())
+                            df_result.loc[df_result.index[rows], col] = self.as_column_dtype(
+                                df_result, col, predictions_unscaled[col_missing_mask, i])
             else:
                 # Single multi-output model (original method)
                 X_missing = df_features.loc[missing_mask, self.feature_columns]
@@ -1001,9 +2404,12 @@ class MultiOutputRegressionInterpolator(BaseInterpolator):
                 
                 # Fill missing values
                 for i, col in enumerate(power_columns):
-                    col_missing_mask = df_features.loc[missing_mask, col].isna()
+                    col_missing_mask = df_features.loc[missing_mask, col].isna().to_numpy()
                     if col_missing_mask.any():
-                        df_result.loc[missing_mask & df_features[col].isna(), col] = predictions_unscaled[col_missing_mask, i]
+                        # Positional: the daylight-only frame's index is not contiguous
+                        rows = np.flatnonzero((missing_mask & df_features[col].isna()).to_numpy())
+                        df_result.loc[df_result.index[rows], col] = self.as_column_dtype(
+                            df_result, col, predictions_unscaled[col_missing_mask, i])
         
         # Apply solar constraints based on configuration
         if self.interp_config:
@@ -1013,6 +2419,7 @@ class MultiOutputRegressionInterpolator(BaseInterpolator):
         
         return df_result
     
+    @traced('constraints')
     def apply_configuration_solar_constraints(self, df: pd.DataFrame, power_columns: List[str], time_column: str) -> pd.DataFrame:
         """Apply solar constraints based on gap analysis recommendations"""
         
@@ -1021,12 +2428,11 @@ class MultiOutputRegressionInterpolator(BaseInterpolator):
         
         df_result = df.copy()
         df_result[time_column] = pd.to_datetime(df_result[time_column])
-        df_result['hour'] = df_result[time_column].dt.hour
+        night_mask = ~self.get_daylight_mask(df_result, time_column, 'multi_output_regression')
         
         for col in power_columns:
             # Apply nighttime constraint if recommended
             if constraints.get('nighttime_zero', True):
-                night_mask = (df_result['hour'] <= 5) | (df_result['hour'] >= 19)
                 df_result.loc[night_mask, col] = 0
             
             # Apply negative clipping if recommended
@@ -1044,26 +2450,437 @@ class MultiOutputRegressionInterpolator(BaseInterpolator):
                 # Scale down predictions by efficiency factor
                 df_result[col] = df_result[col] * max_efficiency
         
-        df_result = df_result.drop('hour', axis=1)
         return df_result
 
 
+class HybridInterpolator(BaseInterpolator):
+    """Routes each gap to the cheapest adequate method for its length"""
+    
+    # Cheap tiers run first so the ML model only sees the gaps routed to it
+    TIER_ORDER = ['short', 'long', 'medium']
+    
+    def __init__(self, config: Optional[Dict] = None, interpolation_config: Optional[InterpolationConfig] = None):
+        super().__init__(config, interpolation_config)
+        self.routes = {}
+        self.route_interpolators = {}
+    
+    def get_method_name(self) -> str:
+        return "Hybrid Gap-Length Routing"
+    
+    # Route per tier when neither the config nor the gap analysis names one
+    DEFAULT_ROUTES = {'short': 'gap_local_spline', 'medium': 'multi_output_regression', 'long': 'physics_based_model'}
+    
+    # Gap analysis recommendations replaced by the method that fills the same gaps more cheaply when routed
+    ROUTE_EQUIVALENTS = {'spline_interpolation': 'gap_local_spline', 'gaussian_process': 'multi_output_regression'}
+    
+    def _resolve_routes(self) -> Dict[str, str]:
+        """Method per gap-length tier: config overrides, then gap analysis recommendations, then the defaults"""
+        gap_specific = self.interp_config.get_gap_specific_recommendations() if self.interp_config else {}
+        routes = {}
+        for tier, default in self.DEFAULT_ROUTES.items():
+            recommended = gap_specific.get(f'{tier}_gaps', default)
+            recommended = self.ROUTE_EQUIVALENTS.get(recommended, recommended)
+            routes[tier] = self.get_setting('hybrid_interpolation', f'{tier}_gap_method', recommended)
+        
+        for tier, method in routes.items():
+            if method not in INTERPOLATORS or INTERPOLATORS[method] is HybridInterpolator:
+                raise ValueError(f"Cannot route {tier} gaps to method '{method}'")
+        
+        return routes
+    
+    @staticmethod
+    def _step_hours(times: pd.Series) -> float:
+        """Sampling interval in hours (median spacing of the time column)"""
+        step = pd.to_datetime(times).diff().median()
+        return step.total_seconds() / 3600 if pd.notna(step) and step.total_seconds() > 0 else 1.0
+    
+    def classify_gaps(self, missing: np.ndarray, step_hours: float) -> Dict[str, np.ndarray]:
+        """Row masks (rows x columns) of the gaps falling into each length tier"""
+        short_gap_hours = self.get_setting('hybrid_interpolation', 'short_gap_hours', 3)
+        medium_gap_hours = self.get_setting('hybrid_interpolation', 'medium_gap_hours', 24)
+        
+        tier_masks = {tier: np.zeros_like(missing) for tier in self.TIER_ORDER}
+        for col_idx in range(missing.shape[1]):
+            gap_starts, gap_lengths = self.find_gap_runs(missing[:, col_idx])
+            for start, length in zip(gap_starts, gap_lengths):
+                gap_hours = length * step_hours
+                if gap_hours <= short_gap_hours:
+                    tier = 'short'
+                elif gap_hours <= medium_gap_hours:
+                    tier = 'medium'
+                else:
+                    tier = 'long'
+                tier_masks[tier][start:start + length, col_idx] = True
+        
+        return tier_masks
+    
+    def fit(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> 'HybridInterpolator':
+        """Fit each distinct routed method once"""
+        self.routes = self._resolve_routes()
+        
+        for method in dict.fromkeys(self.routes.values()):
+            print(f"  Fitting {method} for {', '.join(t for t, m in self.routes.items() if m == method)} gaps")
+            interpolator = INTERPOLATORS[method](self.config, interpolation_config=self.interp_config)
+            self.route_interpolators[method] = interpolator.fit(df, power_columns, time_column, weather_data)
+        
+        self.is_fitted = True
+        self.metadata = {
+            'method': 'hybrid_interpolation',
+            'routes': self.routes,
+            'short_gap_hours': self.get_setting('hybrid_interpolation', 'short_gap_hours', 3),
+            'medium_gap_hours': self.get_setting('hybrid_interpolation', 'medium_gap_hours', 24),
+            'route_metadata': {method: interpolator.metadata for method, interpolator in self.route_interpolators.items()}
+        }
+        
+        return self
+    
+    def refit(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> 'HybridInterpolator':
+        """Refit every routed interpolator"""
+        if not self.is_fitted:
+            return self.fit(df, power_columns, time_column, weather_data)
+        
+        for method, interpolator in self.route_interpolators.items():
+            self.route_interpolators[method] = interpolator.refit(df, power_columns, time_column, weather_data)
+        return self
+    
+    def to_artifact(self) -> Dict:
+        """Snapshot including each routed interpolator's own artifact"""
+        artifact = super().to_artifact()
+        artifact['state']['route_interpolators'] = {
+            method: interpolator.to_artifact() for method, interpolator in self.route_interpolators.items()
+        }
+        return artifact
+    
+    @classmethod
+    def from_artifact(cls, artifact: Dict) -> 'HybridInterpolator':
+        """Rebuild the router and its routed interpolators"""
+        interpolator = super().from_artifact(artifact)
+        interpolator.route_interpolators = {
+            method: INTERPOLATORS[method].from_artifact(route_artifact)
+            for method, route_artifact in artifact['state']['route_interpolators'].items()
+        }
+        return interpolator
+    
+    @releases_features
+    def interpolate(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Fill each gap with the method routed for its length"""
+        if not self.is_fitted:
+            raise ValueError("Must call fit() before interpolate()")
+        
+        df_result = df.copy()
+        columns = [col for col in power_columns if col in df_result.columns]
+        
+        filled = df_result[columns].to_numpy(dtype=float, copy=True)
+        tier_masks = self.classify_gaps(np.isnan(filled), self._step_hours(df_result[time_column]))
+        
+        routed_gaps = {}
+        for tier in self.TIER_ORDER:
+            method = self.routes[tier]
+            if method in routed_gaps:
+                continue
+            
+            # Tiers sharing a method are filled in a single pass
+            method_mask = np.zeros_like(filled, dtype=bool)
+            for routed_tier in self.TIER_ORDER:
+                if self.routes[routed_tier] == method:
+                    method_mask |= tier_masks[routed_tier]
+            routed_gaps[method] = int(method_mask.sum())
+            
+            if not method_mask.any():
+                continue
+            
+            # Gaps of earlier tiers are already filled, so later models see them as observed
+            tier_input = df_result.copy()
+            tier_input[columns] = filled
+            output = self.route_interpolators[method].interpolate(tier_input, columns, time_column, weather_data)
+            filled[method_mask] = output[columns].to_numpy(dtype=float)[method_mask]
+        
+        self.metadata['routed_values'] = routed_gaps
+        print(f"  Routed missing values: {routed_gaps}")
+        
+        df_result[columns] = filled
+        
+        # Apply solar constraints
+        df_result = self.apply_solar_constraints(df_result, power_columns, time_column)
+        
+        return df_result
+
+
+class GlobalWarmStartInterpolator(BaseInterpolator):
+    """LightGBM per power column, warm-started from a model pretrained across many sites
+    
+    The global model (trained with models/global_model.py and stored in the model registry) predicts power
+    normalized by each inverter's capacity from features every site has: time, solar geometry, latitude, weather
+    (NaN where a site has none) and the normalized output of the site's other inverters at the same time.
+    Site models add `warm_start_rounds` trees on top of it, so a new or drifted site trains in seconds.
+    Without a global model they are trained from scratch (`n_estimators`).
+    """
+    
+    METHOD = 'global_warm_start'
+    
+    # Features shared by the global model and every site model, in matrix column order
+    # (peer_output: mean capacity-normalized power of the other columns, NaN when none is reporting)
+    GLOBAL_FEATURES = ['hour', 'day_of_year', 'month', 'hour_sin', 'hour_cos', 'day_sin', 'day_cos',
+                       'solar_elevation', 'clear_sky_ghi', 'latitude',
+                       'temperature', 'humidity', 'wind_speed', 'cloud_cover', 'peer_output']
+    
+    # Daytime power quantile used as each column's capacity (as for the physics model's max_capacity)
+    CAPACITY_QUANTILE = 0.95
+    
+    LGB_PARAMS = {'objective': 'regression', 'learning_rate': 0.05, 'num_leaves': 63, 'min_data_in_leaf': 50,
+                  'seed': 42, 'verbose': -1}
+    
+    # Registries holding global models, kept so their in-memory caches survive across fits
+    _registries: Dict[str, ModelRegistry] = {}
+    
+    def __init__(self, config: Optional[Dict] = None, interpolation_config: Optional[InterpolationConfig] = None):
+        super().__init__(config, interpolation_config)
+        self.models = {}
+        self.capacities = {}
+        self.fitted_trees = {}
+    
+    def get_method_name(self) -> str:
+        return "Global Warm-Start LightGBM"
+    
+    def global_features(self, df: pd.DataFrame, time_column: str,
+                        weather_data: Optional[pd.DataFrame] = None) -> Tuple[np.ndarray, pd.DataFrame]:
+        """Feature matrix in GLOBAL_FEATURES order (NaN where unavailable, peer_output filled per column by
+        column_features) and the frame it was built from"""
+        df_features = self.create_features(df, time_column, weather_data)
+        X = np.full((len(df_features), len(self.GLOBAL_FEATURES)), np.nan)
+        for j, name in enumerate(self.GLOBAL_FEATURES):
+            if name in df_features.columns:
+                X[:, j] = df_features[name].to_numpy(dtype=float)
+        
+        geometry = self.get_solar_geometry(self.METHOD)
+        if geometry.has_location:
+            times = df_features[time_column]
+            X[:, self.GLOBAL_FEATURES.index('solar_elevation')] = geometry.elevation(times)
+            X[:, self.GLOBAL_FEATURES.index('clear_sky_ghi')] = geometry.clear_sky(times)
+            X[:, self.GLOBAL_FEATURES.index('latitude')] = float(geometry.latitude)
+        return X, df_features
+    
+    @staticmethod
+    def normalized_power(df: pd.DataFrame, capacities: Dict[str, float]) -> np.ndarray:
+        """Power of the given columns divided by their capacities (rows x columns, NaN where missing)"""
+        return np.column_stack([df[col].to_numpy(dtype=float) / capacity for col, capacity in capacities.items()])
+    
+    @staticmethod
+    def column_features(X: np.ndarray, normalized: np.ndarray, j: int, rows: np.ndarray) -> np.ndarray:
+        """Rows of X with peer_output set to the mean normalized power of every column except the j-th"""
+        reporting = ~np.isnan(normalized[rows])
+        values = np.where(reporting, normalized[rows], 0.0)
+        peers = reporting.sum(axis=1) - reporting[:, j]
+        total = values.sum(axis=1) - values[:, j]
+        
+        X_col = X[rows]
+        X_col[:, -1] = np.where(peers > 0, total / np.maximum(peers, 1), np.nan)
+        return X_col
+    
+    def training_data(self, df: pd.DataFrame, power_columns: List[str], time_column: str,
+                      weather_data: Optional[pd.DataFrame] = None) -> Dict[str, Tuple]:
+        """(features, normalized target, capacity) per column with enough daytime data
+        
+        Rows are capped per stratum with `max_rows_per_stratum` like the multi-output models. peer_output is
+        blanked on a `peer_dropout` fraction of them so the models also learn site-wide outages, where no peer
+        is reporting.
+        """
+        df = self.select_daylight_rows(df, time_column, self.METHOD)
+        X, df_features = self.global_features(df, time_column, weather_data)
+        daylight = self.get_daylight_mask(df, time_column, self.METHOD)
+        strata = self.training_strata(df_features)
+        
+        capacities = {}
+        for col in power_columns:
+            if col not in df.columns:
+                continue
+            values = df[col].to_numpy(dtype=float)
+            daytime_values = values[daylight & ~np.isnan(values)]
+            if np.count_nonzero(~np.isnan(values)) < 50 or len(daytime_values) == 0:
+                print(f"Insufficient data for {col}, skipping...")
+                continue
+            capacity = float(np.quantile(daytime_values, self.CAPACITY_QUANTILE))
+            if capacity > 0:
+                capacities[col] = capacity
+        if not capacities:
+            return {}
+        
+        normalized = self.normalized_power(df, capacities)
+        peer_dropout = self.get_setting(self.METHOD, 'peer_dropout', 0.25)
+        rng = np.random.default_rng(self.get_setting(self.METHOD, 'sample_seed', 42))
+        columns = {}
+        for j, (col, capacity) in enumerate(capacities.items()):
+            rows = self.sample_training_rows(np.flatnonzero(~np.isnan(normalized[:, j])), strata, self.METHOD)
+            X_col = self.column_features(X, normalized, j, rows)
+            X_col[rng.random(len(rows)) < peer_dropout, -1] = np.nan
+            columns[col] = (X_col, normalized[rows, j], capacity)
+        return columns
+    
+    def load_global_model(self) -> Optional[Dict]:
+        """Pretrained model from the registry at the `global_model` setting (None when unset or missing)"""
+        location = self.get_setting(self.METHOD, 'global_model')
+        if not location:
+            return None
+        if location not in self._registries:
+            self._registries[location] = ModelRegistry(location)
+        artifact = self._registries[location].load_global_model(self.get_setting(self.METHOD, 'global_model_name', 'global'))
+        if artifact is None:
+            print(f"No global model in {location} - training site models from scratch")
+        return artifact
+    
+    def global_model_changed(self) -> bool:
+        """Whether the latest global model is not the one the site models were trained on"""
+        global_model = self.load_global_model()
+        version = global_model['version'] if global_model is not None else None
+        return version != self.metadata.get('global_model_version')
+    
+    def fit(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> 'GlobalWarmStartInterpolator':
+        """Train one booster per column on capacity-normalized power, on top of the global model when available"""
+        columns = self.training_data(df, power_columns, time_column, weather_data)
+        global_model = self.load_global_model()
+        executor = self.get_training_executor(self.METHOD)
+        
+        if global_model is not None:
+            params = dict(global_model['params'])
+            rounds = self.get_setting(self.METHOD, 'warm_start_rounds', 20)
+            init_model = global_model['booster']
+        else:
+            params = dict(self.LGB_PARAMS)
+            rounds = self.get_setting(self.METHOD, 'n_estimators', 200)
+            init_model = None
+        params['num_threads'] = executor.threads_for(len(columns))
+        
+        tasks = [(X, y, params, rounds, init_model) for X, y, _ in columns.values()]
+        fitted = executor.map(GlobalWarmStartInterpolator._fit_column, tasks)
+        
+        self.models = dict(zip(columns, fitted))
+        self.capacities = {col: capacity for col, (_, _, capacity) in columns.items()}
+        self.fitted_trees = {col: booster.current_iteration() for col, booster in self.models.items()}
+        self.is_fitted = True
+        self.metadata = {
+            'method': self.METHOD,
+            'models_trained': len(self.models),
+            'warm_started': global_model is not None,
+            'global_model_version': global_model['version'] if global_model is not None else None,
+            'site_rounds': rounds,
+            'training_samples': int(sum(len(y) for _, y, _ in columns.values())),
+            'daylight_only': self.get_setting(self.METHOD, 'daylight_only', False)
+        }
+        return self
+    
+    @staticmethod
+    def _fit_column(X: np.ndarray, y: np.ndarray, params: Dict, rounds: int, init_model=None) -> lgb.Booster:
+        """Boost `rounds` trees for one column, continuing from the global booster if given (runs inside a training worker)"""
+        import lightgbm as lgb
+        if rounds <= 0 and init_model is not None:
+            return init_model
+        return lgb.train(params, lgb.Dataset(X, label=y, params={'verbose': -1}), num_boost_round=rounds,
+                         init_model=init_model)
+    
+    def partial_fit(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> 'GlobalWarmStartInterpolator':
+        """Update the site boosters from a batch of new rows, as for multi_output_regression
+        (`partial_fit_max_trees` counts trees added after the fit here)"""
+        if not self.is_fitted:
+            return self.fit(df, power_columns, time_column, weather_data)
+        if not self.models:
+            raise NotImplementedError("No site boosters to update")
+        
+        df = self.select_daylight_rows(df, time_column, self.METHOD)
+        missing = [col for col in self.capacities if col not in df.columns]
+        if missing:
+            print(f"Update batch is missing {missing}, keeping the site models")
+            return self
+        X, _ = self.global_features(df, time_column, weather_data)
+        normalized = self.normalized_power(df, self.capacities)
+        rounds = self.get_setting(self.METHOD, 'partial_fit_rounds', 5)
+        max_added = self.get_setting(self.METHOD, 'partial_fit_max_trees', 200)
+        min_rows = self.get_setting(self.METHOD, 'partial_fit_min_rows', 100)
+        decay_rate = self.get_setting(self.METHOD, 'partial_fit_decay_rate', 0.9)
+        
+        for j, col in enumerate(self.capacities):
+            rows = np.flatnonzero(~np.isnan(normalized[:, j]))
+            self.models[col] = MultiOutputRegressionInterpolator._update_booster(
+                self.models[col], self.column_features(X, normalized, j, rows), normalized[rows, j], rounds,
+                self.fitted_trees[col] + max_added, min_rows, decay_rate)
+        
+        self.metadata['partial_fit_batches'] = self.metadata.get('partial_fit_batches', 0) + 1
+        self.metadata['partial_fit_rows'] = self.metadata.get('partial_fit_rows', 0) + len(df)
+        return self
+    
+    @releases_features
+    def interpolate(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Fill missing values from the site boosters, scaled back by each column's capacity"""
+        if not self.is_fitted:
+            raise ValueError("Must call fit() before interpolate()")
+        
+        if self.get_setting(self.METHOD, 'daylight_only', False):
+            return self.interpolate_daylight_only(df, power_columns, time_column, weather_data,
+                                                  self.METHOD, self._interpolate_rows)
+        return self._interpolate_rows(df, power_columns, time_column, weather_data)
+    
+    def _interpolate_rows(self, df: pd.DataFrame, power_columns: List[str], time_column: str, weather_data: Optional[pd.DataFrame] = None) -> pd.DataFrame:
+        """Predict every missing value of the given frame"""
+        df_result = df.copy()
+        columns = [col for col in power_columns if col in self.models and col in df_result.columns]
+        
+        if columns and df_result[columns].isna().to_numpy().any():
+            X, _ = self.global_features(df_result, time_column, weather_data)
+            # Peers as observed: filled values of one column do not feed the next
+            capacities = {col: capacity for col, capacity in self.capacities.items() if col in df_result.columns}
+            normalized = self.normalized_power(df_result, capacities)
+            for col in columns:
+                rows = np.flatnonzero(df_result[col].isna().to_numpy())
+                if len(rows) == 0:
+                    continue
+                X_col = self.column_features(X, normalized, list(capacities).index(col), rows)
+                predictions = np.clip(self.models[col].predict(X_col), 0, None) * self.capacities[col]
+                df_result.loc[df_result.index[rows], col] = self.as_column_dtype(df_result, col, predictions)
+                print(f"Filled {len(rows)} missing values for {col}")
+        
+        return self.apply_solar_constraints(df_result, power_columns, time_column)
+
+
+INTERPOLATORS = {
+    'spline_interpolation': SplineInterpolator,
+    'gap_local_spline': GapLocalSplineInterpolator,
+    'gaussian_process': GaussianProcessInterpolator,
+    'physics_based_model': PhysicsBasedInterpolator,
+    'multi_output_regression': MultiOutputRegressionInterpolator,
+    'hybrid_interpolation': HybridInterpolator,
+    'global_warm_start': GlobalWarmStartInterpolator,
+    'system_level_interpolation': MultiOutputRegressionInterpolator,  # Alias
+    'degradation_aware_interpolation': GaussianProcessInterpolator,   # Fallback
+    'maintenance_aware_interpolation': PhysicsBasedInterpolator,      # Fallback
+    'equipment_specific_interpolation': SplineInterpolator           # Fallback
+}
+
+# Cheaper methods, most accurate first, used when the chosen one does not fit in a deadline
+DEADLINE_FALLBACKS = ['multi_output_regression', 'gap_local_spline', 'spline_interpolation']
+
+# Chunk size for deadline runs without chunk_rows: the deadline is checked between written chunks
+DEADLINE_CHUNK_ROWS = 50000
+
+# Interpolator options that only change how a model is run, not what it is fitted to;
+# left out of registry keys and selection profiles so they can vary between runs
+EXECUTION_OPTIONS = ('n_workers', 'n_threads')
+
+
 class InterpolationEngine:
     """Main engine for running interpolation methods"""
     
     def __init__(self):
-        self.interpolators = {
-            'spline_interpolation': SplineInterpolator,
-            'gaussian_process': GaussianProcessInterpolator,
-            'physics_based_model': PhysicsBasedInterpolator,
-            'multi_output_regression': MultiOutputRegressionInterpolator,
-            'system_level_interpolation': MultiOutputRegressionInterpolator,  # Alias
-            'degradation_aware_interpolation': GaussianProcessInterpolator,   # Fallback
-            'maintenance_aware_interpolation': PhysicsBasedInterpolator,      # Fallback
-            'equipment_specific_interpolation': SplineInterpolator           # Fallback
-        }
-        self.s3_client = boto3.client('s3')
+        self.interpolators = dict(INTERPOLATORS)
+        self._s3_client = None
         self.weather_data = None
+        self.model_registry = None
+    
+    @property
+    def s3_client(self):
+        """S3 client for the weather database, created on first use"""
+        if self._s3_client is None:
+            import boto3
+            self._s3_client = boto3.client('s3')
+        return self._s3_client
     
     def _find_nearest_city(self, city_name: str) -> str:
         """Find the nearest city in the S3 weather database"""
@@ -1177,31 +2994,109 @@ class InterpolationEngine:
         
         return method
     
+    def select_method(self, gap_analysis: Dict, df: pd.DataFrame, structure: Dict, interpolator_options: Dict,
+                      budget_seconds: float = 60.0, site_id: Optional[str] = None,
+                      model_registry: Optional[str] = None, retrain: bool = False) -> Dict:
+        """Pick a method by measuring candidates on this data, reusing the site's cached choice for the same profile"""
+        selector = MethodSelector(gap_analysis, budget_seconds=budget_seconds)
+        power_columns = structure['power_columns']
+        profile = selector.data_profile(df, power_columns, interpolator_options)
+        
+        registry = self.get_model_registry(model_registry) if model_registry and site_id else None
+        if registry is not None and not retrain:
+            cached = registry.load_selection(site_id, profile)
+            if cached is not None and cached['method'] in self.interpolators:
+                print(f"Reusing method selection for site {site_id}: {cached['method']} (selected {cached['created_at']})")
+                return dict(cached, cached=True)
+        
+        print(f"Selecting method within {budget_seconds:g}s...")
+        selection = selector.select(self.interpolators, interpolator_options, df, power_columns,
+                                    structure['time_column'], self.weather_data)
+        if registry is not None:
+            registry.save_selection(site_id, profile, selection)
+        return dict(selection, cached=False)
+    
+    def plan_for_deadline(self, method: str, deadline: Deadline, rows: int, columns: int, validate: bool,
+                          cv_folds: Optional[int] = None, fitted: bool = False,
+                          predict_rows: Optional[int] = None) -> Dict:
+        """Drop validation, then fall back to cheaper methods, until the estimated run cost fits the deadline"""
+        def cost(name: str, with_validation: bool) -> float:
+            class_name = self.interpolators[name].__name__
+            seconds = estimate_seconds(class_name, rows, columns, fit=not (fitted and name == method),
+                                       predict_rows=predict_rows)
+            if with_validation:
+                # Each validation run (split or fold) fits and predicts on about the same rows again
+                seconds += (cv_folds or 1) * estimate_seconds(class_name, rows, columns)
+            return seconds
+        
+        requested_cost = cost(method, False)
+        options = [(method, True)] if validate else []
+        options.append((method, False))
+        options += [(name, False) for name in DEADLINE_FALLBACKS
+                    if name != method and name in self.interpolators and cost(name, False) < requested_cost]
+        
+        chosen = next(((name, with_validation) for name, with_validation in options
+                       if deadline.allows(cost(name, with_validation))), None)
+        fits = chosen is not None
+        if chosen is None:
+            chosen = min(options, key=lambda option: cost(*option))
+        
+        return {
+            'requested_method': method,
+            'method': chosen[0],
+            'validate': chosen[1],
+            'estimated_seconds': round(cost(*chosen), 2),
+            'remaining_seconds': round(deadline.remaining(), 2),
+            'fits': fits
+        }
+    
+    def get_model_registry(self, location: str) -> ModelRegistry:
+        """Get the model registry for a location, reusing it (and its in-memory cache) across runs"""
+        if self.model_registry is None or self.model_registry.location != location:
+            self.model_registry = ModelRegistry(location, self.interpolators)
+        return self.model_registry
+    
+    def load_registered_model(self, registry: ModelRegistry, site_id: str, method: str,
+                              model_config: Dict) -> Optional[BaseInterpolator]:
+        """Latest registered model for this key, None when there is none or it is out of date
+        (site models warm-started from an older global model)"""
+        interpolator = registry.load(site_id, method, model_config)
+        if isinstance(interpolator, GlobalWarmStartInterpolator) and interpolator.global_model_changed():
+            print(f"Global model changed since the registered model for site {site_id} was trained - retraining")
+            return None
+        return interpolator
+    
+    def get_model_config(self, gap_analysis: Dict, method: str, structure: Dict, interpolator_options: Dict) -> Dict:
+        """Configuration that identifies a fitted model in the registry"""
+        return {
+            'method_config': InterpolationConfig(gap_analysis).get_method_config(method),
+            'time_column': structure['time_column'],
+            'power_columns': structure['power_columns'],
+            'options': {key: value for key, value in interpolator_options.items() if key not in EXECUTION_OPTIONS}
+        }
+    
     def create_validation_split(self, df: pd.DataFrame, power_columns: List[str], 
                               validation_ratio: float = 0.15) -> Tuple[pd.DataFrame, Dict]:
         """Create validation split by artificially removing some data"""
         df_validation = df.copy()
         
         # Find complete rows (all power columns have data)
-        complete_mask = df[power_columns].notna().all(axis=1)
-        complete_indices = df[complete_mask].index.tolist()
+        complete_mask = df[power_columns].notna().all(axis=1).to_numpy()
+        complete_indices = df.index[complete_mask]
         
         if len(complete_indices) < 20:
             return df_validation, {'error': 'Insufficient complete data for validation'}
         
-        # Randomly select validation indices
-        np.random.seed(42)  # For reproducibility
+        # Randomly select validation indices (same draws as seeding the global generator with 42)
         n_validation = max(10, int(len(complete_indices) * validation_ratio))
-        validation_indices = np.random.choice(complete_indices, size=n_validation, replace=False)
-        
-        # Store original values
-        validation_data = {}
-        for col in power_columns:
-            validation_data[col] = df.loc[validation_indices, col].copy()
+        validation_indices = np.random.RandomState(42).choice(complete_indices, size=n_validation, replace=False)
         
-        # Remove values for validation
-        for col in power_columns:
-            df_validation.loc[validation_indices, col] = np.nan
+        # Store original values and remove them, positionally for all power columns at once
+        positions = df.index.get_indexer(validation_indices)
+        column_positions = [df.columns.get_loc(col) for col in power_columns]
+        held_out = df.iloc[positions, column_positions]
+        validation_data = {col: held_out[col] for col in power_columns}
+        df_validation.iloc[positions, column_positions] = np.nan
         
         validation_info = {
             'validation_indices': validation_indices.tolist(),
@@ -1211,152 +3106,473 @@ class InterpolationEngine:
         
         return df_validation, validation_info
     
+    def load_training_sample(self, data_file: str, chunk_rows: int, max_training_rows: int,
+                             time_column: Optional[str] = None, power_columns: Optional[List[str]] = None,
+                             keep_extra_columns: bool = False, float_dtype=np.float64) -> pd.DataFrame:
+        """Evenly spaced contiguous chunks of the file, at most max_training_rows rows in total"""
+        total_rows = count_rows(data_file)
+        
+        # Whole chunks keep lag/rolling features valid inside each block
+        n_chunks = -(-total_rows // chunk_rows)
+        n_selected = min(n_chunks, max(1, max_training_rows // chunk_rows))
+        selected = set(np.linspace(0, n_chunks - 1, n_selected).round().astype(int)) if n_chunks else set()
+        
+        chunks = iter_chunks(data_file, chunk_rows, time_column, power_columns, keep_extra_columns, float_dtype)
+        blocks = [chunk for i, chunk in enumerate(chunks) if i in selected]
+        df = pd.concat(blocks) if blocks else load_data(data_file, time_column, power_columns, keep_extra_columns).iloc[:0]
+        print(f"Training sample: {len(df)} of {total_rows} rows ({len(blocks)} of {n_chunks} chunks)")
+        
+        return df
+    
+    @staticmethod
+    def _safe_emit_end(missing: np.ndarray, overlap_rows: int, max_gap_rows: int) -> int:
+        """Rows of the buffer that can be written: every row keeps `overlap_rows` of right context and no
+        gap the interpolator could close (at most `max_gap_rows` long) is split from the observed points after it.
+        Longer gaps, such as a dead inverter, are treated as open-ended and written as they are."""
+        limit = len(missing) - overlap_rows
+        emit_end = limit
+        
+        for col_idx in range(missing.shape[1]):
+            gap_starts, gap_lengths = BaseInterpolator.find_gap_runs(missing[:, col_idx])
+            held = (gap_starts + gap_lengths > limit) & (gap_lengths <= max_gap_rows)
+            if held.any():
+                emit_end = min(emit_end, int(gap_starts[held].min()))
+        
+        return emit_end
+    
+    def stream_interpolation(self, interpolator: BaseInterpolator, data_file: str, writer: OutputWriter,
+                             power_columns: List[str], time_column: str,
+                             chunk_rows: int, overlap_rows: int, keep_extra_columns: bool = False,
+                             deadline: Optional[Deadline] = None, fallback: Optional[BaseInterpolator] = None) -> Dict:
+        """Interpolate the file chunk by chunk with overlapping context, appending each finished block
+
+        Rows are held back only for gaps of at most `overlap_rows`, and never once the buffer exceeds
+        2 * chunk_rows + overlap_rows, so memory stays bounded whatever the gaps.
+        With a deadline, each block's cost is predicted from the previous one. When it would not fit, the
+        remaining blocks use the fitted `fallback`, and when that would not fit either the stream stops with
+        everything written so far (`stopped_early`, `resume_from` in the stats).
+        """
+        parts = []  # Buffered frames, joined only when a block is written
+        masks = []  # Their missing-value masks, for finding where a block can end
+        n_context = 0  # Leading buffer rows already written, kept as left context
+        max_buffer_rows = 2 * chunk_rows + overlap_rows
+        seconds_per_row = None  # Measured on the previous block
+        stats = {'total_rows': 0, 'chunks_written': 0, 'n_columns': 0,
+                 'missing_before': dict.fromkeys(power_columns, 0), 'missing_after': dict.fromkeys(power_columns, 0)}
+        if deadline is not None:
+            stats.update(stopped_early=False, resume_from=None, fallback_from_chunk=None)
+        
+        float_dtype = np.float32 if interpolator.use_compact_dtypes() else np.float64
+        reader = iter_chunks(data_file, chunk_rows, time_column, power_columns, keep_extra_columns, float_dtype)
+        for chunk in itertools.chain(reader, [None]):
+            if chunk is not None:
+                parts.append(chunk)
+                masks.append(chunk[power_columns].isna().to_numpy())
+                missing = np.concatenate(masks) if len(masks) > 1 else masks[0]
+                if len(missing) > max_buffer_rows:
+                    emit_end = len(missing) - overlap_rows  # Gaps still open are split rather than buffered
+                else:
+                    emit_end = self._safe_emit_end(missing, overlap_rows, overlap_rows)
+                if emit_end <= n_context:
+                    continue  # Not enough right context yet (e.g. inside a short gap)
+            elif not parts or n_context >= sum(len(part) for part in parts):
+                break
+            else:
+                emit_end = sum(len(part) for part in parts)
+            buffer = pd.concat(parts) if len(parts) > 1 else parts[0]
+            
+            if seconds_per_row is not None and not deadline.allows(seconds_per_row * len(buffer)):
+                if fallback is not None and interpolator is not fallback:
+                    print(f"Deadline: {deadline.remaining():.0f}s left, "
+                          f"using {fallback.metadata['method']} for the remaining chunks")
+                    interpolator = fallback
+                    stats['fallback_from_chunk'] = stats['chunks_written']
+                    seconds_per_row = None
+                else:
+                    # Everything before this block is already written and stays a valid partial output
+                    stats['stopped_early'] = True
+                    stats['resume_from'] = str(buffer[time_column].iloc[n_context])
+                    print(f"Deadline: stopping before {stats['resume_from']} ({stats['total_rows']} rows written)")
+                    break
+            
+            block_start = time.perf_counter()
+            with span('predict'):
+                df_result = interpolator.interpolate(buffer, power_columns, time_column, self.weather_data)
+            block = df_result.iloc[n_context:emit_end]
+            with span('write'):
+                if writer.writes_mask:
+                    block = mark_interpolated(block.copy(), buffer.iloc[n_context:emit_end], power_columns)
+                writer.write(block)
+            if deadline is not None:
+                seconds_per_row = (time.perf_counter() - block_start) / len(buffer)
+            
+            for col in power_columns:
+                stats['missing_before'][col] += int(buffer[col].iloc[n_context:emit_end].isna().sum())
+                stats['missing_after'][col] += int(block[col].isna().sum())
+            stats['total_rows'] += len(block)
+            stats['chunks_written'] += 1
+            stats['n_columns'] = block.shape[1]
+            
+            # Keep left context for lag/rolling features and gap-local splines
+            keep_from = max(0, emit_end - overlap_rows)
+            parts = [buffer.iloc[keep_from:]]
+            masks = [np.concatenate(masks)[keep_from:]]
+            n_context = emit_end - keep_from
+        
+        return stats
+    
     def run_interpolation(self, data_file: str, gap_analysis_file: str, 
                          method_name: Optional[str] = None, 
                          output_dir: str = 'output',
                          validate: bool = True,
-                         city_name: Optional[str] = None) -> Dict:
-        """Run interpolation and return results"""
-        
-        print(f"Loading data from {data_file}")
-        df = pd.read_csv(data_file)
-        
-        print(f"Loading gap analysis from {gap_analysis_file}")
-        gap_analysis = self.load_gap_analysis(gap_analysis_file)
-        
-        # Load weather data if city specified
-        if city_name:
-            print(f"Loading weather data for {city_name}...")
-            self.weather_data = self._load_weather_data(city_name)
-        else:
-            print("No city specified - interpolation will use time features only")
-        
-        # Extract structure
-        structure = self.extract_data_structure(gap_analysis)
-        time_column = structure['time_column']
-        power_columns = structure['power_columns']
-        
-        if not time_column or not power_columns:
-            raise ValueError("Could not extract data structure from gap analysis")
-        
-        print(f"Data structure:")
-        print(f"  Time column: {time_column}")
-        print(f"  Power columns: {power_columns}")
-        
-        # Get method
-        method = self.get_recommended_method(gap_analysis, method_name)
-        print(f"Using interpolation method: {method}")
-        
-        if method not in self.interpolators:
-            raise ValueError(f"Unknown interpolation method: {method}")
-        
-        # Create output directory
-        Path(output_dir).mkdir(exist_ok=True)
-        
-        results = {
-            'method_used': method,
-            'data_structure': structure,
-            'metrics': {},
-            'files_created': []
-        }
-        
-        # Validation
-        if validate:
-            print("Creating validation split...")
-            df_val, validation_info = self.create_validation_split(df, power_columns)
-            
-            if 'error' not in validation_info:
-                # Train on validation data
-                print("Training interpolator...")
-                interpolator_class = self.interpolators[method]
-                
-                # Create configuration parser for validation
-                interp_config = InterpolationConfig(gap_analysis)
+                         city_name: Optional[str] = None,
+                         n_workers: Optional[int] = None,
+                         reuse_validation_model: bool = False,
+                         site_id: Optional[str] = None,
+                         model_registry: Optional[str] = None,
+                         retrain: bool = False,
+                         daylight_only: bool = False,
+                         latitude: Optional[float] = None,
+                         longitude: Optional[float] = None,
+                         chunk_rows: Optional[int] = None,
+                         overlap_rows: int = 288,
+                         max_training_rows: int = 500000,
+                         compact_dtypes: bool = False,
+                         keep_extra_columns: bool = False,
+                         columnar_cache: Optional[str] = None,
+                         output_format: str = 'csv',
+                         trace_memory: bool = False,
+                         profile_dir: Optional[str] = None,
+                         cv_folds: Optional[int] = None,
+                         validation_strategy: Optional[str] = None,
+                         bootstrap_samples: int = 0,
+                         selection_budget: float = 60.0,
+                         deadline: Optional[Deadline] = None,
+                         update: bool = False,
+                         global_model: Optional[str] = None) -> Dict:
+        """Run interpolation and return results (streamed in chunks when chunk_rows is set)
+
+        With a deadline, validation is skipped and cheaper methods are used as needed for the estimated cost to
+        fit, and the run is streamed (in DEADLINE_CHUNK_ROWS chunks unless chunk_rows is set) so it can stop
+        early with the chunks written so far rather than overrunning.
+        With `update`, a registered model is updated with this file's rows (`partial_fit`, e.g. a nowcast
+        batch) and registered as a new version instead of being used as is.
+        `global_model` is the registry location of the cross-site model `global_warm_start` starts from.
+        """
+        if deadline is not None and not chunk_rows:
+            chunk_rows = DEADLINE_CHUNK_ROWS
+        
+        with SpanRecorder(trace_memory=trace_memory, profile_dir=profile_dir) as recorder:
+            with span('load'):
+                print(f"Loading gap analysis from {gap_analysis_file}")
+                gap_analysis = self.load_gap_analysis(gap_analysis_file)
                 
-                # Create interpolator with configuration
-                interpolator = interpolator_class(interpolation_config=interp_config)
-                interpolator.fit(df_val, power_columns, time_column, self.weather_data)
+                # Extract structure
+                structure = self.extract_data_structure(gap_analysis)
+                time_column = structure['time_column']
+                power_columns = structure['power_columns']
                 
-                # Interpolate validation data
-                print("Performing interpolation...")
-                df_interpolated = interpolator.interpolate(df_val, power_columns, time_column, self.weather_data)
+                if not time_column or not power_columns:
+                    raise ValueError("Could not extract data structure from gap analysis")
                 
-                # Calculate metrics
-                print("Calculating validation metrics...")
-                validation_metrics = {}
-                for col in power_columns:
-                    if col in validation_info['validation_data']:
-                        y_true = validation_info['validation_data'][col].values
-                        y_pred = df_interpolated.loc[validation_info['validation_indices'], col].values
+                # Only the time and power columns are parsed unless extra columns are kept (e.g. as features)
+                print(f"Loading data from {data_file}")
+                data_path = resolve_input(data_file, columnar_cache, time_column, power_columns)
+                float_dtype = np.float32 if compact_dtypes else np.float64
+                if chunk_rows:
+                    # Streaming: train and validate on a sample, never hold the full series
+                    df = self.load_training_sample(data_path, chunk_rows, max_training_rows, time_column, power_columns,
+                                                   keep_extra_columns, float_dtype)
+                else:
+                    df = load_data(data_path, time_column, power_columns, keep_extra_columns, float_dtype)
+            
+            # Load weather data if city specified
+            if city_name:
+                print(f"Loading weather data for {city_name}...")
+                with span('weather'):
+                    self.weather_data = self._load_weather_data(city_name)
+            else:
+                print("No city specified - interpolation will use time features only")
+            
+            print(f"Data structure:")
+            print(f"  Time column: {time_column}")
+            print(f"  Power columns: {power_columns}")
+            
+            # Options shared by every interpolator created for this run
+            interpolator_options = {}
+            if n_workers is not None:
+                interpolator_options['n_workers'] = n_workers
+            if daylight_only:
+                interpolator_options['daylight_only'] = True
+            if compact_dtypes:
+                interpolator_options['compact_dtypes'] = True
+            if latitude is not None and longitude is not None:
+                interpolator_options['latitude'] = latitude
+                interpolator_options['longitude'] = longitude
+            if global_model:
+                interpolator_options['global_model'] = global_model
+            
+            # Get method (measured on a sample of this data with `auto`)
+            method_selection = None
+            if method_name == 'auto':
+                if deadline is not None:
+                    # Leave most of the time for the run itself
+                    selection_budget = min(selection_budget, max(0.0, deadline.remaining()) / 4)
+                with span('selection'):
+                    method_selection = self.select_method(gap_analysis, df, structure, interpolator_options,
+                                                          selection_budget, site_id, model_registry, retrain)
+                method = method_selection['method']
+            else:
+                method = self.get_recommended_method(gap_analysis, method_name)
+            print(f"Using interpolation method: {method}")
+            
+            if method not in self.interpolators:
+                raise ValueError(f"Unknown interpolation method: {method}")
+            
+            # Look up a previously fitted model for this site (predict-only when found)
+            registry = None
+            registered_interpolator = None
+            if model_registry and site_id:
+                registry = self.get_model_registry(model_registry)
+                model_config = self.get_model_config(gap_analysis, method, structure, interpolator_options)
+                if not retrain:
+                    with span('registry'):
+                        registered_interpolator = self.load_registered_model(registry, site_id, method, model_config)
+                if registered_interpolator is not None:
+                    print(f"Using registered model for site {site_id} - skipping training")
+                    validate = False
+            
+            # Incremental update of the registered model with this batch
+            updated_incrementally = False
+            if update and registered_interpolator is None:
+                # Fitting on the batch alone would register a model that never saw the site's history
+                raise ValueError(f"--update needs a registered {method} model for site {site_id} "
+                                 f"(--site-id and --model-registry, without --retrain); run without --update first")
+            if update:
+                try:
+                    with span('update'):
+                        registered_interpolator.partial_fit(df, power_columns, time_column, self.weather_data)
+                    updated_incrementally = True
+                    print(f"Updated registered model with {len(df)} new rows")
+                except NotImplementedError as e:
+                    print(f"{e} - using the registered model as is")
+            
+            # Fit the run to the time left (cost estimated from the data size)
+            deadline_plan = None
+            if deadline is not None:
+                deadline_plan = self.plan_for_deadline(
+                    method, deadline, len(df), len(power_columns), validate, cv_folds,
+                    fitted=registered_interpolator is not None,
+                    predict_rows=count_rows(data_path) if chunk_rows else None
+                )
+                print(f"Deadline: {deadline_plan['remaining_seconds']:.0f}s left, "
+                      f"estimated {deadline_plan['estimated_seconds']:.0f}s for {deadline_plan['method']}"
+                      f"{' with' if deadline_plan['validate'] else ' without'} validation")
+                validate = deadline_plan['validate']
+                if deadline_plan['method'] != method:
+                    method = deadline_plan['method']
+                    print(f"Falling back to {method} to meet the deadline")
+                    if registry is not None:
+                        model_config = self.get_model_config(gap_analysis, method, structure, interpolator_options)
+                        registered_interpolator = None if retrain else self.load_registered_model(
+                            registry, site_id, method, model_config)
+            
+            # Create output directory
+            Path(output_dir).mkdir(exist_ok=True)
+            
+            results = {
+                'method_used': method,
+                'data_structure': structure,
+                'metrics': {},
+                'files_created': []
+            }
+            if method_selection is not None:
+                results['method_selection'] = method_selection
+            if deadline_plan is not None:
+                results['deadline'] = deadline_plan
+            
+            # Validation
+            validation_interpolator = None
+            if validate and cv_folds:
+                with span('validation'):
+                    validator = BlockCrossValidator(gap_analysis, cv_folds, strategy=validation_strategy,
+                                                    n_workers=n_workers, n_bootstrap=bootstrap_samples)
+                    print(f"Cross-validating on {cv_folds} folds ({validator.strategy})...")
+                    cv_results = validator.run(self.interpolators[method], interpolator_options, df, power_columns,
+                                               time_column, self.weather_data)
+                    results['cross_validation'] = cv_results
+                    results['validation_metrics'] = cv_results['column_metrics']
+                    results['overall_metrics'] = cv_results['overall_metrics']
+            elif validate:
+                with span('validation'):
+                    print("Creating validation split...")
+                    with span('split'):
+                        df_val, validation_info = self.create_validation_split(df, power_columns)
+                    
+                    if 'error' not in validation_info:
+                        # Train on validation data
+                        print("Training interpolator...")
+                        interpolator_class = self.interpolators[method]
                         
-                        col_metrics = InterpolationMetrics.calculate_metrics(y_true, y_pred, f"{method}_{col}")
-                        validation_metrics[col] = col_metrics
-                
-                results['validation_metrics'] = validation_metrics
+                        # Create configuration parser for validation
+                        interp_config = InterpolationConfig(gap_analysis)
+                        
+                        # Create interpolator with configuration
+                        interpolator = interpolator_class(interpolator_options, interpolation_config=interp_config)
+                        with span('fit'):
+                            interpolator.fit(df_val, power_columns, time_column, self.weather_data)
+                        validation_interpolator = interpolator
+                        
+                        # Interpolate validation data
+                        print("Performing interpolation...")
+                        with span('predict'):
+                            df_interpolated = interpolator.interpolate(df_val, power_columns, time_column, self.weather_data)
+                        
+                        # Calculate metrics
+                        print("Calculating validation metrics...")
+                        with span('metrics'):
+                            # Every column scored in one batch (held-out rows x power columns)
+                            validation_indices = validation_info['validation_indices']
+                            y_true = np.column_stack([validation_info['validation_data'][col].to_numpy(dtype=np.float64)
+                                                      for col in power_columns])
+                            y_pred = df_interpolated.loc[validation_indices, power_columns].to_numpy(dtype=np.float64)
+                            batch = InterpolationMetrics.calculate_batch_metrics(
+                                y_true, y_pred, np.ones(y_true.shape, dtype=bool),
+                                times=df.loc[validation_indices, time_column].to_numpy(),
+                                step_hours=HybridInterpolator._step_hours(df[time_column]),
+                                n_bootstrap=bootstrap_samples
+                            )
+                            validation_metrics = InterpolationMetrics.column_metrics(batch, power_columns, method)
+                        
+                        results['validation_metrics'] = validation_metrics
+                        
+                        # Overall metrics (average across columns)
+                        avg_metrics = InterpolationMetrics.average_metrics(batch, InterpolationMetrics.SUMMARY_KEYS)
+                        results['overall_metrics'] = {key: float(value) for key, value in avg_metrics.items()}
+            
+            # Full interpolation on original data
+            print("Performing full interpolation on original data...")
+            interpolator_class = self.interpolators[method]
+            
+            # Create configuration parser
+            interp_config = InterpolationConfig(gap_analysis)
+            
+            # Create interpolator with configuration
+            if registered_interpolator is not None:
+                interpolator = registered_interpolator
+            elif reuse_validation_model and validation_interpolator is not None:
+                interpolator = validation_interpolator
+            else:
+                interpolator = interpolator_class(interpolator_options, interpolation_config=interp_config)
+            
+            # Validate configuration
+            validation = interp_config.validate_configuration(method)
+            if not validation['valid']:
+                print(f"Configuration validation failed: {validation['errors']}")
+            if validation['warnings']:
+                print(f"Configuration warnings: {validation['warnings']}")
+            
+            if interpolator is registered_interpolator:
+                pass
+            elif interpolator is validation_interpolator:
+                # Warm-start from the validation model with the held-out rows added
+                print("Reusing validation model for full interpolation...")
+                with span('fit'):
+                    interpolator.refit(df, power_columns, time_column, self.weather_data)
+            else:
+                with span('fit'):
+                    interpolator.fit(df, power_columns, time_column, self.weather_data)
+            
+            # A model fitted on an update batch alone (e.g. a deadline fallback) is used but never registered
+            if update:
+                register = updated_incrementally and interpolator is registered_interpolator
+            else:
+                register = interpolator is not registered_interpolator
+            if registry is not None and register:
+                with span('registry'):
+                    results['model_version'] = registry.save(
+                        interpolator, site_id, method, model_config,
+                        metadata={'data_file': str(data_file), 'training_rows': len(df),
+                                  'incremental_update': updated_incrementally}
+                    )
+            
+            suffix = OUTPUT_WRITERS[output_format].suffix
+            output_file = Path(output_dir) / f"{Path(data_file).stem}_interpolated_{method}{suffix}"
+            writer = create_writer(output_format, output_file, time_column)
+            if chunk_rows:
+                # Gap-local splines need no training, so they can take over mid-stream when time runs short
+                fallback = None
+                if deadline is not None and method not in ('gap_local_spline', 'spline_interpolation'):
+                    fallback = self.interpolators['gap_local_spline'](interpolator_options, interpolation_config=interp_config)
+                    fallback.fit(df, power_columns, time_column, self.weather_data)
+                print(f"Streaming interpolation in chunks of {chunk_rows} rows ({overlap_rows} rows overlap)...")
+                with span('stream'), writer:
+                    stream_stats = self.stream_interpolation(interpolator, data_path, writer, power_columns,
+                                                             time_column, chunk_rows, overlap_rows, keep_extra_columns,
+                                                             deadline, fallback)
+                original_shape = (stream_stats['total_rows'], len(df.columns))
+                interpolated_shape = (stream_stats['total_rows'], stream_stats['n_columns'])
+                missing_filled = {col: stream_stats['missing_before'][col] - stream_stats['missing_after'][col]
+                                  for col in power_columns}
+                results['streaming'] = {
+                    'chunk_rows': chunk_rows,
+                    'overlap_rows': overlap_rows,
+                    'chunks_written': stream_stats['chunks_written'],
+                    'training_rows': len(df),
+                    'total_rows': stream_stats['total_rows']
+                }
+                if deadline_plan is not None:
+                    deadline_plan.update(stopped_early=stream_stats['stopped_early'],
+                                         resume_from=stream_stats['resume_from'],
+                                         fallback_from_chunk=stream_stats['fallback_from_chunk'])
+            else:
+                with span('predict'):
+                    df_final = interpolator.interpolate(df, power_columns, time_column, self.weather_data)
+                with span('write'):
+                    if writer.writes_mask:
+                        df_final = mark_interpolated(df_final, df, power_columns)
+                    with writer:
+                        writer.write(df_final)
+                original_shape = df.shape
+                interpolated_shape = df_final.shape
                 
-                # Overall metrics (average across columns)
-                if validation_metrics:
-                    avg_metrics = {}
-                    metric_keys = ['mae', 'rmse', 'r2_score', 'smape_percent', 'mape_percent', 'correlation']
-                    for key in metric_keys:
-                        values = [m[key] for m in validation_metrics.values() if key in m and not np.isnan(m[key])]
-                        if values:
-                            avg_metrics[f'avg_{key}'] = np.mean(values)
-                    
-                    results['overall_metrics'] = avg_metrics
-        
-        # Full interpolation on original data
-        print("Performing full interpolation on original data...")
-        interpolator_class = self.interpolators[method]
-        
-        # Create configuration parser
-        interp_config = InterpolationConfig(gap_analysis)
-        
-        # Create interpolator with configuration
-        interpolator = interpolator_class(interpolation_config=interp_config)
-        
-        # Validate configuration
-        validation = interp_config.validate_configuration(method)
-        if not validation['valid']:
-            print(f"Configuration validation failed: {validation['errors']}")
-        if validation['warnings']:
-            print(f"Configuration warnings: {validation['warnings']}")
-        
-        interpolator.fit(df, power_columns, time_column, self.weather_data)
-        df_final = interpolator.interpolate(df, power_columns, time_column, self.weather_data)
-        
-        # Save interpolated data
-        output_file = Path(output_dir) / f"{Path(data_file).stem}_interpolated_{method}.csv"
-        df_final.to_csv(output_file, index=False)
-        results['files_created'].append(str(output_file))
-        print(f"Saved interpolated data to: {output_file}")
-        
-        # Save metadata
-        metadata = {
-            'interpolator_metadata': interpolator.metadata,
-            'method_used': method,
-            'original_data_shape': df.shape,
-            'interpolated_data_shape': df_final.shape,
-            'missing_values_filled': {},
-        }
-        
-        # Calculate missing values filled
-        for col in power_columns:
-            if col in df.columns and col in df_final.columns:
-                original_missing = df[col].isna().sum()
-                final_missing = df_final[col].isna().sum()
-                metadata['missing_values_filled'][col] = original_missing - final_missing
-        
-        results['metadata'] = metadata
-        
-        # Save results summary
-        summary_file = Path(output_dir) / f"{Path(data_file).stem}_interpolation_summary_{method}.json"
-        with open(summary_file, 'w') as f:
-            json.dump(results, f, indent=2, default=str)
-        results['files_created'].append(str(summary_file))
-        print(f"Saved summary to: {summary_file}")
-        
-        return results
+                # Calculate missing values filled
+                missing_filled = {}
+                for col in power_columns:
+                    if col in df.columns and col in df_final.columns:
+                        original_missing = df[col].isna().sum()
+                        final_missing = df_final[col].isna().sum()
+                        missing_filled[col] = original_missing - final_missing
+            
+            # Save interpolated data
+            results['files_created'].append(str(output_file))
+            print(f"Saved interpolated data to: {output_file}")
+            
+            # Save metadata
+            metadata = {
+                'interpolator_metadata': interpolator.metadata,
+                'method_used': method,
+                'validation_model_reused': interpolator is validation_interpolator,
+                'registered_model_used': interpolator is registered_interpolator,
+                'registered_model_updated': updated_incrementally,
+                'original_data_shape': original_shape,
+                'interpolated_data_shape': interpolated_shape,
+                'missing_values_filled': missing_filled,
+            }
+            
+            results['metadata'] = metadata
+            
+            # Per-stage timings and memory (writing the summary itself is not included)
+            results['timings'] = recorder.summary()
+            
+            # Save results summary
+            summary_file = Path(output_dir) / f"{Path(data_file).stem}_interpolation_summary_{method}.json"
+            with open(summary_file, 'w') as f:
+                json.dump(results, f, indent=2, default=str)
+            results['files_created'].append(str(summary_file))
+            print(f"Saved summary to: {summary_file}")
+            
+            return results
     
     def list_available_methods(self) -> List[str]:
         """List all available interpolation methods"""
@@ -1366,13 +3582,59 @@ class InterpolationEngine:
 def main():
     """Command line interface"""
     parser = argparse.ArgumentParser(description='Run solar data interpolation based on gap analysis')
-    parser.add_argument('data_file', nargs='?', help='Path to CSV file with solar data')
+    parser.add_argument('data_file', nargs='?', help='Path to CSV, Parquet or Feather/Arrow file with solar data')
     parser.add_argument('gap_analysis_file', nargs='?', help='Path to gap analysis JSON file')
-    parser.add_argument('-m', '--method', help='Interpolation method to use (overrides recommendation)')
+    parser.add_argument('-m', '--method',
+                        help='Interpolation method to use (overrides recommendation; `auto` measures candidates on the data)')
+    parser.add_argument('--selection-budget', type=float, default=60.0,
+                        help='Wall-clock seconds for measuring candidates with -m auto (default: 60)')
     parser.add_argument('-o', '--output-dir', default='output', help='Output directory (default: output)')
     parser.add_argument('--no-validation', action='store_true', help='Skip validation metrics')
     parser.add_argument('--list-methods', action='store_true', help='List available methods and exit')
     parser.add_argument('--city', help='City name for weather data (e.g., "Midrand", "Johannesburg")')
+    parser.add_argument('--workers', type=int, help='Parallel workers for per-column model training (0 = all cores)')
+    parser.add_argument('--reuse-validation-model', action='store_true',
+                       help='Warm-start the full run from the validation model instead of retraining')
+    parser.add_argument('--site-id', help='Site identifier for the model registry')
+    parser.add_argument('--model-registry', help='Model registry location (directory or s3://bucket/prefix)')
+    parser.add_argument('--retrain', action='store_true', help='Ignore registered models and train a new version')
+    parser.add_argument('--update', action='store_true',
+                        help="Update the registered model with this file's rows only (e.g. a nowcast batch) "
+                             "and register it as a new version")
+    parser.add_argument('--daylight-only', action='store_true',
+                        help='Train and predict ML interpolators on daylight rows only (night filled with zero)')
+    parser.add_argument('--chunk-rows', type=int,
+                        help='Stream the file in chunks of this many rows instead of loading it whole')
+    parser.add_argument('--overlap-rows', type=int, default=288,
+                        help='Context rows shared between streamed chunks (default: 288)')
+    parser.add_argument('--max-training-rows', type=int, default=500000,
+                        help='Training sample size when streaming (default: 500000)')
+    parser.add_argument('--compact-dtypes', action='store_true',
+                        help='Build features as float32/uint8 with bit-packed availability flags (lower peak memory)')
+    parser.add_argument('--keep-extra-columns', action='store_true',
+                        help='Load every input column, not only the time and power columns')
+    parser.add_argument('--columnar-cache',
+                        help='Directory for Arrow sidecars of CSV inputs (keyed by file hash, reused by later runs)')
+    parser.add_argument('--output-format', choices=list(OUTPUT_WRITERS), default='csv',
+                        help='Interpolated data format (default: csv); columnar formats add an `interpolated` flag column')
+    parser.add_argument('--cv-folds', type=int,
+                        help='Validate with K folds of synthetic gaps shaped like the real ones (parallel over --workers)')
+    parser.add_argument('--validation-strategy', choices=BlockCrossValidator.STRATEGIES,
+                        help='Gap placement for --cv-folds (default: the gap analysis validation_strategy)')
+    parser.add_argument('--bootstrap', type=int, default=0,
+                        help='Bootstrap resamples (by day) for confidence intervals on validation metrics')
+    parser.add_argument('--trace-memory', action='store_true',
+                        help='Record the peak traced allocation per stage (slower)')
+    parser.add_argument('--profile-dir', help='Write a cProfile stats file per top-level stage to this directory')
+    parser.add_argument('--deadline', type=float,
+                        help='Seconds the run must finish in (skips validation, falls back to cheaper methods '
+                             'and stops streaming early as needed; streams in chunks of 50000 rows without '
+                             '--chunk-rows)')
+    parser.add_argument('--global-model',
+                        help='Registry location of the cross-site model global_warm_start starts from '
+                             '(trained with models/global_model.py)')
+    parser.add_argument('--latitude', type=float, help='Site latitude for solar geometry (overrides gap analysis site)')
+    parser.add_argument('--longitude', type=float, help='Site longitude for solar geometry (overrides gap analysis site)')
     
     args = parser.parse_args()
     
@@ -1387,6 +3649,9 @@ def main():
     if not args.data_file or not args.gap_analysis_file:
         parser.error("data_file and gap_analysis_file are required when not using --list-methods")
     
+    # Started before loading so the budget covers the whole run
+    deadline = Deadline(args.deadline) if args.deadline else None
+    
     try:
         results = engine.run_interpolation(
             data_file=args.data_file,
@@ -1394,7 +3659,31 @@ def main():
             method_name=args.method,
             output_dir=args.output_dir,
             validate=not args.no_validation,
-            city_name=args.city
+            city_name=args.city,
+            n_workers=args.workers,
+            reuse_validation_model=args.reuse_validation_model,
+            site_id=args.site_id,
+            model_registry=args.model_registry,
+            retrain=args.retrain,
+            daylight_only=args.daylight_only,
+            latitude=args.latitude,
+            longitude=args.longitude,
+            chunk_rows=args.chunk_rows,
+            overlap_rows=args.overlap_rows,
+            max_training_rows=args.max_training_rows,
+            compact_dtypes=args.compact_dtypes,
+            keep_extra_columns=args.keep_extra_columns,
+            columnar_cache=args.columnar_cache,
+            output_format=args.output_format,
+            trace_memory=args.trace_memory,
+            profile_dir=args.profile_dir,
+            cv_folds=args.cv_folds,
+            validation_strategy=args.validation_strategy,
+            bootstrap_samples=args.bootstrap,
+            selection_budget=args.selection_budget,
+            deadline=deadline,
+            update=args.update,
+            global_model=args.global_model
         )
         
         print(f"\nInterpolation complete!")
@@ -1415,6 +3704,17 @@ def main():
                 print(f"  RMSE: {metrics['avg_rmse']:.2f}")
             if 'avg_correlation' in metrics:
                 print(f"  Correlation: {metrics['avg_correlation']:.4f}")
+            if 'avg_peak_hour_mae' in metrics:
+                print(f"  Peak-hour MAE: {metrics['avg_peak_hour_mae']:.2f}")
+            if 'avg_daily_energy_error_percent' in metrics:
+                print(f"  Daily energy error: {metrics['avg_daily_energy_error_percent']:.2f}%")
+        
+        timings = results['timings']
+        print(f"\nStage timings ({timings['total_seconds']:.2f}s total, peak RSS {timings['peak_rss_mb']:.0f} MB):")
+        for stage, stats in timings['stages'].items():
+            if '/' not in stage:
+                print(f"  {stage:<12} {stats['wall_seconds']:>8.2f}s wall {stats['cpu_seconds']:>8.2f}s CPU "
+                      f"{stats['rss_growth_mb']:>7.0f} MB RSS growth")
         
         print(f"\nFiles created:")
         for file_path in results['files_created']:
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Model Registry for Fitted Interpolators
+Versioned storage of fitted interpolators keyed by site, method and configuration hash
+"""
+import hashlib
+import io
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+
+
+class ModelRegistry:
+    """Versioned model store on a local directory or S3-compatible storage"""
+
+    MANIFEST_NAME = 'manifest.json'
+
+    def __init__(self, location: str = 'model_registry', interpolator_classes: Optional[Dict[str, type]] = None,
+                 endpoint_url: Optional[str] = None):
+        """Initialize with a local directory or an s3://bucket/prefix location"""
+        self.location = location
+        if location.startswith('s3://'):
+            bucket, _, prefix = location[len('s3://'):].partition('/')
+            self.bucket = bucket
+            self.prefix = prefix.strip('/')
+        else:
+            self.bucket = None
+            self.prefix = location
+
+        self.endpoint_url = endpoint_url or os.environ.get('MODEL_REGISTRY_ENDPOINT_URL')
+        self.interpolator_classes = {cls.__name__: cls for cls in (interpolator_classes or {}).values()}
+        self._s3_client = None
+        self._cache = {}
+
+    @property
+    def s3_client(self):
+        """S3 client, created on first use"""
+        if self._s3_client is None:
+            import boto3
+            self._s3_client = boto3.client('s3', endpoint_url=self.endpoint_url)
+        return self._s3_client
+
+    @staticmethod
+    def config_hash(config: Dict) -> str:
+        """Stable short hash of a model configuration"""
+        payload = json.dumps(config, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+    def _model_path(self, site_id: str, method: str, config_hash: str) -> str:
+        """Relative path of a model's directory inside the registry"""
+        return '/'.join([site_id, method, config_hash])
+
+    def _read(self, path: str) -> Optional[bytes]:
+        """Read an object from the registry, None if it does not exist"""
+        if self.bucket:
+            key = f"{self.prefix}/{path}" if self.prefix else path
+            try:
+                response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
+                return response['Body'].read()
+            except self.s3_client.exceptions.NoSuchKey:
+                return None
+
+        file_path = Path(self.prefix) / path
+        if not file_path.exists():
+            return None
+        return file_path.read_bytes()
+
+    def _write(self, path: str, data: bytes):
+        """Write an object to the registry"""
+        if self.bucket:
+            key = f"{self.prefix}/{path}" if self.prefix else path
+            self.s3_client.put_object(Bucket=self.bucket, Key=key, Body=data)
+            return
+
+        file_path = Path(self.prefix) / path
+        file_path.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write then rename so readers never see a partial artifact
+        tmp_path = file_path.with_name(file_path.name + '.tmp')
+        tmp_path.write_bytes(data)
+        os.replace(tmp_path, file_path)
+
+    def list_versions(self, site_id: str, method: str, config: Dict) -> List[Dict]:
+        """List stored versions for a site/method/configuration"""
+        manifest = self._read(f"{self._model_path(site_id, method, self.config_hash(config))}/{self.MANIFEST_NAME}")
+        if manifest is None:
+            return []
+        return json.loads(manifest).get('versions', [])
+
+    def save(self, interpolator, site_id: str, method: str, config: Dict,
+             metadata: Optional[Dict] = None) -> Dict:
+        """Serialize a fitted interpolator as a new version and return its manifest record"""
+        import joblib
+        
+        config_hash = self.config_hash(config)
+        model_path = self._model_path(site_id, method, config_hash)
+        versions = self.list_versions(site_id, method, config)
+        version = (versions[-1]['version'] + 1) if versions else 1
+
+        # Compressed joblib artifact of the interpolator's fitted state
+        buffer = io.BytesIO()
+        joblib.dump(interpolator.to_artifact(), buffer, compress=3)
+        artifact_name = f"v{version:04d}.joblib"
+        self._write(f"{model_path}/{artifact_name}", buffer.getvalue())
+
+        record = {
+            'version': version,
+            'artifact': artifact_name,
+            'class': type(interpolator).__name__,
+            'size_bytes': buffer.tell(),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'metadata': metadata or {}
+        }
+        manifest = {
+            'site_id': site_id,
+            'method': method,
+            'config_hash': config_hash,
+            'config': config,
+            'versions': versions + [record]
+        }
+        self._write(f"{model_path}/{self.MANIFEST_NAME}", json.dumps(manifest, indent=2, default=str).encode('utf-8'))
+
+        # An interpolator updated in place (partial_fit) is only cached as its newest version
+        self._cache = {key: cached for key, cached in self._cache.items() if cached is not interpolator}
+        self._cache[(site_id, method, config_hash, version)] = interpolator
+        print(f"Saved model {site_id}/{method}/{config_hash} version {version} ({record['size_bytes']} bytes)")
+
+        return record
+
+    def load(self, site_id: str, method: str, config: Dict, version: Optional[int] = None) -> Optional[Any]:
+        """Load a fitted interpolator (latest version by default), cached in memory after first use"""
+        import joblib
+        
+        config_hash = self.config_hash(config)
+
+        if version is None:
+            versions = self.list_versions(site_id, method, config)
+            if not versions:
+                return None
+            record = versions[-1]
+            version = record['version']
+        else:
+            record = None
+
+        cache_key = (site_id, method, config_hash, version)
+        if cache_key in self._cache:
+            return self._cache[cache_key]
+
+        if record is None:
+            record = next((v for v in self.list_versions(site_id, method, config) if v['version'] == version), None)
+            if record is None:
+                return None
+
+        data = self._read(f"{self._model_path(site_id, method, config_hash)}/{record['artifact']}")
+        if data is None:
+            return None
+
+        artifact = joblib.load(io.BytesIO(data))
+        interpolator_class = self.interpolator_classes.get(artifact['class'])
+        if interpolator_class is None:
+            raise ValueError(f"Unknown interpolator class in registry artifact: {artifact['class']}")
+
+        interpolator = interpolator_class.from_artifact(artifact)
+        self._cache[cache_key] = interpolator
+        print(f"Loaded model {site_id}/{method}/{config_hash} version {version}")
+
+        return interpolator
+
+    def _selection_path(self, site_id: str, profile: Dict) -> str:
+        """Relative path of a site's cached method selection for a data profile"""
+        return '/'.join([site_id, '_selection', f"{self.config_hash(profile)}.json"])
+
+    def save_selection(self, site_id: str, profile: Dict, selection: Dict):
+        """Store the method chosen by auto-selection for this site and data profile"""
+        record = dict(selection, profile=profile, created_at=datetime.now(timezone.utc).isoformat())
+        self._write(self._selection_path(site_id, profile), json.dumps(record, indent=2, default=str).encode('utf-8'))
+        print(f"Saved method selection for {site_id} ({selection['method']})")
+
+    def load_selection(self, site_id: str, profile: Dict) -> Optional[Dict]:
+        """Cached auto-selection for this site and data profile, None if there is none"""
+        data = self._read(self._selection_path(site_id, profile))
+        return json.loads(data) if data is not None else None
+
+    def _global_path(self, name: str) -> str:
+        """Relative path of a cross-site model's directory inside the registry"""
+        return '/'.join(['_global', name])
+
+    def save_global_model(self, artifact: Dict, name: str = 'global', metadata: Optional[Dict] = None) -> Dict:
+        """Store a model pretrained across sites (booster, params, features) as a new version"""
+        import joblib
+
+        model_path = self._global_path(name)
+        manifest_data = self._read(f"{model_path}/{self.MANIFEST_NAME}")
+        versions = json.loads(manifest_data).get('versions', []) if manifest_data is not None else []
+        version = (versions[-1]['version'] + 1) if versions else 1
+
+        buffer = io.BytesIO()
+        joblib.dump(dict(artifact, version=version), buffer, compress=3)
+        artifact_name = f"v{version:04d}.joblib"
+        self._write(f"{model_path}/{artifact_name}", buffer.getvalue())
+
+        record = {
+            'version': version,
+            'artifact': artifact_name,
+            'size_bytes': buffer.tell(),
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'metadata': metadata or {}
+        }
+        manifest = {'name': name, 'versions': versions + [record]}
+        self._write(f"{model_path}/{self.MANIFEST_NAME}", json.dumps(manifest, indent=2, default=str).encode('utf-8'))
+        print(f"Saved global model {name} version {version} ({record['size_bytes']} bytes)")
+
+        return record
+
+    def load_global_model(self, name: str = 'global') -> Optional[Dict]:
+        """Latest version of a cross-site model, cached in memory after first use"""
+        import joblib
+
+        manifest_data = self._read(f"{self._global_path(name)}/{self.MANIFEST_NAME}")
+        if manifest_data is None:
+            return None
+        record = json.loads(manifest_data)['versions'][-1]
+
+        cache_key = ('_global', name, record['version'])
+        if cache_key not in self._cache:
+            data = self._read(f"{self._global_path(name)}/{record['artifact']}")
+            if data is None:
+                return None
+            self._cache[cache_key] = joblib.load(io.BytesIO(data))
+            print(f"Loaded global model {name} version {record['version']}")
+
+        return self._cache[cache_key]
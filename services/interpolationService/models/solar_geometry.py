@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Solar Geometry Tables
+Vectorized sun position, clear-sky irradiance and daylight masks per site,
+cached per (site, year, frequency) so constraints and physics models slice precomputed arrays
+"""
+from functools import lru_cache
+from typing import Dict, Optional
+import numpy as np
+import pandas as pd
+
+
+def solar_position(times_utc: pd.DatetimeIndex, latitude: float, longitude: float) -> Dict[str, np.ndarray]:
+    """Solar elevation and azimuth in degrees (NOAA approximation) for naive UTC timestamps"""
+    day_of_year = times_utc.dayofyear.to_numpy()
+    hour = (times_utc.hour + times_utc.minute / 60 + times_utc.second / 3600).to_numpy()
+
+    gamma = 2 * np.pi / 365 * (day_of_year - 1 + (hour - 12) / 24)
+    eqtime = 229.18 * (0.000075 + 0.001868 * np.cos(gamma) - 0.032077 * np.sin(gamma)
+                       - 0.014615 * np.cos(2 * gamma) - 0.040849 * np.sin(2 * gamma))
+    declination = (0.006918 - 0.399912 * np.cos(gamma) + 0.070257 * np.sin(gamma)
+                   - 0.006758 * np.cos(2 * gamma) + 0.000907 * np.sin(2 * gamma)
+                   - 0.002697 * np.cos(3 * gamma) + 0.00148 * np.sin(3 * gamma))
+
+    true_solar_minutes = hour * 60 + eqtime + 4 * longitude
+    hour_angle = np.radians(true_solar_minutes / 4 - 180)
+    lat = np.radians(latitude)
+
+    cos_zenith = np.clip(np.sin(lat) * np.sin(declination) +
+                         np.cos(lat) * np.cos(declination) * np.cos(hour_angle), -1, 1)
+    zenith = np.arccos(cos_zenith)
+
+    # Azimuth clockwise from north
+    sin_zenith = np.maximum(np.sin(zenith), 1e-9)
+    cos_azimuth = np.clip((np.sin(lat) * cos_zenith - np.sin(declination)) / (np.cos(lat) * sin_zenith), -1, 1)
+    azimuth = np.degrees(np.arccos(cos_azimuth))
+    azimuth = np.where(hour_angle > 0, (azimuth + 180) % 360, (540 - azimuth) % 360)
+
+    return {
+        'elevation': 90 - np.degrees(zenith),
+        'azimuth': azimuth
+    }
+
+
+def clear_sky_ghi(elevation: np.ndarray) -> np.ndarray:
+    """Haurwitz clear-sky global horizontal irradiance (W/m²) from solar elevation"""
+    cos_zenith = np.sin(np.radians(elevation))
+    ghi = np.zeros_like(cos_zenith, dtype=float)
+    up = cos_zenith > 0
+    ghi[up] = 1098 * cos_zenith[up] * np.exp(-0.057 / cos_zenith[up])
+    return ghi
+
+
+@lru_cache(maxsize=32)
+def _solar_table(latitude: float, longitude: float, utc_offset_hours: float, year: int, step_seconds: int) -> Dict[str, np.ndarray]:
+    """One year of sun position and clear-sky irradiance on a regular local-time grid (float32)"""
+    start = pd.Timestamp(year=year, month=1, day=1)
+    periods = int((pd.Timestamp(year=year + 1, month=1, day=1) - start).total_seconds() // step_seconds)
+    local_times = pd.date_range(start, periods=periods, freq=pd.Timedelta(seconds=step_seconds))
+
+    position = solar_position(local_times - pd.Timedelta(hours=utc_offset_hours), latitude, longitude)
+    return {
+        'elevation': position['elevation'].astype(np.float32),
+        'azimuth': position['azimuth'].astype(np.float32),
+        'clear_sky_ghi': clear_sky_ghi(position['elevation']).astype(np.float32)
+    }
+
+
+class SolarGeometry:
+    """Solar geometry for one site; falls back to fixed daylight hours when the location is unknown"""
+
+    def __init__(self, latitude: Optional[float] = None, longitude: Optional[float] = None,
+                 utc_offset_hours: Optional[float] = None, min_elevation: float = 0.0,
+                 sunrise_hour: int = 6, sunset_hour: int = 18):
+        """Initialize with site coordinates (naive timestamps are local standard time)"""
+        self.latitude = latitude
+        self.longitude = longitude
+        self.min_elevation = min_elevation
+        self.sunrise_hour = sunrise_hour
+        self.sunset_hour = sunset_hour
+
+        if utc_offset_hours is None and longitude is not None:
+            utc_offset_hours = round(longitude / 15)
+        self.utc_offset_hours = utc_offset_hours
+
+    @property
+    def has_location(self) -> bool:
+        return self.latitude is not None and self.longitude is not None
+
+    def _local_times(self, times) -> pd.DatetimeIndex:
+        """Timestamps as naive local standard time, the frame the tables are keyed in"""
+        times = pd.DatetimeIndex(pd.to_datetime(times))
+        if times.tz is not None:
+            times = times.tz_convert('UTC').tz_localize(None) + pd.Timedelta(hours=self.utc_offset_hours)
+        return times
+
+    def lookup(self, times) -> Dict[str, np.ndarray]:
+        """Elevation, azimuth and clear-sky irradiance for each timestamp, sliced from cached year tables"""
+        if not self.has_location:
+            raise ValueError("Solar position requires latitude and longitude")
+
+        local_times = self._local_times(times)
+        n = len(local_times)
+        result = {name: np.empty(n, dtype=np.float32) for name in ['elevation', 'azimuth', 'clear_sky_ghi']}
+        if n == 0:
+            return result
+
+        # Missing timestamps get NaN geometry (so never daylight); the rest are looked up as usual
+        valid = ~local_times.isna()
+        if not valid.all():
+            known = self.lookup(local_times[valid]) if valid.any() else {}
+            for name, values in result.items():
+                values[:] = np.nan
+                if name in known:
+                    values[valid] = known[name]
+            return result
+
+        # Table resolution follows the data's own sampling interval
+        seconds = local_times.to_numpy().astype('datetime64[s]')
+        steps = np.diff(seconds).astype(np.int64)
+        step_seconds = int(np.median(steps[steps > 0])) if (steps > 0).any() else 3600
+        step_seconds = max(step_seconds, 60)
+
+        year_starts = seconds.astype('datetime64[Y]')
+        years = year_starts.astype(np.int64) + 1970
+        offsets = (seconds - year_starts.astype('datetime64[s]')).astype(np.int64)
+        on_grid = offsets % step_seconds == 0
+
+        for year in np.unique(years):
+            table = _solar_table(float(self.latitude), float(self.longitude), float(self.utc_offset_hours),
+                                 int(year), step_seconds)
+            rows = (years == year) & on_grid
+            positions = offsets[rows] // step_seconds
+            for name, values in table.items():
+                result[name][rows] = values[positions]
+
+        # Timestamps between grid points are computed directly
+        if not on_grid.all():
+            off_grid_times = local_times[~on_grid] - pd.Timedelta(hours=self.utc_offset_hours)
+            position = solar_position(off_grid_times, self.latitude, self.longitude)
+            result['elevation'][~on_grid] = position['elevation']
+            result['azimuth'][~on_grid] = position['azimuth']
+            result['clear_sky_ghi'][~on_grid] = clear_sky_ghi(position['elevation'])
+
+        return result
+
+    def elevation(self, times) -> np.ndarray:
+        """Solar elevation in degrees"""
+        return self.lookup(times)['elevation']
+
+    def clear_sky(self, times) -> np.ndarray:
+        """Clear-sky global horizontal irradiance in W/m²"""
+        return self.lookup(times)['clear_sky_ghi']
+
+    def daylight_mask(self, times) -> np.ndarray:
+        """True where the sun is above the elevation threshold (or inside the daylight hours)"""
+        if self.has_location:
+            return self.elevation(times) > self.min_elevation
+
+        hours = self._local_times(times).hour.to_numpy()
+        return (hours >= self.sunrise_hour) & (hours <= self.sunset_hour)